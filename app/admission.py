@@ -0,0 +1,207 @@
+import os
+from typing import Callable, NamedTuple
+import numpy as np
+import pandas as pd
+from app.dataset import Dataset
+from app.operations import OPERATIONS, OperationError
+from app.sql_backend import SQL_OPERATIONS, sql_available
+
+OPERATION_MEMORY_BUDGET_BYTES = (
+    int(os.environ.get("DATAFORGE_OPERATION_MEMORY_MB", "2048")) * 1024**2
+)
+TEXT_VALUE_BYTES = 64
+SKETCH_SIZE = 4096
+SKETCH_SLICE_ROWS = 1 << 16
+ESTIMATORS: dict[str, Callable[..., "Estimate"]] = {}
+
+
+class Estimate(NamedTuple):
+    """Bytes an operation's result takes, and what it holds while running."""
+
+    output_bytes: int
+    working_bytes: int
+
+
+def _estimator(name: str):
+    def register(func: Callable[..., Estimate]) -> Callable[..., Estimate]:
+        ESTIMATORS[name] = func
+        return func
+
+    return register
+
+
+def _value_bytes(dtype: str | None) -> int:
+    """Approximate bytes per value of a column with the given dtype."""
+    if dtype is None:
+        return TEXT_VALUE_BYTES
+    try:
+        target = np.dtype(dtype)
+    except TypeError:
+        if dtype == "category" or dtype.startswith(
+            ("Int", "UInt", "Float", "boolean", "datetime64")
+        ):
+            return 8
+        return TEXT_VALUE_BYTES
+    return TEXT_VALUE_BYTES if target.kind in "OSU" else target.itemsize
+
+
+def _width(data: Dataset, columns: list[str]) -> int:
+    """Approximate bytes per row of the given columns."""
+    widths = {}
+    for part in data.parts:
+        for col in columns:
+            if col in part.dtypes:
+                widths[col] = max(widths.get(col, 0), _value_bytes(part.dtypes[col]))
+    return sum((widths.get(col, TEXT_VALUE_BYTES) for col in columns))
+
+
+def _sketch(sketch: np.ndarray, rows: pd.DataFrame) -> np.ndarray:
+    """Merge the hashes of rows into a sketch of the smallest distinct ones."""
+    for start in range(0, len(rows), SKETCH_SLICE_ROWS):
+        batch = pd.util.hash_pandas_object(
+            rows.iloc[start : start + SKETCH_SLICE_ROWS], index=False
+        ).to_numpy()
+        if len(sketch) == SKETCH_SIZE:
+            batch = batch[batch < sketch[-1]]
+        sketch = np.unique(np.concatenate([sketch, batch]))[:SKETCH_SIZE]
+    return sketch
+
+
+def _distinct(data: Dataset, columns: list[str]) -> int:
+    """Estimate the distinct combinations of columns, one file at a time.
+
+    Rows are hashed in slices and only the smallest distinct hashes are
+    kept, so the memory used does not grow with the number of values.
+    Counts below SKETCH_SIZE are exact; larger ones are within a few percent.
+    """
+    sketch = np.empty(0, dtype=np.uint64)
+    for df in data.frames(columns):
+        rows = df.reindex(columns=columns) if len(df.columns) < len(columns) else df
+        sketch = _sketch(sketch, rows)
+    if len(sketch) < SKETCH_SIZE:
+        return len(sketch)
+    return int((SKETCH_SIZE - 1) * 2.0**64 / (float(sketch[-1]) + 1))
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("bytes", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:,.0f} {unit}" if unit == "bytes" else f"{size:,.1f} {unit}"
+        size /= 1024
+
+
+@_estimator("onehot_encode")
+def _onehot_encode(data: Dataset, columns: list[str]) -> Estimate:
+    """Each distinct value of an encoded column becomes a one-byte column.
+
+    Files are encoded one at a time, so the largest file decides.
+    """
+    largest = Estimate(0, 0)
+    for part in data.parts:
+        single = Dataset([part])
+        encoded = [col for col in columns if col in part.dtypes]
+        base = part.rows * _width(single, [c for c in part.dtypes if c not in encoded])
+        # Distinct values are only counted when the bound could exceed the budget.
+        dummies = part.rows * part.rows * len(encoded)
+        if base + dummies > OPERATION_MEMORY_BUDGET_BYTES:
+            dummies = part.rows * sum((_distinct(single, [col]) for col in encoded))
+        output = base + dummies
+        if output > largest.output_bytes:
+            input_bytes = part.rows * _width(single, list(part.dtypes))
+            largest = Estimate(output, output + input_bytes)
+    return largest
+
+
+@_estimator("pivot")
+def _pivot(
+    data: Dataset, index: str, columns: str, values: str, aggfunc: str
+) -> Estimate:
+    """A cell per pair of distinct index and column values."""
+    rows = len(data)
+    input_bytes = rows * _width(data, [index, columns, values])
+    cells = rows * rows
+    if cells * 8 > OPERATION_MEMORY_BUDGET_BYTES:
+        index_values = _distinct(data, [index])
+        cells = index_values * _distinct(data, [columns])
+        rows = index_values
+    output = cells * 8 + rows * _width(data, [index])
+    return Estimate(output, output + input_bytes)
+
+
+@_estimator("group_by")
+def _group_by(
+    data: Dataset, columns: list[str], agg_columns: list[str], aggfunc: str
+) -> Estimate:
+    """A row per distinct combination of the keys, holding them and aggregates.
+
+    Aggregations that merge run one file at a time, holding that file and
+    the partial results; the others hold every row at once.
+    """
+    rows = len(data)
+    groups = rows
+    row_bytes = _width(data, columns) + 8 * len(agg_columns)
+    if groups * row_bytes > OPERATION_MEMORY_BUDGET_BYTES:
+        groups = _distinct(data, columns)
+    output = groups * row_bytes
+    input_width = _width(data, columns + agg_columns)
+    if data.mergeable(columns, {col: aggfunc for col in agg_columns}):
+        largest = max((part.rows for part in data.parts), default=0)
+        return Estimate(output, output * len(data.parts) + largest * input_width)
+    return Estimate(output, output + rows * input_width)
+
+
+@_estimator("melt")
+def _melt(
+    data: Dataset,
+    id_vars: list[str],
+    value_vars: list[str],
+    var_name: str,
+    value_name: str,
+) -> Estimate:
+    """A row per input row and value column."""
+    rows = len(data)
+    value_width = max((_width(data, [col]) for col in value_vars), default=0)
+    output = (
+        rows
+        * len(value_vars)
+        * (_width(data, id_vars) + TEXT_VALUE_BYTES + value_width)
+    )
+    return Estimate(output, output + rows * _width(data, id_vars + value_vars))
+
+
+def out_of_core_failed(op: str) -> OperationError:
+    """The error for an operation admitted out of core that the SQL engine refused."""
+    return OperationError(
+        f"{OPERATIONS[op].label} needs more memory than allowed and cannot run "
+        "out of core on these columns. Filter the data or select fewer columns first."
+    )
+
+
+def admit(op: str, data: Dataset, params: dict) -> bool:
+    """Check an operation's estimated memory use against the budget.
+
+    Returns True when it has to run out of core in the SQL engine because
+    only its working set is over budget. Raises OperationError when its
+    result alone is over budget, or when its working set is and it cannot
+    run out of core.
+    """
+    estimator = ESTIMATORS.get(op)
+    if estimator is None or not OPERATION_MEMORY_BUDGET_BYTES:
+        return False
+    estimate = estimator(data, **params)
+    budget = format_bytes(OPERATION_MEMORY_BUDGET_BYTES)
+    label = OPERATIONS[op].label
+    if estimate.output_bytes > OPERATION_MEMORY_BUDGET_BYTES:
+        raise OperationError(
+            f"{label} would produce about {format_bytes(estimate.output_bytes)} "
+            f"of data, over the {budget} limit. Choose columns with fewer "
+            "distinct values or filter the data first."
+        )
+    if estimate.working_bytes <= OPERATION_MEMORY_BUDGET_BYTES:
+        return False
+    if op in SQL_OPERATIONS and sql_available():
+        return True
+    raise OperationError(
+        f"{label} needs about {format_bytes(estimate.working_bytes)} of memory, "
+        f"over the {budget} limit. Filter the data or select fewer columns first."
+    )
\ No newline at end of file
@@ -1,8 +1,16 @@
 import reflex as rx
 import reflex_enterprise as rxe
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from app.jobs import job_queue
 from app.state import State
+from app.tasks import SessionActivity, expire_idle_sessions
 from app.components.header import header
 from app.components.tabs import navigation_tabs
+from app.components.history import history_bar
+from app.components.task_progress import task_progress
 from app.components.upload import upload_view
 from app.components.profiling import profiling_view
 from app.components.mapping import mapping_view
@@ -20,6 +28,7 @@ from app.components.sample_sort import sample_sort_view
 from app.components.pivot import pivot_view
 from app.components.encoding import encoding_view
 from app.components.download import download_view
+from app.components.recipe import recipe_view
 
 
 def index() -> rx.Component:
@@ -28,6 +37,8 @@ def index() -> rx.Component:
         header(),
         rx.el.main(
             navigation_tabs(),
+            history_bar(),
+            task_progress(),
             rx.el.div(
                 rx.match(
                     State.active_tab,
@@ -47,6 +58,7 @@ def index() -> rx.Component:
                     ("sample_sort", sample_sort_view()),
                     ("pivot", pivot_view()),
                     ("encoding", encoding_view()),
+                    ("recipe", recipe_view()),
                     ("download", download_view()),
                     rx.el.div("Select a tab", class_name="text-center text-gray-500"),
                 ),
@@ -58,8 +70,14 @@ def index() -> rx.Component:
     )
 
 
+async def job_metrics(request: Request) -> JSONResponse:
+    """Queue depth and wait times of the job scheduler, for capacity planning."""
+    return JSONResponse(await job_queue.metrics())
+
+
 app = rxe.App(
     stylesheets=["/tabs.css"],
+    api_transformer=Starlette(routes=[Route("/metrics/jobs", job_metrics)]),
     theme=rx.theme(appearance="light"),
     head_components=[
         rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
@@ -70,4 +88,6 @@ app = rxe.App(
         ),
     ],
 )
+app.register_lifespan_task(expire_idle_sessions)
+app.add_middleware(SessionActivity())
 app.add_page(index, title="DataForge - Data Transformation")
\ No newline at end of file
@@ -0,0 +1,168 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import TypedDict
+from app.file_formats import (
+    OUTPUT_FORMATS,
+    is_supported,
+    output_name,
+    read_frame,
+    save_frame,
+)
+from app.operations import OperationError, RecipeStep, validate_step
+from app.planner import run_optimized
+
+BATCH_WORKERS = int(os.environ.get("DATAFORGE_BATCH_WORKERS", "0")) or os.cpu_count()
+
+
+class FileReport(TypedDict):
+    file_name: str
+    outputs: list[str]
+    rows_in: int
+    rows_out: int
+    seconds: float
+    error: str
+
+
+def load_recipe(path: str) -> list[RecipeStep]:
+    """Read and validate a recipe saved from the Recipe tab."""
+    with open(path) as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("steps"), list):
+        raise OperationError(f"{path} is not a recipe file")
+    return [validate_step(step) for step in data["steps"]]
+
+
+def collect_inputs(sources: list[str]) -> list[str]:
+    """Expand directories and glob patterns into the supported files they hold."""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            matches = [os.path.join(source, name) for name in os.listdir(source)]
+        else:
+            matches = glob.glob(source)
+        paths.extend(
+            path
+            for path in sorted(matches)
+            if os.path.isfile(path) and is_supported(path)
+        )
+    return list(dict.fromkeys(paths))
+
+
+def process_file(
+    path: str, steps: list[RecipeStep], output_dir: str, fmt: str
+) -> FileReport:
+    """Run a recipe on one file and write its results to output_dir."""
+    file_name = os.path.basename(path)
+    report: FileReport = {
+        "file_name": file_name,
+        "outputs": [],
+        "rows_in": 0,
+        "rows_out": 0,
+        "seconds": 0.0,
+        "error": "",
+    }
+    start = time.perf_counter()
+    try:
+        df = read_frame(file_name, path)
+        report["rows_in"] = len(df)
+        for name, result in run_optimized([(file_name, df)], steps):
+            if name != file_name:
+                name = f"{file_name.split('.')[0]}_{name}"
+            out_name = output_name(name, fmt)
+            save_frame(result, os.path.join(output_dir, out_name), fmt)
+            report["outputs"].append(out_name)
+            report["rows_out"] += len(result)
+    except Exception as e:
+        logging.exception(f"Error processing {path}: {e}")
+        report["error"] = str(e)
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def format_reports(reports: list[FileReport]) -> str:
+    """Render per-file timings and row counts as a plain-text table."""
+    rows = [("File", "Rows in", "Rows out", "Seconds", "Result")]
+    for r in reports:
+        result = f"error: {r['error']}" if r["error"] else ", ".join(r["outputs"])
+        rows.append(
+            (
+                r["file_name"],
+                str(r["rows_in"]),
+                str(r["rows_out"]),
+                f"{r['seconds']:.2f}",
+                result,
+            )
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(4)]
+    lines = [
+        "  ".join(
+            [row[0].ljust(widths[0])]
+            + [cell.rjust(width) for cell, width in zip(row[1:4], widths[1:])]
+            + [row[4]]
+        )
+        for row in rows
+    ]
+    failed = sum((1 for r in reports if r["error"]))
+    lines.append(
+        f"{len(reports) - failed} of {len(reports)} file(s) processed, "
+        f"{sum((r['rows_out'] for r in reports))} row(s) written."
+    )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.batch",
+        description="Apply a saved DataForge recipe to every file in a directory "
+        "or glob, without the web UI. Each file is processed on its own, so "
+        "steps that combine files (pivot, melt, group by) run per file.",
+    )
+    parser.add_argument("recipe", help="recipe JSON downloaded from the Recipe tab")
+    parser.add_argument(
+        "inputs", nargs="+", help="input directories or glob patterns (CSV/Excel)"
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default="processed", help="directory for results"
+    )
+    parser.add_argument("-f", "--format", choices=list(OUTPUT_FORMATS), default="csv")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=BATCH_WORKERS,
+        help="number of worker processes (default: DATAFORGE_BATCH_WORKERS or "
+        "the CPU count)",
+    )
+    args = parser.parse_args(argv)
+    try:
+        steps = load_recipe(args.recipe)
+    except (OSError, ValueError, OperationError) as e:
+        parser.error(f"cannot load recipe: {e}")
+    paths = collect_inputs(args.inputs)
+    if not paths:
+        parser.error("no CSV or Excel files matched the inputs")
+    names = [os.path.basename(path) for path in paths]
+    clashing = sorted({name for name in names if names.count(name) > 1})
+    if clashing:
+        parser.error(f"several inputs share the name {', '.join(clashing)}")
+    os.makedirs(args.output_dir, exist_ok=True)
+    workers = max(1, min(args.workers, len(paths)))
+    task_args = (paths, repeat(steps), repeat(args.output_dir), repeat(args.format))
+    if workers == 1:
+        reports = list(map(process_file, *task_args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            reports = list(executor.map(process_file, *task_args))
+    print(format_reports(reports))
+    return 1 if any((r["error"] for r in reports)) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,89 @@
+import os
+from typing import Any, Callable
+import numpy as np
+import pandas as pd
+
+CATEGORY_MAX_RATIO = float(os.environ.get("DATAFORGE_CATEGORY_MAX_RATIO", "0.5"))
+CATEGORY_MIN_ROWS = int(os.environ.get("DATAFORGE_CATEGORY_MIN_ROWS", "100"))
+
+
+def is_categorical(s: pd.Series) -> bool:
+    """Whether a column is dictionary-encoded."""
+    return isinstance(s.dtype, pd.CategoricalDtype)
+
+
+def is_text(s: pd.Series) -> bool:
+    """Whether a column holds text, either plain or dictionary-encoded."""
+    if is_categorical(s):
+        return not pd.api.types.is_numeric_dtype(s.cat.categories)
+    return pd.api.types.is_string_dtype(s) or s.dtype == "object"
+
+
+def encode_low_cardinality(df: pd.DataFrame) -> pd.DataFrame:
+    """Dictionary-encode text columns whose distinct values repeat enough.
+
+    A column is converted to the pandas ``category`` dtype when its number of
+    distinct values is at most CATEGORY_MAX_RATIO of its row count.
+    """
+    if len(df) < CATEGORY_MIN_ROWS:
+        return df
+    for col in df.columns:
+        s = df[col]
+        if is_categorical(s) or not is_text(s):
+            continue
+        if s.nunique(dropna=True) <= CATEGORY_MAX_RATIO * len(s):
+            df[col] = s.astype("category")
+    return df
+
+
+def text_mask(s: pd.Series, predicate: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """Evaluate a predicate on ``s.astype(str)`` and return the boolean mask.
+
+    For dictionary-encoded columns the predicate runs once per distinct value
+    and the result is broadcast to the rows through the category codes.
+    """
+    if not is_categorical(s):
+        return predicate(s.astype(str))
+    lookup = pd.Series(list(s.cat.categories) + [np.nan], dtype=object).astype(str)
+    matches = np.asarray(predicate(lookup), dtype=bool)
+    return pd.Series(matches[s.cat.codes.to_numpy()], index=s.index)
+
+
+def map_categories(s: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """Apply a vectorised transform to the distinct values of an encoded column.
+
+    Values that become equal after the transform are merged into one category,
+    and values the transform maps to null become null. Categories stay sorted
+    so that sorting the column still orders it by value.
+    """
+    mapped = func(pd.Series(s.cat.categories, dtype=object))
+    try:
+        new_codes, uniques = pd.factorize(mapped, sort=True)
+    except TypeError:
+        new_codes, uniques = pd.factorize(mapped)
+    codes = s.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, new_codes[codes], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=uniques), index=s.index, name=s.name
+    )
+
+
+def map_text(s: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    """Apply a string transform to a text column, keeping dictionary encoding."""
+    if is_categorical(s):
+        return map_categories(s, func)
+    return func(s)
+
+
+def with_category(s: pd.Series, value: Any) -> pd.Series:
+    """Make sure an encoded column can hold a value before it is assigned.
+
+    Categories stay sorted so that sorting and grouping still order the
+    column by value.
+    """
+    if not is_categorical(s) or value in s.cat.categories:
+        return s
+    try:
+        return s.cat.set_categories(sorted([*s.cat.categories, value]))
+    except TypeError:
+        return s.cat.add_categories([value])
\ No newline at end of file
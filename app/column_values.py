@@ -0,0 +1,144 @@
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator
+import pandas as pd
+
+DERIVED_CACHE_BUDGET_BYTES = (
+    int(os.environ.get("DATAFORGE_DERIVED_CACHE_MB", "256")) * 1024**2
+)
+DERIVED_KINDS: dict[str, Callable[[pd.Series], pd.Series]] = {
+    "text": lambda s: s.astype(str),
+    "numeric": lambda s: pd.to_numeric(s, errors="coerce"),
+    "dates": lambda s: pd.to_datetime(s, errors="coerce"),
+}
+
+
+class DerivedCache:
+    """Process-wide LRU cache of derived column values with a byte budget.
+
+    Entries are keyed by (column version, kind). A column version names
+    immutable stored content, so entries never need to be invalidated: a
+    changed column gets a new version and simply misses the cache.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, version: str, kind: str) -> Any | None:
+        key = (version, kind)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, version: str, kind: str, values: Any, nbytes: int):
+        """Add derived values, evicting least recently used entries as needed."""
+        if nbytes > self.budget_bytes:
+            return
+        key = (version, kind)
+        with self._lock:
+            if key in self._entries:
+                self.used_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (values, nbytes)
+            self.used_bytes += nbytes
+            while self.used_bytes > self.budget_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.used_bytes -= evicted_bytes
+
+
+derived_cache = DerivedCache(DERIVED_CACHE_BUDGET_BYTES)
+
+
+class ColumnValues:
+    """Text, numeric and date forms of a frame's columns, each computed once.
+
+    versions maps column names to the stored version the frame's column still
+    holds; those columns share their derived forms with every frame holding
+    the same version through the process-wide cache. The returned series are
+    shared and must not be modified; copy one before storing it in a frame.
+    """
+
+    def __init__(self, df: pd.DataFrame, versions: dict[str, str] | None = None):
+        self.df = df
+        self.versions = versions or {}
+        self._values: dict[tuple[str, str], pd.Series] = {}
+
+    def _derived(self, col: str, kind: str) -> pd.Series:
+        key = (col, kind)
+        if key in self._values:
+            return self._values[key]
+        s = self.df[col]
+        version = self.versions.get(col)
+        values = derived_cache.get(version, kind) if version else None
+        if values is None:
+            derived = DERIVED_KINDS[kind](s)
+            if version and derived.dtype == s.dtype:
+                # The conversion may have returned the column's own values.
+                derived = derived.copy()
+            values = derived.array
+            if version:
+                derived_cache.put(
+                    version, kind, values, int(derived.memory_usage(deep=True))
+                )
+        result = pd.Series(values, index=s.index, name=s.name, copy=False)
+        if version and kind == "text" and s.dtype == object:
+            # Stored versions do not tell None from NaN; render this frame's own.
+            nulls = s.isna().to_numpy()
+            if nulls.any():
+                result = result.copy()
+                result[nulls] = s[nulls].astype(str)
+        self._values[key] = result
+        return result
+
+    def text(self, col: str) -> pd.Series:
+        """The column as strings, like ``astype(str)``."""
+        return self._derived(col, "text")
+
+    def numeric(self, col: str) -> pd.Series:
+        """The column as numbers, with unparsable values as NaN."""
+        return self._derived(col, "numeric")
+
+    def dates(self, col: str) -> pd.Series:
+        """The column as datetimes, with unparsable values as NaT."""
+        return self._derived(col, "dates")
+
+
+_stored: ContextVar[tuple[tuple[pd.DataFrame, dict[str, str]], ...]] = ContextVar(
+    "stored_versions", default=()
+)
+
+
+@contextmanager
+def stored_versions(
+    frames: list[tuple[pd.DataFrame, dict[str, str]]],
+) -> Iterator[None]:
+    """Declare which stored column versions freshly loaded frames still hold.
+
+    Wrap only the first operation applied to the frames: operations modify
+    frames in place, so after one has run the versions no longer apply.
+    """
+    token = _stored.set(tuple(frames))
+    try:
+        yield
+    finally:
+        _stored.reset(token)
+
+
+def column_values(df: pd.DataFrame) -> ColumnValues:
+    """Return the derived-value accessor for a frame an operation received.
+
+    Operations take it before changing the frame and read each column
+    through it only before writing that column.
+    """
+    for frame, versions in _stored.get():
+        if frame is df:
+            return ColumnValues(df, versions)
+    return ColumnValues(df)
\ No newline at end of file
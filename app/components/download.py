@@ -122,7 +122,8 @@ def download_buttons() -> rx.Component:
             f"Download All as .{State.download_format}",
             rx.icon("file-archive", size=16),
             on_click=State.download_all_zip,
-            class_name="w-full flex items-center justify-center gap-2 px-4 py-2 bg-emerald-500 text-white font-semibold rounded-lg hover:bg-emerald-600 transition-colors shadow-sm mb-4",
+            disabled=State.task_label != "",
+            class_name="w-full flex items-center justify-center gap-2 px-4 py-2 bg-emerald-500 text-white font-semibold rounded-lg hover:bg-emerald-600 transition-colors shadow-sm mb-4 disabled:bg-gray-300",
         ),
         rx.el.h4(
             "Individual Files", class_name="text-md font-semibold text-gray-700 mb-2"
@@ -0,0 +1,80 @@
+import reflex as rx
+from app.state import State
+
+
+def history_step(label: str, index: int) -> rx.Component:
+    """A single applied step in the history list."""
+    return rx.el.span(
+        f"{index + 1}. {label}",
+        class_name="text-xs font-medium text-gray-600 bg-gray-100 px-2 py-1 rounded-md whitespace-nowrap",
+    )
+
+
+def pending_step(label: str) -> rx.Component:
+    """A step planned in lazy mode that has not run yet."""
+    return rx.el.span(
+        label,
+        class_name="text-xs font-medium text-amber-700 bg-amber-50 border border-dashed border-amber-300 px-2 py-1 rounded-md whitespace-nowrap",
+    )
+
+
+def history_bar() -> rx.Component:
+    """Undo/redo controls and the list of applied steps."""
+    return rx.cond(
+        State.uploaded_files.length() > 0,
+        rx.el.div(
+            rx.el.div(
+                rx.el.button(
+                    rx.icon("undo-2", size=16),
+                    "Undo",
+                    on_click=State.undo,
+                    disabled=State.undo_label == "",
+                    title=State.undo_label,
+                    class_name="flex items-center gap-2 px-3 py-1.5 text-sm font-semibold text-gray-700 bg-white border border-gray-300 rounded-lg hover:bg-gray-100 disabled:opacity-50",
+                ),
+                rx.el.button(
+                    rx.icon("redo-2", size=16),
+                    "Redo",
+                    on_click=State.redo,
+                    disabled=State.redo_label == "",
+                    title=State.redo_label,
+                    class_name="flex items-center gap-2 px-3 py-1.5 text-sm font-semibold text-gray-700 bg-white border border-gray-300 rounded-lg hover:bg-gray-100 disabled:opacity-50",
+                ),
+                class_name="flex items-center gap-2 flex-shrink-0",
+            ),
+            rx.el.div(
+                rx.foreach(State.history_labels, history_step),
+                rx.foreach(State.pending_labels, pending_step),
+                class_name="flex items-center gap-2 overflow-x-auto flex-1",
+            ),
+            rx.el.div(
+                rx.el.label(
+                    rx.el.input(
+                        type="checkbox",
+                        checked=State.lazy_mode,
+                        on_change=State.set_lazy_mode,
+                        class_name="size-4 rounded border-gray-300 text-amber-600 focus:ring-amber-500",
+                    ),
+                    rx.el.span(
+                        "Plan steps", class_name="text-sm font-medium text-gray-700"
+                    ),
+                    title="Collect renames, filters, column selection and text operations and run them together, optimized, at preview or download time.",
+                    class_name="flex items-center gap-2",
+                ),
+                rx.cond(
+                    State.pending_labels.length() > 0,
+                    rx.el.button(
+                        rx.icon("play", size=16),
+                        "Run",
+                        on_click=State.run_pending_plan,
+                        disabled=State.task_label != "",
+                        class_name="flex items-center gap-2 px-3 py-1.5 text-sm font-semibold text-white bg-amber-500 rounded-lg hover:bg-amber-600 disabled:bg-gray-300",
+                    ),
+                    None,
+                ),
+                class_name="flex items-center gap-3 flex-shrink-0",
+            ),
+            class_name="flex items-center gap-4 max-w-7xl mx-auto px-4 sm:px-6 lg:px-8",
+        ),
+        None,
+    )
\ No newline at end of file
@@ -87,7 +87,8 @@ def pivot_section() -> rx.Component:
             on_click=State.apply_pivot,
             disabled=(State.pivot_index == "")
             | (State.pivot_columns == "")
-            | (State.pivot_values == ""),
+            | (State.pivot_values == "")
+            | (State.task_label != ""),
             class_name="mt-4 w-full flex items-center justify-center gap-2 px-4 py-2 bg-blue-500 text-white font-semibold rounded-lg hover:bg-blue-600 transition-colors shadow-sm disabled:bg-gray-300",
         ),
         class_name="p-6 bg-white border border-gray-200 rounded-xl",
@@ -121,7 +122,8 @@ def melt_section() -> rx.Component:
             rx.icon("unfold-vertical", size=16),
             on_click=State.apply_melt,
             disabled=(State.melt_id_vars.length() == 0)
-            | (State.melt_value_vars.length() == 0),
+            | (State.melt_value_vars.length() == 0)
+            | (State.task_label != ""),
             class_name="mt-4 w-full flex items-center justify-center gap-2 px-4 py-2 bg-blue-500 text-white font-semibold rounded-lg hover:bg-blue-600 transition-colors shadow-sm disabled:bg-gray-300",
         ),
         class_name="p-6 bg-white border border-gray-200 rounded-xl mt-6",
@@ -170,7 +172,8 @@ def groupby_section() -> rx.Component:
             rx.icon("group", size=16),
             on_click=State.apply_groupby,
             disabled=(State.groupby_columns.length() == 0)
-            | (State.groupby_agg_columns.length() == 0),
+            | (State.groupby_agg_columns.length() == 0)
+            | (State.task_label != ""),
             class_name="mt-4 w-full flex items-center justify-center gap-2 px-4 py-2 bg-blue-500 text-white font-semibold rounded-lg hover:bg-blue-600 transition-colors shadow-sm disabled:bg-gray-300",
         ),
         class_name="p-6 bg-white border border-gray-200 rounded-xl mt-6",
@@ -0,0 +1,143 @@
+import reflex as rx
+from app.state import State
+
+
+def recipe_step(label: str, index: int) -> rx.Component:
+    """A single operation of a recipe."""
+    return rx.el.li(
+        rx.el.span(f"{index + 1}.", class_name="font-mono text-xs text-gray-400 w-6"),
+        rx.el.span(label, class_name="text-sm text-gray-700"),
+        class_name="flex items-center gap-2 p-2 rounded-md hover:bg-gray-50",
+    )
+
+
+def recorded_step(label: str, index: int) -> rx.Component:
+    """A recorded operation whose parameters can be edited."""
+    return rx.el.li(
+        rx.el.span(f"{index + 1}.", class_name="font-mono text-xs text-gray-400 w-6"),
+        rx.el.span(label, class_name="text-sm text-gray-700 flex-1"),
+        rx.el.button(
+            rx.icon("pencil", size=14),
+            on_click=State.start_step_edit(index),
+            disabled=State.task_label != "",
+            title="Edit this step and recompute the steps after it",
+            class_name="p-1 text-gray-400 hover:text-blue-500 disabled:text-gray-200",
+        ),
+        class_name=rx.cond(
+            State.editing_step == index,
+            "flex items-center gap-2 p-2 rounded-md bg-blue-50",
+            "flex items-center gap-2 p-2 rounded-md hover:bg-gray-50",
+        ),
+    )
+
+
+def step_editor() -> rx.Component:
+    """Editor for the parameters of the selected recorded step."""
+    return rx.el.div(
+        rx.el.h4(
+            f"Edit step {State.editing_step + 1}",
+            class_name="text-sm font-semibold text-gray-700 mb-2",
+        ),
+        rx.el.textarea(
+            value=State.edit_step_params,
+            on_change=State.set_edit_step_params,
+            rows=8,
+            class_name="w-full p-2 font-mono text-xs border border-gray-300 rounded-md",
+        ),
+        rx.el.p(
+            "Only this step and the steps after it are recomputed; unchanged results are reused.",
+            class_name="text-xs text-gray-500 mt-1",
+        ),
+        rx.el.div(
+            rx.el.button(
+                "Cancel",
+                on_click=State.cancel_step_edit,
+                class_name="px-4 py-2 text-sm font-semibold text-gray-600 bg-gray-100 rounded-lg hover:bg-gray-200",
+            ),
+            rx.el.button(
+                "Recompute",
+                rx.icon("refresh-cw", size=16),
+                on_click=State.apply_step_edit,
+                disabled=State.task_label != "",
+                class_name="flex items-center gap-2 px-4 py-2 text-sm bg-blue-500 text-white font-semibold rounded-lg hover:bg-blue-600 disabled:bg-gray-300",
+            ),
+            class_name="flex justify-end gap-2 mt-2",
+        ),
+        class_name="mt-4 p-4 border border-blue-200 rounded-lg bg-white",
+    )
+
+
+def recipe_view() -> rx.Component:
+    """The view for saving, loading and replaying transformation recipes."""
+    return rx.el.div(
+        rx.el.div(
+            rx.el.h2("Recipe", class_name="text-2xl font-bold text-gray-800"),
+            rx.el.p(
+                "Every applied step is recorded. Save the recipe and replay it on new files.",
+                class_name="text-gray-500 mt-1",
+            ),
+            class_name="mb-6 text-center",
+        ),
+        rx.el.div(
+            rx.el.h3("Recorded Steps", class_name="font-semibold text-gray-800 mb-2"),
+            rx.cond(
+                State.recipe_labels.length() > 0,
+                rx.el.ol(
+                    rx.foreach(State.recipe_labels, recorded_step),
+                    class_name="p-4 border border-gray-200 rounded-lg bg-white",
+                ),
+                rx.el.p(
+                    "No steps recorded yet.",
+                    class_name="p-4 text-sm text-gray-500 border border-gray-200 rounded-lg bg-white",
+                ),
+            ),
+            rx.cond(State.editing_step >= 0, step_editor(), None),
+            rx.el.button(
+                "Save Recipe",
+                rx.icon("download", size=16),
+                on_click=State.download_recipe,
+                disabled=State.recipe_labels.length() == 0,
+                class_name="mt-4 w-full flex items-center justify-center gap-2 px-4 py-2 bg-blue-500 text-white font-semibold rounded-lg hover:bg-blue-600 transition-colors shadow-sm disabled:bg-gray-300",
+            ),
+        ),
+        rx.el.div(
+            rx.el.h3("Replay a Recipe", class_name="font-semibold text-gray-800 mb-2"),
+            rx.upload.root(
+                rx.el.div(
+                    rx.icon("file-json", size=32, class_name="text-gray-400"),
+                    rx.el.p(
+                        "Drop a saved recipe (.json) or click to select",
+                        class_name="mt-2 text-sm text-gray-500",
+                    ),
+                    class_name="flex flex-col items-center justify-center p-6 text-center",
+                ),
+                id="recipe_upload",
+                accept={"application/json": [".json"]},
+                max_files=1,
+                on_drop=State.handle_recipe_upload(
+                    rx.upload_files(upload_id="recipe_upload")
+                ),
+                class_name="w-full cursor-pointer rounded-xl border-2 border-dashed border-gray-300 bg-gray-50 hover:bg-gray-100 transition-colors",
+            ),
+            rx.cond(
+                State.loaded_recipe_labels.length() > 0,
+                rx.el.div(
+                    rx.el.ol(
+                        rx.foreach(State.loaded_recipe_labels, recipe_step),
+                        class_name="p-4 border border-gray-200 rounded-lg bg-white",
+                    ),
+                    rx.el.button(
+                        "Apply Recipe to Current Files",
+                        rx.icon("play", size=16),
+                        on_click=State.replay_recipe,
+                        disabled=State.task_label != "",
+                        class_name="mt-4 w-full flex items-center justify-center gap-2 px-4 py-2 bg-emerald-500 text-white font-semibold rounded-lg hover:bg-emerald-600 transition-colors shadow-sm disabled:bg-gray-300",
+                    ),
+                    class_name="mt-4",
+                ),
+                None,
+            ),
+            class_name="mt-8",
+        ),
+        class_name="w-full max-w-4xl mx-auto flex flex-col",
+    )
\ No newline at end of file
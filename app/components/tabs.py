@@ -77,7 +77,9 @@ def navigation_tabs() -> rx.Component:
             ),
             separator(),
             tab_group(
-                "Finish", nav_button("Download", "download", "cloud_download", "green")
+                "Finish",
+                nav_button("Recipe", "recipe", "list-checks", "green"),
+                nav_button("Download", "download", "cloud_download", "green"),
             ),
             class_name="flex flex-wrap items-start justify-center gap-4 p-4 bg-gray-100 border border-gray-200 rounded-2xl shadow-md",
         ),
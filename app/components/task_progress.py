@@ -0,0 +1,37 @@
+import reflex as rx
+from app.state import State
+
+
+def task_progress() -> rx.Component:
+    """Progress and a cancel button for the operation running in the background."""
+    return rx.cond(
+        State.task_label != "",
+        rx.el.div(
+            rx.el.div(
+                rx.el.div(
+                    rx.el.span(
+                        State.task_label,
+                        class_name="text-sm font-semibold text-gray-800",
+                    ),
+                    rx.el.span(State.task_detail, class_name="text-xs text-gray-500"),
+                    class_name="flex items-baseline justify-between gap-4",
+                ),
+                rx.el.div(
+                    rx.el.div(
+                        class_name="h-full bg-emerald-500 rounded-full transition-all",
+                        style={"width": State.task_progress.to_string() + "%"},
+                    ),
+                    class_name="h-2 w-full bg-gray-200 rounded-full overflow-hidden mt-2",
+                ),
+                class_name="flex-1",
+            ),
+            rx.el.button(
+                rx.icon("circle-stop", size=16),
+                "Cancel",
+                on_click=State.cancel_task,
+                class_name="flex items-center gap-2 px-3 py-1.5 text-sm font-semibold text-gray-700 bg-white border border-gray-300 rounded-lg hover:bg-gray-100",
+            ),
+            class_name="flex items-center gap-4 max-w-7xl mx-auto mt-4 px-4 sm:px-6 lg:px-8",
+        ),
+        None,
+    )
\ No newline at end of file
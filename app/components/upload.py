@@ -17,12 +17,58 @@ def uploaded_file_card(file: dict, index: int) -> rx.Component:
             rx.el.span(
                 f"{file['row_count']} rows",
                 class_name="text-sm font-medium text-gray-500 bg-gray-100 px-2 py-1 rounded-md",
-            )
+            ),
+            rx.el.span(
+                f"{file['column_count']} cols",
+                class_name="text-sm font-medium text-gray-500 bg-gray-100 px-2 py-1 rounded-md",
+            ),
+            rx.el.span(
+                file["size_label"],
+                class_name="text-sm font-medium text-gray-500 bg-gray-100 px-2 py-1 rounded-md",
+            ),
+            class_name="flex items-center gap-2",
         ),
         class_name="flex items-center justify-between p-3 border border-gray-200 rounded-lg bg-white hover:shadow-sm transition-shadow",
     )
 
 
+def upload_preview_table() -> rx.Component:
+    """The first rows of the file being uploaded, shown while it is parsed."""
+    return rx.el.div(
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    rx.foreach(
+                        State.upload_preview_columns,
+                        lambda col: rx.el.th(
+                            col,
+                            class_name="px-4 py-2 text-left text-sm font-semibold text-gray-600 bg-gray-50",
+                        ),
+                    ),
+                    class_name="border-b border-gray-200",
+                )
+            ),
+            rx.el.tbody(
+                rx.foreach(
+                    State.upload_preview,
+                    lambda row: rx.el.tr(
+                        rx.foreach(
+                            State.upload_preview_columns,
+                            lambda col: rx.el.td(
+                                row.get(col, "").to_string(),
+                                class_name="px-4 py-2 text-sm text-gray-700 font-mono whitespace-nowrap",
+                            ),
+                        ),
+                        class_name="border-b border-gray-100",
+                    ),
+                )
+            ),
+            class_name="w-full text-sm",
+        ),
+        class_name="w-full overflow-x-auto border border-gray-200 rounded-lg",
+    )
+
+
 def upload_view() -> rx.Component:
     """The view for uploading and displaying files."""
     return rx.el.div(
@@ -75,6 +121,12 @@ def upload_view() -> rx.Component:
             rx.el.div(
                 rx.spinner(class_name="text-emerald-500"),
                 rx.el.p("Processing files...", class_name="text-gray-600"),
+                rx.el.p(State.upload_detail, class_name="text-xs text-gray-500"),
+                rx.cond(
+                    State.upload_preview_columns.length() > 0,
+                    upload_preview_table(),
+                    None,
+                ),
                 class_name="flex flex-col items-center gap-4 mt-8",
             ),
             None,
@@ -83,9 +135,15 @@ def upload_view() -> rx.Component:
             State.uploaded_files.length() > 0,
             rx.el.div(
                 rx.el.div(
-                    rx.el.h3(
-                        "Uploaded Files",
-                        class_name="text-xl font-semibold text-gray-800",
+                    rx.el.div(
+                        rx.el.h3(
+                            "Uploaded Files",
+                            class_name="text-xl font-semibold text-gray-800",
+                        ),
+                        rx.el.p(
+                            State.storage_usage_label,
+                            class_name="text-xs text-gray-500",
+                        ),
                     ),
                     rx.el.button(
                         "Clear All",
@@ -113,7 +113,8 @@ def validation_results_view() -> rx.Component:
                 "Run Again",
                 rx.icon("refresh-cw", size=14),
                 on_click=State.run_validation,
-                class_name="flex items-center gap-2 px-3 py-1 bg-gray-100 text-gray-700 font-semibold rounded-lg hover:bg-gray-200 text-sm",
+                disabled=State.task_label != "",
+                class_name="flex items-center gap-2 px-3 py-1 bg-gray-100 text-gray-700 font-semibold rounded-lg hover:bg-gray-200 text-sm disabled:opacity-50",
             ),
             class_name="flex items-center justify-between mb-4",
         ),
@@ -214,7 +215,8 @@ def validation_view() -> rx.Component:
                         rx.icon("play", size=16),
                         on_click=State.run_validation,
                         class_name="mt-6 w-full flex items-center justify-center gap-2 px-4 py-2 bg-emerald-500 text-white font-semibold rounded-lg hover:bg-emerald-600 transition-colors shadow-sm disabled:bg-gray-300",
-                        disabled=State.validation_rules.length() == 0,
+                        disabled=(State.validation_rules.length() == 0)
+                        | (State.task_label != ""),
                     ),
                 ),
                 rx.el.div(
@@ -0,0 +1,262 @@
+from typing import Callable, Iterator, NamedTuple
+import numpy as np
+import pandas as pd
+from app.column_values import ColumnValues
+from app.frame_store import frame_store
+
+_MERGED_AS = {
+    "sum": "sum",
+    "count": "sum",
+    "min": "min",
+    "max": "max",
+    "first": "first",
+    "last": "last",
+    "mean": "sum",
+}
+
+
+def _is_numeric(dtype: str) -> bool:
+    try:
+        return pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtype))
+    except TypeError:
+        return False
+
+
+def read_stored(handle: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Read a stored frame, or only the given columns in the given order."""
+    df = frame_store.get(handle, columns)
+    if columns is None or df.columns.tolist() == columns:
+        return df
+    return df[columns]
+
+
+class DatasetPart(NamedTuple):
+    """One file of a dataset, loaded only when an operation reads it.
+
+    load returns the requested columns, in the requested order, or every
+    column for None. The frame it returns is read-only. versions names the
+    stored content of columns the loaded frame holds unchanged. read_rows,
+    when given, returns a range of rows without loading the whole file.
+    """
+
+    load: Callable[[list[str] | None], pd.DataFrame]
+    dtypes: dict[str, str]
+    rows: int
+    versions: dict[str, str]
+    read_rows: Callable[[int, int], pd.DataFrame] | None = None
+
+
+class Dataset:
+    """Several files read as if they were concatenated, without concatenating them.
+
+    Rows are numbered across the parts in order, and a column some parts lack
+    reads as missing for their rows, as with ``pd.concat``. Operations work
+    through one part at a time, so only what they need from each file is held
+    in memory at once.
+    """
+
+    def __init__(self, parts: list[DatasetPart]):
+        self.parts = parts
+
+    @classmethod
+    def from_frames(cls, frames: list[pd.DataFrame]) -> "Dataset":
+        return cls(
+            [
+                DatasetPart(
+                    lambda columns, df=df: df if columns is None else df[columns],
+                    {col: str(dtype) for col, dtype in df.dtypes.items()},
+                    len(df),
+                    {},
+                )
+                for df in frames
+            ]
+        )
+
+    def __len__(self) -> int:
+        return sum((part.rows for part in self.parts))
+
+    @property
+    def columns(self) -> list[str]:
+        """Every column of any part, in order of first appearance."""
+        return list(dict.fromkeys((col for part in self.parts for col in part.dtypes)))
+
+    def _load_rows(self, part: DatasetPart, start: int, stop: int) -> pd.DataFrame:
+        if part.read_rows is None:
+            return part.load(None).iloc[start:stop]
+        return part.read_rows(start, stop)
+
+    def _load(self, part: DatasetPart, columns: list[str] | None) -> pd.DataFrame:
+        if columns is None:
+            return part.load(None)
+        return part.load([col for col in columns if col in part.dtypes])
+
+    def frames(self, columns: list[str] | None = None) -> Iterator[pd.DataFrame]:
+        """Yield each part with the given columns it has, one at a time."""
+        for part in self.parts:
+            yield self._load(part, columns)
+
+    def values(self) -> Iterator[tuple[pd.DataFrame, ColumnValues]]:
+        """Yield each whole part with the derived-value accessor for it."""
+        for part in self.parts:
+            df = part.load(None)
+            yield df, ColumnValues(df, part.versions)
+
+    def select(self, columns: list[str]) -> pd.DataFrame:
+        """Concatenate only the given columns of every part."""
+        return pd.concat(list(self.frames(columns)), ignore_index=True)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.concat(list(self.frames()), ignore_index=True)
+
+    def column(self, name: str) -> pd.Series:
+        return self.select([name])[name]
+
+    def rows(self, start: int, stop: int) -> pd.DataFrame:
+        """Return rows start to stop, reading only the parts that hold them."""
+        pieces = []
+        offset = 0
+        for part in self.parts:
+            if offset >= stop:
+                break
+            if offset + part.rows > start:
+                pieces.append(
+                    self._load_rows(part, max(start - offset, 0), stop - offset)
+                )
+            offset += part.rows
+        if not pieces:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(pieces, ignore_index=True).reindex(columns=self.columns)
+
+    def take(self, positions: np.ndarray) -> pd.DataFrame:
+        """Return the rows at the given positions, in that order."""
+        bounds = np.cumsum([0] + [part.rows for part in self.parts])
+        owner = np.searchsorted(bounds, positions, side="right") - 1
+        pieces = []
+        order = []
+        for i, part in enumerate(self.parts):
+            picked = np.flatnonzero(owner == i)
+            if len(picked):
+                pieces.append(part.load(None).iloc[positions[picked] - bounds[i]])
+                order.append(picked)
+        if not pieces:
+            return pd.DataFrame(columns=self.columns)
+        df = pd.concat(pieces, ignore_index=True).reindex(columns=self.columns)
+        return df.iloc[np.argsort(np.concatenate(order), kind="stable")].reset_index(
+            drop=True
+        )
+
+    def head(self, n: int) -> pd.DataFrame:
+        return self.rows(0, max(n, 0))
+
+    def tail(self, n: int) -> pd.DataFrame:
+        total = len(self)
+        return self.rows(max(total - n, 0), total) if n > 0 else self.rows(0, 0)
+
+    def sample(self, n: int | None = None, frac: float | None = None) -> pd.DataFrame:
+        """Draw rows without replacement, reading only the parts they fall in."""
+        total = len(self)
+        if n is None:
+            n = round(frac * total)
+        if n > total:
+            raise ValueError(
+                "Cannot take a larger sample than population when 'replace=False'"
+            )
+        return self.take(np.random.choice(total, n, replace=False))
+
+    def null_counts(self) -> dict[str, int]:
+        """Count the missing values of every column, one part at a time."""
+        counts = dict.fromkeys(self.columns, 0)
+        for part in self.parts:
+            part_counts = part.load(None).isnull().sum()
+            for col in counts:
+                counts[col] += (
+                    int(part_counts[col]) if col in part.dtypes else part.rows
+                )
+        return counts
+
+    def mergeable(self, keys: list[str], values: dict[str, str]) -> bool:
+        """Whether aggregate can combine per-part results instead of rows.
+
+        That needs every part to have every column with the same dtype,
+        aggregations whose partial results combine, and numeric columns for
+        means.
+        """
+        needed = keys + list(values)
+        if len(self.parts) < 2 or any(
+            func not in _MERGED_AS for func in values.values()
+        ):
+            return False
+        first = self.parts[0].dtypes
+        for part in self.parts:
+            if any((part.dtypes.get(col) != first.get(col) for col in needed)):
+                return False
+        return all(
+            (
+                col in first and (func != "mean" or _is_numeric(first[col]))
+                for col, func in values.items()
+            )
+        ) and all((key in first for key in keys))
+
+    def aggregate_part(
+        self, index: int, keys: list[str], values: dict[str, str], merge: bool
+    ) -> pd.DataFrame:
+        """Return the partial result of one part for merge_aggregates.
+
+        When merging, the part is grouped and aggregated on its own, means as
+        a sum and a count. Otherwise its rows are kept as they are.
+        """
+        df = self._load(self.parts[index], keys + list(values))
+        if not merge:
+            return df
+        spec = {}
+        for col, func in values.items():
+            if func == "mean":
+                spec[f"{col}\0sum"] = (col, "sum")
+                spec[f"{col}\0count"] = (col, "count")
+            else:
+                spec[col] = (col, func)
+        return df.groupby(keys, observed=True).agg(**spec)
+
+    def merge_aggregates(
+        self,
+        partials: list[pd.DataFrame],
+        keys: list[str],
+        values: dict[str, str],
+        merge: bool,
+    ) -> pd.DataFrame:
+        """Combine the partial results of every part into the aggregate."""
+        if not merge:
+            return (
+                pd.concat(partials, ignore_index=True)
+                .groupby(keys, observed=True)
+                .agg(values)
+                .reset_index()
+            )
+        spec = {}
+        for col, func in values.items():
+            if func == "mean":
+                spec[f"{col}\0sum"] = spec[f"{col}\0count"] = "sum"
+            else:
+                spec[col] = _MERGED_AS[func]
+        filled = [p for p in partials if len(p)] or partials[:1]
+        merged = (
+            pd.concat(filled)
+            .groupby(level=list(range(len(keys))), observed=True)
+            .agg(spec)
+        )
+        for col, func in values.items():
+            if func == "mean":
+                merged[col] = merged.pop(f"{col}\0sum") / merged.pop(f"{col}\0count")
+        return merged[list(values)].reset_index()
+
+    def aggregate(self, keys: list[str], values: dict[str, str]) -> pd.DataFrame:
+        """Group by keys and aggregate columns as the concatenated files would.
+
+        Matches ``select(...).groupby(keys, observed=True).agg(values)``, but
+        aggregations that combine are computed per part and then merged.
+        """
+        merge = self.mergeable(keys, values)
+        partials = [
+            self.aggregate_part(i, keys, values, merge) for i in range(len(self.parts))
+        ]
+        return self.merge_aggregates(partials, keys, values, merge)
\ No newline at end of file
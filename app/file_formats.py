@@ -0,0 +1,84 @@
+import io
+import os
+from typing import Iterator
+import pandas as pd
+from app.categorical import encode_low_cardinality, is_categorical
+
+INPUT_EXTENSIONS = (".csv", ".xlsx", ".xls")
+OUTPUT_FORMATS = {"csv": "csv", "excel": "xlsx", "parquet": "parquet"}
+
+
+def is_supported(file_name: str) -> bool:
+    """Whether a file can be parsed into a dataframe."""
+    return file_name.lower().endswith(INPUT_EXTENSIONS)
+
+
+def read_frame(file_name: str, source: bytes | str) -> pd.DataFrame:
+    """Parse an uploaded CSV or Excel file and encode repetitive text columns.
+
+    source is the file's content or the path of a file holding it.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    if file_name.lower().endswith(".csv"):
+        df = pd.read_csv(source)
+    elif file_name.lower().endswith((".xlsx", ".xls")):
+        df = pd.read_excel(source)
+    else:
+        raise ValueError(f"Unsupported file type: {file_name}")
+    return encode_low_cardinality(df)
+
+
+def read_frame_chunks(
+    file_name: str, path: str, chunk_rows: int
+) -> Iterator[pd.DataFrame]:
+    """Parse the file at path chunk_rows rows at a time, like read_frame.
+
+    CSV files are parsed incrementally; Excel files cannot be and come as
+    one chunk. Text columns the first chunk dictionary-encodes are encoded
+    in every chunk, so the chunks agree on dtypes.
+    """
+    if not file_name.lower().endswith(".csv"):
+        yield read_frame(file_name, path)
+        return
+    encoded = None
+    with pd.read_csv(path, chunksize=chunk_rows) as reader:
+        for df in reader:
+            if encoded is None:
+                df = encode_low_cardinality(df)
+                encoded = [col for col in df.columns if is_categorical(df[col])]
+            else:
+                for col in encoded:
+                    df[col] = df[col].astype("category")
+            yield df
+
+
+def output_name(file_name: str, fmt: str) -> str:
+    """Return the name a processed file is saved under in a given format."""
+    return f"processed_{file_name.split('.')[0]}.{OUTPUT_FORMATS[fmt]}"
+
+
+def write_frame(df: pd.DataFrame, fmt: str) -> bytes | str:
+    """Serialize a dataframe in one of OUTPUT_FORMATS."""
+    if fmt == "csv":
+        return df.to_csv(index=False)
+    output = io.BytesIO()
+    if fmt == "excel":
+        with pd.ExcelWriter(output, engine="openpyxl") as writer:
+            df.to_excel(writer, index=False, sheet_name="Sheet1")
+    elif fmt == "parquet":
+        df.to_parquet(output, index=False)
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+    return output.getvalue()
+
+
+def save_frame(df: pd.DataFrame, path: str, fmt: str):
+    """Write a dataframe to a file, replacing it atomically."""
+    content = write_frame(df, fmt)
+    if isinstance(content, str):
+        content = content.encode()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
\ No newline at end of file
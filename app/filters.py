@@ -0,0 +1,170 @@
+import operator
+import os
+from typing import Callable
+import numpy as np
+import pandas as pd
+from app.categorical import is_categorical
+from app.column_values import column_values
+
+FILTER_SAMPLE_ROWS = int(os.environ.get("DATAFORGE_FILTER_SAMPLE_ROWS", "1000"))
+NUMERIC_FILTERS: dict[str, Callable] = {
+    "greater_than": operator.gt,
+    "ge": operator.ge,
+    "less_than": operator.lt,
+    "le": operator.le,
+}
+TEXT_FILTERS = {
+    "is_empty": 0,
+    "is_not_empty": 0,
+    "equals": 1,
+    "not_equals": 1,
+    "contains": 2,
+    "not_contains": 2,
+}
+
+
+def _text_match(values: pd.Series, text: pd.Series, op: str, value: str) -> np.ndarray:
+    """Evaluate one text rule on values and their string form."""
+    if op == "equals":
+        return (text == value).to_numpy(dtype=bool, na_value=False)
+    if op == "not_equals":
+        return (text != value).to_numpy(dtype=bool, na_value=True)
+    if op == "is_empty":
+        return values.isnull().to_numpy() | (text == "").to_numpy(
+            dtype=bool, na_value=False
+        )
+    if op == "is_not_empty":
+        return values.notnull().to_numpy() & (text != "").to_numpy(
+            dtype=bool, na_value=True
+        )
+    found = text.str.contains(value, case=False, na=False).to_numpy(dtype=bool)
+    return found if op == "contains" else ~found
+
+
+class _ColumnFilter:
+    """Every filter rule on one column, fused into a single evaluation.
+
+    Numeric comparisons collapse into at most one lower and one upper bound,
+    checked on a single numeric conversion of the column. Text rules share
+    one string conversion and run cheapest first, each only on the values
+    the previous rules kept.
+    """
+
+    def __init__(self, column: str, rules: list[dict[str, str]]):
+        self.column = column
+        self.never = False
+        lower = upper = None
+        text_rules = []
+        for rule in rules:
+            op = rule["operation"]
+            if op in TEXT_FILTERS:
+                text_rules.append((op, rule["value"]))
+                continue
+            if op not in NUMERIC_FILTERS:
+                self.never = True
+                continue
+            bound = float(pd.to_numeric(rule["value"], errors="coerce"))
+            strict = op in ("greater_than", "less_than")
+            if np.isnan(bound):
+                self.never = True
+            elif op in ("greater_than", "ge"):
+                lower = max(lower or (bound, strict), (bound, strict))
+            else:
+                upper = min(upper or (bound, not strict), (bound, not strict))
+        self.bounds = []
+        if lower:
+            self.bounds.append((operator.gt if lower[1] else operator.ge, lower[0]))
+        if upper:
+            self.bounds.append((operator.le if upper[1] else operator.lt, upper[0]))
+        self.text_rules = sorted(text_rules, key=lambda rule: TEXT_FILTERS[rule[0]])
+
+    def _positions(
+        self,
+        values: pd.Series,
+        numeric: pd.Series | None = None,
+        text: pd.Series | None = None,
+    ) -> np.ndarray:
+        rows = np.arange(len(values))
+        if self.never:
+            return rows[:0]
+        if self.bounds:
+            if numeric is None:
+                numeric = pd.to_numeric(values, errors="coerce")
+            numbers = numeric.to_numpy(dtype=float, na_value=np.nan)
+            keep = np.ones(len(values), dtype=bool)
+            for compare, bound in self.bounds:
+                keep &= compare(numbers, bound)
+            rows, values = rows[keep], values[keep]
+            text = text[keep] if text is not None else None
+        if self.text_rules:
+            if text is None:
+                text = values.astype(str)
+            for op, value in self.text_rules:
+                if not len(rows):
+                    break
+                keep = _text_match(values, text, op, value)
+                rows, values, text = rows[keep], values[keep], text[keep]
+        return rows
+
+    def positions(
+        self,
+        s: pd.Series,
+        numeric: pd.Series | None = None,
+        text: pd.Series | None = None,
+    ) -> np.ndarray:
+        """Return the positions of the values in s that pass every rule.
+
+        numeric and text may hold the column already converted. Dictionary-
+        encoded columns are evaluated once per distinct value and the result
+        is broadcast to the rows through the category codes.
+        """
+        if not is_categorical(s):
+            return self._positions(s, numeric, text)
+        lookup = pd.Series(list(s.cat.categories) + [np.nan], dtype=object)
+        matches = np.zeros(len(lookup), dtype=bool)
+        matches[self._positions(lookup)] = True
+        return np.flatnonzero(matches[s.cat.codes.to_numpy()])
+
+
+def _sample(df: pd.DataFrame) -> pd.DataFrame:
+    if len(df) <= FILTER_SAMPLE_ROWS:
+        return df
+    return df.iloc[np.linspace(0, len(df) - 1, FILTER_SAMPLE_ROWS).astype(int)]
+
+
+def filter_positions(df: pd.DataFrame, rules: list[dict[str, str]]) -> np.ndarray:
+    """Return the positions of the rows that satisfy every filter rule.
+
+    Rules are grouped by column so that each column is converted once. The
+    column groups run in order of how many rows of an evenly spaced sample
+    they keep, most selective first, and each group only looks at the rows
+    the groups before it kept. Columns of a freshly loaded stored frame take
+    their conversions from the shared derived-value cache, other columns
+    are converted only for the rows still kept. Rules on columns the frame
+    lacks are ignored.
+    """
+    by_column: dict[str, list[dict[str, str]]] = {}
+    for rule in rules:
+        if rule["column"] and rule["column"] in df.columns:
+            by_column.setdefault(rule["column"], []).append(rule)
+    filters = [_ColumnFilter(col, col_rules) for col, col_rules in by_column.items()]
+    rows = np.arange(len(df))
+    if len(filters) > 1:
+        sample = _sample(df)
+        filters.sort(key=lambda f: len(f.positions(sample[f.column])))
+    values = column_values(df)
+    for f in filters:
+        if not len(rows):
+            break
+        s = df[f.column]
+        converted = [None, None]
+        if f.column in values.versions and not is_categorical(s):
+            converted = [
+                values.numeric(f.column) if f.bounds else None,
+                values.text(f.column) if f.text_rules else None,
+            ]
+        if len(rows) < len(df):
+            s = s.iloc[rows]
+            converted = [c.iloc[rows] if c is not None else None for c in converted]
+        rows = rows[f.positions(s, *converted)]
+    return rows
\ No newline at end of file
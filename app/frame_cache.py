@@ -0,0 +1,83 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable
+import pandas as pd
+from app.frame_store import frame_nbytes
+
+CACHE_BUDGET_BYTES = int(os.environ.get("DATAFORGE_CACHE_BUDGET_MB", "512")) * 1024**2
+
+
+class FrameCache:
+    """Process-wide LRU cache of decoded dataframes with a byte budget.
+
+    Entries are keyed by (session, handle). Every stored version of a file gets
+    its own handle, so a key always refers to immutable content and entries
+    never need to be invalidated, only evicted.
+    """
+
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._entries: OrderedDict[tuple[str, str], tuple[pd.DataFrame, int]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(
+        self, session: str, handle: str, loader: Callable[[str], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """Return a private copy of a frame, decoding it with loader on a miss."""
+        key = (session, handle)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0].copy()
+        df = loader(handle)
+        self.put(session, handle, df)
+        return df.copy()
+
+    def peek(self, session: str, handle: str) -> pd.DataFrame | None:
+        """Return the cached frame itself, without copying, or None on a miss.
+
+        The returned frame is shared with the cache and must not be modified.
+        """
+        with self._lock:
+            entry = self._entries.get((session, handle))
+            return entry[0] if entry is not None else None
+
+    def put(self, session: str, handle: str, df: pd.DataFrame):
+        """Add a decoded frame, evicting least recently used entries as needed."""
+        nbytes = frame_nbytes(df)
+        if nbytes > self.budget_bytes:
+            return
+        key = (session, handle)
+        with self._lock:
+            if key in self._entries:
+                self.used_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (df, nbytes)
+            self.used_bytes += nbytes
+            while self.used_bytes > self.budget_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.used_bytes -= evicted_bytes
+
+    def discard(self, handle: str):
+        """Drop every cached entry for a handle."""
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == handle]:
+                self.used_bytes -= self._entries.pop(key)[1]
+
+    def session_bytes(self, session: str) -> int:
+        """Return the bytes of decoded frames cached for a session."""
+        with self._lock:
+            return sum((e[1] for k, e in self._entries.items() if k[0] == session))
+
+    def discard_session(self, session: str):
+        """Drop every cached entry of a session."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == session]:
+                self.used_bytes -= self._entries.pop(key)[1]
+
+
+frame_cache = FrameCache(CACHE_BUDGET_BYTES)
\ No newline at end of file
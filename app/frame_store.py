@@ -0,0 +1,863 @@
+import os
+import json
+import hashlib
+import pickle
+import shutil
+import tempfile
+import threading
+import sqlite3
+import time
+import uuid
+import logging
+from collections import Counter
+from contextlib import closing, contextmanager, suppress
+from typing import Iterable, Iterator
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SHARED_STORE = os.environ.get("DATAFORGE_SHARED_STORE", "") == "1"
+STORE_DIR = os.environ.get(
+    "DATAFORGE_STORE_DIR",
+    os.path.join(
+        "/dev/shm"
+        if SHARED_STORE and os.path.isdir("/dev/shm")
+        else tempfile.gettempdir(),
+        "dataforge_frames",
+    ),
+)
+COLD_STORE_DIR = os.environ.get(
+    "DATAFORGE_COLD_STORE_DIR",
+    os.path.join(tempfile.gettempdir(), "dataforge_frames_cold"),
+)
+SESSION_TTL_SECONDS = int(os.environ.get("DATAFORGE_SESSION_TTL_S", "3600"))
+SESSION_IDLE_SECONDS = int(os.environ.get("DATAFORGE_SESSION_IDLE_S", "600"))
+SESSION_TOUCH_SECONDS = float(os.environ.get("DATAFORGE_SESSION_TOUCH_S", "5"))
+SPILL_THRESHOLD_BYTES = (
+    int(os.environ.get("DATAFORGE_SPILL_THRESHOLD_MB", "256")) * 1024**2
+)
+BLOB_COLUMN = "values"
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Return the frame with string column labels and a default row index."""
+    if not all((isinstance(col, str) for col in df.columns)):
+        df = df.rename(columns=str)
+    if not df.index.equals(pd.RangeIndex(len(df))):
+        df = df.reset_index(drop=True)
+    return df
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Return the in-memory size of a dataframe, including string payloads."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _same_values(left: pd.Series, right: pd.Series) -> bool:
+    return left.dtype == right.dtype and left.array.equals(right.array)
+
+
+def _digest_array(h: "hashlib._Hash", array: pa.Array):
+    h.update(f"{len(array)}:{array.offset}".encode())
+    for buf in array.buffers():
+        h.update(b"\0" if buf is None else buf)
+    if isinstance(array, pa.DictionaryArray):
+        _digest_array(h, array.dictionary)
+
+
+def _table_digest(table: pa.Table, ext: str) -> str:
+    """Hash the schema and value buffers of a single-column table."""
+    h = hashlib.blake2b(ext.encode(), digest_size=16)
+    h.update(table.schema.serialize())
+    for chunk in table.column(BLOB_COLUMN).chunks:
+        _digest_array(h, chunk)
+    return h.hexdigest()
+
+
+def column_to_pandas(column: pa.ChunkedArray, dtype: str | None) -> pd.Series:
+    """Convert a stored Arrow column to pandas using its recorded dtype.
+
+    Extension dtypes (nullable integers, booleans, strings, timezone-aware
+    datetimes) are built straight from the Arrow data, and plain text columns
+    keep None for missing values; anything else uses the Arrow type as is and
+    is only cast if it does not already match.
+    """
+    if dtype is None:
+        return column.to_pandas()
+    target = pd.api.types.pandas_dtype(dtype)
+    if hasattr(target, "__from_arrow__") and not isinstance(
+        target, pd.CategoricalDtype
+    ):
+        return pd.Series(target.__from_arrow__(column), copy=False)
+    if target == object and pa.types.is_string(column.type):
+        return pd.Series(column.to_numpy(zero_copy_only=False), dtype=object)
+    s = column.to_pandas()
+    if str(s.dtype) != dtype:
+        try:
+            s = s.astype(target)
+        except (TypeError, ValueError) as e:
+            logging.warning(f"Could not restore dtype {dtype}: {e}")
+    return s
+
+
+class StreamingError(Exception):
+    """Raised when the chunks of a streamed frame cannot form one stored frame."""
+
+
+class _ColumnSink:
+    """Writes the slices of one streamed column into a temporary blob file.
+
+    The blob's content hash is computed from the slices as they are written.
+    """
+
+    def __init__(self, path: str, ext: str, schema: pa.Schema):
+        self.schema = schema
+        self.tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        self._digest = hashlib.blake2b(ext.encode(), digest_size=16)
+        self._digest.update(schema.serialize())
+        self._file = None
+        if ext == "arrow":
+            self._file = pa.OSFile(self.tmp_path, "wb")
+            self._writer = pa.ipc.new_file(self._file, schema)
+        else:
+            self._writer = pq.ParquetWriter(self.tmp_path, schema)
+
+    def write(self, table: pa.Table):
+        if not table.schema.equals(self.schema, check_metadata=False):
+            try:
+                table = table.cast(self.schema)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                raise StreamingError(f"Column type changed between chunks: {e}")
+        table = table.replace_schema_metadata(self.schema.metadata)
+        for chunk in table.column(BLOB_COLUMN).chunks:
+            _digest_array(self._digest, chunk)
+        self._writer.write_table(table)
+
+    def close(self) -> str:
+        """Finish the file and return the blob name of its content."""
+        self._writer.close()
+        if self._file is not None:
+            self._file.close()
+        return self._digest.hexdigest()
+
+    def abort(self):
+        """Discard the temporary file."""
+        try:
+            self.close()
+        except Exception:
+            pass
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def _slice_table(s: pd.Series) -> pa.Table:
+    """Convert a column slice to a table with plain (not dictionary) values.
+
+    Slices of a dictionary-encoded column each carry their own dictionary, so
+    streamed columns are stored dense and re-encoded from the recorded dtype.
+    """
+    try:
+        table = pa.Table.from_pandas(
+            pd.DataFrame({BLOB_COLUMN: s}), preserve_index=False
+        )
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        raise StreamingError(f"Column {s.name} cannot be streamed: {e}")
+    column = table.column(BLOB_COLUMN)
+    if pa.types.is_dictionary(column.type):
+        table = table.set_column(0, BLOB_COLUMN, column.cast(column.type.value_type))
+    return table
+
+
+class FrameStore:
+    """Server-side columnar storage for dataframes, keyed by opaque handles.
+
+    Each handle names an immutable frame version: a small JSON manifest with
+    the row count and, per column, its exact pandas dtype and stored blob. The
+    recorded dtypes are applied directly on load, so nullable integers,
+    categories and timezones survive without any type inference.
+
+    Blobs are Parquet files, or uncompressed Arrow IPC files opened
+    memory-mapped when the frame is larger than the spill threshold or the
+    store is shared. A version written from a parent version points at the
+    parent's blobs for every column whose values did not change, so versions
+    share untouched columns.
+
+    Blob reference counts and the session that owns each frame live in a
+    SQLite registry next to the files, so several backend worker processes can
+    use the same store directory. With a shared store (by default under
+    /dev/shm) every frame is memory-mapped, and any worker attaches to a
+    session's data without copying it.
+
+    Blobs of a session that goes idle can be moved to a cold directory on disk
+    with evict_session; they are read from there until the session is touched
+    again, which moves them back. Frames of sessions that stay idle past the
+    session TTL are released by expire_sessions.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        spill_threshold_bytes: int,
+        shared: bool = False,
+        cold_root: str | None = None,
+    ):
+        self.root = root
+        self.spill_threshold_bytes = spill_threshold_bytes
+        self.shared = shared
+        self._blob_dir = os.path.join(self.root, "blobs")
+        os.makedirs(self._blob_dir, exist_ok=True)
+        self._cold_dir = os.path.join(cold_root, "blobs") if cold_root else None
+        if self._cold_dir:
+            os.makedirs(self._cold_dir, exist_ok=True)
+        self._registry_path = os.path.join(self.root, "registry.db")
+        self._touched: dict[str, float] = {}
+        with closing(sqlite3.connect(self._registry_path, timeout=30)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+        with self._registry() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blob_refs "
+                "(blob TEXT PRIMARY KEY, format TEXT NOT NULL, refs INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS frames "
+                "(handle TEXT PRIMARY KEY, session TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS uploads "
+                "(digest TEXT PRIMARY KEY, handle TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions "
+                "(session TEXT PRIMARY KEY, last_seen REAL NOT NULL, "
+                "evicted INTEGER NOT NULL DEFAULT 0)"
+            )
+
+    @contextmanager
+    def _registry(self) -> Iterator[sqlite3.Connection]:
+        """Open the registry inside a write transaction that commits on exit."""
+        conn = sqlite3.connect(self._registry_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _manifest_path(self, handle: str) -> str:
+        return os.path.join(self.root, f"{handle}.json")
+
+    def _blob_path(self, blob: str, ext: str) -> str:
+        return os.path.join(self._blob_dir, f"{blob}.{ext}")
+
+    def _cold_path(self, blob: str, ext: str) -> str:
+        return os.path.join(self._cold_dir, f"{blob}.{ext}")
+
+    def _find_blob(self, blob: str, ext: str) -> str:
+        """Return where a blob currently lives, hot or cold."""
+        path = self._blob_path(blob, ext)
+        if self._cold_dir and not os.path.exists(path):
+            cold = self._cold_path(blob, ext)
+            if os.path.exists(cold):
+                return cold
+        return path
+
+    def _manifest(self, handle: str) -> dict:
+        try:
+            with open(self._manifest_path(handle)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f"Unknown frame handle: {handle}")
+
+    def _encode_blob(
+        self, s: pd.Series, spill: bool
+    ) -> tuple[str, str, pa.Table | bytes]:
+        """Convert a column to its stored form and name it by its content."""
+        col_df = pd.DataFrame({BLOB_COLUMN: s})
+        try:
+            table = pa.Table.from_pandas(col_df, preserve_index=False)
+            ext = "arrow" if spill else "parquet"
+            return (_table_digest(table, ext), ext, table)
+        except Exception as e:
+            logging.warning(f"Falling back to pickle for column {s.name}: {e}")
+            payload = pickle.dumps(col_df)
+            return (
+                hashlib.blake2b(payload, digest_size=16).hexdigest(),
+                "pkl",
+                payload,
+            )
+
+    def _write_blob(self, blob: str, ext: str, payload: pa.Table | bytes):
+        """Write a blob unless a blob with the same content is already stored."""
+        if os.path.exists(self._find_blob(blob, ext)):
+            return
+        path = self._blob_path(blob, ext)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        if ext == "arrow":
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, payload.schema) as writer:
+                    writer.write_table(payload)
+        elif ext == "parquet":
+            pq.write_table(payload, tmp_path)
+        else:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+        os.replace(tmp_path, path)
+
+    def _read_blob(self, blob: str, ext: str, dtype: str | None) -> pd.Series:
+        path = self._find_blob(blob, ext)
+        if ext == "parquet":
+            table = pq.read_table(path)
+        elif ext == "arrow":
+            table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        else:
+            return pd.read_pickle(path)[BLOB_COLUMN]
+        return column_to_pandas(table.column(BLOB_COLUMN), dtype)
+
+    def put(
+        self,
+        df: pd.DataFrame,
+        parent: str | None = None,
+        parent_df: pd.DataFrame | None = None,
+        session: str = "",
+    ) -> str:
+        """Persist a dataframe for a session and return its handle.
+
+        Blobs are named by a hash of their content, so a column identical to
+        one already stored, in any frame, is only referenced, not written
+        again. When a parent version and its decoded frame are given, each
+        column equal to the parent column of the same name (or else the same
+        position) reuses the parent's blob without even being hashed.
+        """
+        handle = uuid.uuid4().hex
+        df = normalize_frame(df)
+        spill = self.shared or frame_nbytes(df) > self.spill_threshold_bytes
+        parent_columns = []
+        if parent is not None and parent_df is not None and len(parent_df) == len(df):
+            parent_columns = self._manifest(parent)["columns"]
+        by_name = {col["name"]: i for i, col in enumerate(parent_columns)}
+        columns = []
+        pending = []
+        for position, name in enumerate(df.columns):
+            s = df.iloc[:, position]
+            match = by_name.get(name)
+            if match is None and position < len(parent_columns):
+                match = position
+            if match is not None and _same_values(s, parent_df.iloc[:, match]):
+                columns.append({**parent_columns[match], "name": name})
+            else:
+                blob, ext, payload = self._encode_blob(s, spill)
+                pending.append((blob, ext, payload))
+                columns.append(
+                    {"name": name, "blob": blob, "format": ext, "dtype": str(s.dtype)}
+                )
+        # Reference the blobs before writing them: delete removes unreferenced
+        # blobs while holding the registry lock, so a blob referenced here
+        # cannot disappear between the existence check and the write.
+        self._add_frame(handle, session, columns)
+        for blob, ext, payload in pending:
+            self._write_blob(blob, ext, payload)
+        manifest = {"rows": len(df), "spilled": spill, "columns": columns}
+        with open(self._manifest_path(handle), "w") as f:
+            json.dump(manifest, f)
+        return handle
+
+    def _add_frame(self, handle: str, session: str, columns: list[dict]):
+        with self._registry() as conn:
+            conn.executemany(
+                "INSERT INTO blob_refs (blob, format, refs) VALUES (?, ?, 1) "
+                "ON CONFLICT (blob) DO UPDATE SET refs = refs + 1",
+                [(col["blob"], col["format"]) for col in columns],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO frames (handle, session) VALUES (?, ?)",
+                (handle, session),
+            )
+            self._touch(conn, session)
+
+    def clone(self, handle: str, session: str = "") -> str:
+        """Create a new handle for a session that shares all of a frame's blobs."""
+        manifest = self._manifest(handle)
+        new_handle = uuid.uuid4().hex
+        self._add_frame(new_handle, session, manifest["columns"])
+        with open(self._manifest_path(new_handle), "w") as f:
+            json.dump(manifest, f)
+        return new_handle
+
+    def find_upload(self, digest: str) -> str | None:
+        """Return a stored frame parsed from an upload with this digest."""
+        with self._registry() as conn:
+            row = conn.execute(
+                "SELECT handle FROM uploads WHERE digest = ?", (digest,)
+            ).fetchone()
+        if row is None or not os.path.exists(self._manifest_path(row[0])):
+            return None
+        return row[0]
+
+    def record_upload(self, digest: str, handle: str):
+        """Remember which frame an upload with this digest was parsed into."""
+        with self._registry() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO uploads (digest, handle) VALUES (?, ?)",
+                (digest, handle),
+            )
+
+    def get(self, handle: str, columns: list[str] | None = None) -> pd.DataFrame:
+        """Load the dataframe stored under a handle.
+
+        With columns, only the blobs of those columns are read.
+        """
+        manifest = self._manifest(handle)
+        stored = [
+            col
+            for col in manifest["columns"]
+            if columns is None or col["name"] in columns
+        ]
+        if not stored:
+            return pd.DataFrame(index=pd.RangeIndex(manifest["rows"]))
+        return pd.concat(
+            [
+                self._read_blob(col["blob"], col["format"], col.get("dtype")).rename(
+                    col["name"]
+                )
+                for col in stored
+            ],
+            axis=1,
+        )
+
+    def _read_column_rows(self, col: dict, start: int, stop: int) -> pd.Series:
+        """Decode rows start to stop of a stored column.
+
+        Parquet blobs are read one row group at a time, skipping the groups
+        before start; Arrow blobs are memory-mapped and sliced before decoding.
+        """
+        path = self._find_blob(col["blob"], col["format"])
+        if col["format"] == "pkl":
+            s = pd.read_pickle(path)[BLOB_COLUMN]
+            return s.iloc[start:stop].reset_index(drop=True)
+        if col["format"] == "arrow":
+            table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+            column = table.column(BLOB_COLUMN).slice(start, stop - start)
+            return column_to_pandas(column, col.get("dtype"))
+        parquet = pq.ParquetFile(path, pre_buffer=False)
+        groups, first, offset = [], None, 0
+        for i in range(parquet.num_row_groups):
+            size = parquet.metadata.row_group(i).num_rows
+            if offset >= stop:
+                break
+            if offset + size > start:
+                first = offset if first is None else first
+                groups.append(i)
+            offset += size
+        if not groups:
+            return column_to_pandas(
+                parquet.schema_arrow.empty_table().column(BLOB_COLUMN),
+                col.get("dtype"),
+            )
+        column = parquet.read_row_groups(groups).column(BLOB_COLUMN)
+        return column_to_pandas(
+            column.slice(start - first, stop - start), col.get("dtype")
+        )
+
+    def get_rows(self, handle: str, start: int, stop: int) -> pd.DataFrame:
+        """Load rows start to stop of a stored frame, reading only what holds them."""
+        manifest = self._manifest(handle)
+        start = min(max(start, 0), manifest["rows"])
+        stop = min(max(stop, start), manifest["rows"])
+        if not manifest["columns"]:
+            return pd.DataFrame(index=pd.RangeIndex(stop - start))
+        return pd.concat(
+            [
+                self._read_column_rows(col, start, stop).rename(col["name"])
+                for col in manifest["columns"]
+            ],
+            axis=1,
+        )
+
+    def _iter_column(self, col: dict, rows: int) -> Iterator[pd.Series]:
+        """Decode a stored column in consecutive slices of at most rows rows."""
+        path = self._find_blob(col["blob"], col["format"])
+        if col["format"] == "pkl":
+            s = pd.read_pickle(path)[BLOB_COLUMN]
+            for start in range(0, len(s), rows):
+                yield s.iloc[start : start + rows].reset_index(drop=True)
+            return
+        if col["format"] == "arrow":
+            reader = pa.ipc.open_file(pa.memory_map(path, "r"))
+            arrays = reader.read_all().column(BLOB_COLUMN).chunks
+        else:
+            arrays = (
+                batch.column(0)
+                for batch in pq.ParquetFile(path, pre_buffer=False).iter_batches(
+                    batch_size=rows
+                )
+            )
+        pending, size = [], 0
+        for array in arrays:
+            while len(array):
+                take = min(rows - size, len(array))
+                pending.append(array.slice(0, take))
+                size += take
+                array = array.slice(take)
+                if size == rows:
+                    yield column_to_pandas(pa.chunked_array(pending), col.get("dtype"))
+                    pending, size = [], 0
+        if pending:
+            yield column_to_pandas(pa.chunked_array(pending), col.get("dtype"))
+
+    def iter_chunks(self, handle: str, rows: int) -> Iterator[pd.DataFrame]:
+        """Yield a stored frame as consecutive row slices of at most rows rows.
+
+        Only the current slice of each column is decoded, so memory use does
+        not grow with the size of the frame.
+        """
+        manifest = self._manifest(handle)
+        columns = [
+            (col["name"], self._iter_column(col, rows)) for col in manifest["columns"]
+        ]
+        for _ in range(0, manifest["rows"], rows):
+            yield pd.concat(
+                [next(values).rename(name) for name, values in columns], axis=1
+            )
+
+    def put_chunks(
+        self,
+        chunks: Iterable[tuple[pd.DataFrame, pd.DataFrame]],
+        parent: str | None = None,
+        session: str = "",
+    ) -> str:
+        """Persist a frame produced slice by slice and return its handle.
+
+        chunks yields (slice, source) pairs, where source is the slice of the
+        parent frame the slice was computed from. Each column is written to
+        its blob as slices arrive; a column equal to the parent's in every
+        slice reuses the parent's blob instead. Raises StreamingError, leaving
+        nothing stored, when the slices disagree on columns or dtypes.
+        """
+        parent_manifest = self._manifest(parent) if parent else None
+        by_name = {
+            col["name"]: col
+            for col in (parent_manifest["columns"] if parent_manifest else [])
+        }
+        ext = (
+            "arrow"
+            if self.shared or (parent_manifest and parent_manifest["spilled"])
+            else "parquet"
+        )
+        names: list[str] | None = None
+        unchanged: set[int] = set()
+        dtypes: dict[int, str] = {}
+        sinks: dict[int, _ColumnSink] = {}
+        rows = 0
+        last = None
+
+        def write(i: int, s: pd.Series):
+            if dtypes.setdefault(i, str(s.dtype)) != str(s.dtype):
+                raise StreamingError(
+                    f"Column {names[i]} changed from {dtypes[i]} to {s.dtype}"
+                )
+            table = _slice_table(s)
+            if i not in sinks:
+                sinks[i] = _ColumnSink(
+                    self._blob_path("stream", ext), ext, table.schema
+                )
+            sinks[i].write(table)
+
+        try:
+            for df, source in chunks:
+                df = normalize_frame(df)
+                if names is None:
+                    names = list(df.columns)
+                    if len(set(names)) < len(names):
+                        raise StreamingError("Duplicate column names")
+                    unchanged = {i for i, name in enumerate(names) if name in by_name}
+                elif list(df.columns) != names:
+                    raise StreamingError("Columns changed between chunks")
+                same_rows = len(df) == len(source)
+                for i, name in enumerate(names):
+                    s = df.iloc[:, i]
+                    if i in unchanged:
+                        if (
+                            same_rows
+                            and name in source.columns
+                            and _same_values(s, source[name])
+                        ):
+                            continue
+                        unchanged.discard(i)
+                        backfill = self._iter_column(by_name[name], len(source))
+                        done = 0
+                        while done < rows:
+                            piece = next(backfill)[: rows - done]
+                            write(i, piece.rename(name))
+                            done += len(piece)
+                    if len(s):
+                        write(i, s)
+                rows += len(df)
+                last = df
+            if names is None:
+                raise StreamingError("No chunks to store")
+            if not rows:
+                return self.put(last, session=session)
+            blobs = {i: sink.close() for i, sink in sinks.items()}
+        except BaseException:
+            for sink in sinks.values():
+                sink.abort()
+            raise
+        columns = [
+            {**by_name[name], "name": name}
+            if i in unchanged
+            else {"name": name, "blob": blobs[i], "format": ext, "dtype": dtypes[i]}
+            for i, name in enumerate(names)
+        ]
+        handle = uuid.uuid4().hex
+        self._add_frame(handle, session, columns)
+        for i, sink in sinks.items():
+            if os.path.exists(self._find_blob(blobs[i], ext)):
+                os.remove(sink.tmp_path)
+            else:
+                os.replace(sink.tmp_path, self._blob_path(blobs[i], ext))
+        manifest = {"rows": rows, "spilled": ext == "arrow", "columns": columns}
+        with open(self._manifest_path(handle), "w") as f:
+            json.dump(manifest, f)
+        return handle
+
+    def column_files(self, handle: str) -> list[dict]:
+        """Return each stored column's name, dtype, blob format and file path."""
+        return [
+            {
+                "name": col["name"],
+                "dtype": col.get("dtype", "object"),
+                "format": col["format"],
+                "path": self._find_blob(col["blob"], col["format"]),
+            }
+            for col in self._manifest(handle)["columns"]
+        ]
+
+    def column_versions(self, handle: str) -> dict[str, str]:
+        """Return a version per column naming its stored content and dtype.
+
+        Columns with the same version hold the same values, in any frame.
+        Names that occur more than once in the frame are left out.
+        """
+        columns = self._manifest(handle)["columns"]
+        counts = Counter((col["name"] for col in columns))
+        return {
+            col["name"]: f"{col['blob']}:{col.get('dtype', 'object')}"
+            for col in columns
+            if counts[col["name"]] == 1
+        }
+
+    def exists(self, handle: str) -> bool:
+        return os.path.exists(self._manifest_path(handle))
+
+    def rows(self, handle: str) -> int:
+        """Return the row count of a stored frame."""
+        return self._manifest(handle)["rows"]
+
+    def schema(self, handle: str) -> dict[str, str]:
+        """Return the recorded column -> dtype mapping of a stored frame."""
+        return {
+            col["name"]: col.get("dtype", "object")
+            for col in self._manifest(handle)["columns"]
+        }
+
+    def is_spilled(self, handle: str) -> bool:
+        """Whether a frame is stored memory-mapped rather than decoded in full."""
+        return self._manifest(handle)["spilled"]
+
+    def size(self, handle: str) -> int:
+        """Return the number of bytes a stored frame occupies on disk."""
+        return sum(
+            (
+                os.path.getsize(self._find_blob(col["blob"], col["format"]))
+                for col in self._manifest(handle)["columns"]
+            )
+        )
+
+    def _session_blobs(self, session: str) -> set[tuple[str, str]]:
+        with self._registry() as conn:
+            handles = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT handle FROM frames WHERE session = ?", (session,)
+                )
+            ]
+        blobs = set()
+        for handle in handles:
+            try:
+                columns = self._manifest(handle)["columns"]
+            except KeyError:
+                continue
+            blobs.update(((col["blob"], col["format"]) for col in columns))
+        return blobs
+
+    def session_size(self, session: str) -> int:
+        """Return the bytes stored for a session, counting shared blobs once."""
+        total = 0
+        for blob, ext in self._session_blobs(session):
+            try:
+                total += os.path.getsize(self._find_blob(blob, ext))
+            except FileNotFoundError:
+                continue
+        return total
+
+    def _touch(self, conn: sqlite3.Connection, session: str) -> bool:
+        row = conn.execute(
+            "SELECT evicted FROM sessions WHERE session = ?", (session,)
+        ).fetchone()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (session, last_seen, evicted) "
+            "VALUES (?, ?, 0)",
+            (session, time.time()),
+        )
+        return bool(row and row[0])
+
+    def touch(self, session: str) -> bool:
+        """Mark a session as active, bringing back its evicted blobs.
+
+        A session this process recorded as active within the last
+        SESSION_TOUCH_SECONDS is not written again. Returns whether the
+        activity was recorded.
+        """
+        now = time.monotonic()
+        if now - self._touched.get(session, float("-inf")) < SESSION_TOUCH_SECONDS:
+            return False
+        with self._registry() as conn:
+            evicted = self._touch(conn, session)
+        self._touched[session] = now
+        if evicted:
+            self._move_blobs(self._session_blobs(session), to_cold=False)
+        return True
+
+    def _move_blobs(self, blobs: set[tuple[str, str]], to_cold: bool):
+        if not self._cold_dir:
+            return
+        for blob, ext in blobs:
+            hot, cold = self._blob_path(blob, ext), self._cold_path(blob, ext)
+            src, dst = (hot, cold) if to_cold else (cold, hot)
+            try:
+                shutil.move(src, dst)
+            except FileNotFoundError:
+                continue
+
+    def evict_idle_sessions(self, idle_seconds: int) -> list[str]:
+        """Move the blobs of sessions idle for longer than idle_seconds to disk.
+
+        Returns the sessions that were evicted by this call.
+        """
+        with self._registry() as conn:
+            evicted = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT session FROM sessions WHERE last_seen < ? AND evicted = 0",
+                    (time.time() - idle_seconds,),
+                )
+            ]
+            conn.executemany(
+                "UPDATE sessions SET evicted = 1 WHERE session = ?",
+                [(s,) for s in evicted],
+            )
+        for session in evicted:
+            self._move_blobs(self._session_blobs(session), to_cold=True)
+        return evicted
+
+    def idle_sessions(self, idle_seconds: int) -> list[str]:
+        """Return the sessions not touched within the last idle_seconds."""
+        with self._registry() as conn:
+            return [
+                row[0]
+                for row in conn.execute(
+                    "SELECT session FROM sessions WHERE last_seen < ?",
+                    (time.time() - idle_seconds,),
+                )
+            ]
+
+    def delete(self, handle: str):
+        """Remove a stored frame and any blobs no other frame uses."""
+        try:
+            manifest = self._manifest(handle)
+        except KeyError:
+            return
+        with self._registry() as conn:
+            conn.execute("DELETE FROM frames WHERE handle = ?", (handle,))
+            conn.execute("DELETE FROM uploads WHERE handle = ?", (handle,))
+            for col in manifest["columns"]:
+                conn.execute(
+                    "UPDATE blob_refs SET refs = refs - 1 WHERE blob = ?",
+                    (col["blob"],),
+                )
+            unused = conn.execute(
+                "SELECT blob, format FROM blob_refs WHERE refs <= 0"
+            ).fetchall()
+            conn.execute("DELETE FROM blob_refs WHERE refs <= 0")
+        # Files are removed only once the registry no longer references them,
+        # so a file that is already gone cannot roll back the refcounts.
+        for path in [self._manifest_path(handle)] + [
+            self._find_blob(blob, ext) for blob, ext in unused
+        ]:
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+    def expire_sessions(self, ttl_seconds: int) -> list[str]:
+        """Release every frame of sessions idle for longer than the TTL.
+
+        Returns the sessions that were expired.
+        """
+        with self._registry() as conn:
+            expired = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT session FROM sessions WHERE last_seen < ?",
+                    (time.time() - ttl_seconds,),
+                )
+            ]
+            conn.executemany(
+                "DELETE FROM sessions WHERE session = ?", [(s,) for s in expired]
+            )
+            handles = [
+                row[0]
+                for session in expired
+                for row in conn.execute(
+                    "SELECT handle FROM frames WHERE session = ?", (session,)
+                )
+            ]
+        for session in expired:
+            self._touched.pop(session, None)
+        for handle in handles:
+            self.delete(handle)
+        return expired
+
+
+_store: FrameStore | None = None
+_store_lock = threading.Lock()
+
+
+def _get_store() -> FrameStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FrameStore(
+                STORE_DIR,
+                SPILL_THRESHOLD_BYTES,
+                shared=SHARED_STORE,
+                cold_root=COLD_STORE_DIR if SHARED_STORE else None,
+            )
+        return _store
+
+
+class _LazyFrameStore:
+    """The process's frame store, opened on first use.
+
+    Importing a module that uses the store creates no directories or registry,
+    so tools such as the batch CLI that never touch it stay free of both.
+    """
+
+    root = STORE_DIR
+
+    def __getattr__(self, name: str):
+        return getattr(_get_store(), name)
+
+
+frame_store: FrameStore = _LazyFrameStore()
\ No newline at end of file
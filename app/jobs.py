@@ -0,0 +1,650 @@
+import asyncio
+import json
+import math
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+import zipfile
+from typing import Any, Awaitable, Callable, Iterator, NamedTuple
+import aiosqlite
+from app.admission import admit, out_of_core_failed
+from app.dataset import Dataset, DatasetPart, read_stored
+from app.file_formats import output_name, write_frame
+from app.frame_store import frame_store
+from app.operations import OPERATIONS, OperationError, RecipeStep
+from app.sql_backend import SQL_OPERATIONS, SQLUnsupported, run_sql, sql_enabled
+from app.workers import run_stored
+
+JOB_WORKERS = int(os.environ.get("DATAFORGE_JOB_WORKERS", "2"))
+JOB_DB_PATH = os.environ.get(
+    "DATAFORGE_JOB_DB", os.path.join(frame_store.root, "jobs.db")
+)
+JOB_POLL_SECONDS = float(os.environ.get("DATAFORGE_JOB_POLL_S", "0.2"))
+JOB_RETENTION_SECONDS = int(os.environ.get("DATAFORGE_JOB_RETENTION_S", "3600"))
+JOB_SESSION_LIMIT = int(os.environ.get("DATAFORGE_JOB_SESSION_LIMIT", "1"))
+JOB_AGING_SECONDS = float(os.environ.get("DATAFORGE_JOB_AGING_S", "30"))
+INTERACTIVE_MAX_ROWS = int(os.environ.get("DATAFORGE_INTERACTIVE_MAX_ROWS", "100000"))
+JOB_METRICS_WINDOW_SECONDS = int(
+    os.environ.get("DATAFORGE_JOB_METRICS_WINDOW_S", "300")
+)
+PRIORITY_CLASSES = {"interactive": 0, "transform": 1, "export": 2}
+EXPORT_DIR = os.path.join(frame_store.root, "exports")
+JOB_TIMEOUT_SECONDS = float(os.environ.get("DATAFORGE_OPERATION_TIMEOUT_S", "600"))
+JOB_KILL_GRACE_SECONDS = float(os.environ.get("DATAFORGE_JOB_KILL_GRACE_S", "30"))
+NamedOutput = tuple[str, str]
+
+
+class JobKind(NamedTuple):
+    func: Callable[..., list[NamedOutput]]
+    priority: str
+    discard: Callable[[str], None]
+
+
+JOB_KINDS: dict[str, JobKind] = {}
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once the session waiting for it has cancelled it."""
+
+
+class JobFailed(Exception):
+    """A job stopped with an unexpected error; the message is for the logs."""
+
+
+class JobTimeout(OperationError):
+    """Raised inside a job that has run for longer than JOB_TIMEOUT_SECONDS."""
+
+    def __init__(self):
+        super().__init__(
+            f"The operation was stopped after running for {JOB_TIMEOUT_SECONDS:g} "
+            "seconds. Filter the data or select fewer columns first."
+        )
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _job(
+    kind: str,
+    priority: str = "transform",
+    discard: Callable[[str], None] = frame_store.delete,
+):
+    """Register a function that runs jobs of a kind.
+
+    It is called with a JobContext and the job's payload as keyword
+    arguments. Jobs write what they produce to shared storage and return
+    (file name, reference) pairs, so only references leave the worker;
+    discard deletes what a reference points to. priority is the class jobs
+    of the kind are scheduled in unless the submitter picks another.
+    """
+
+    def register(func: Callable[..., list[NamedOutput]]):
+        JOB_KINDS[kind] = JobKind(func, priority, discard)
+        return func
+
+    return register
+
+
+def _plain(value: Any) -> Any:
+    return value.__wrapped__ if hasattr(value, "__wrapped__") else str(value)
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+class JobQueue:
+    """A queue of jobs in a SQLite database shared with the worker processes.
+
+    The web process submits jobs and follows them through aiosqlite, so
+    waiting for a job never blocks the event loop. Workers claim queued jobs
+    with plain sqlite3, publish their progress in the job's row and read the
+    cancellation flag from it.
+
+    Claiming is a fair-share scheduler. Jobs run in order of priority class,
+    and a job moves up one class for every JOB_AGING_SECONDS it waits, so
+    exports are delayed but never starved. A session runs at most
+    JOB_SESSION_LIMIT jobs at once, and among sessions with jobs in the same
+    class the one whose last job started longest ago goes first.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(sqlite3.connect(path, timeout=30)) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs "
+                "(id TEXT PRIMARY KEY, session TEXT NOT NULL, kind TEXT NOT NULL, "
+                "payload TEXT NOT NULL, status TEXT NOT NULL, "
+                "priority INTEGER NOT NULL, worker INTEGER, started REAL, "
+                "done INTEGER NOT NULL DEFAULT 0, "
+                "total INTEGER NOT NULL DEFAULT 0, detail TEXT NOT NULL DEFAULT '', "
+                "result TEXT, error TEXT, cancelled INTEGER NOT NULL DEFAULT 0, "
+                "created REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_session ON jobs (session, status)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open the database inside a write transaction that commits on exit."""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def claim(self, worker: int) -> tuple[str, str, dict] | None:
+        """Mark the next job due as running on a worker and return it."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, started = ?, "
+                "updated = ? WHERE id = ("
+                "SELECT q.id FROM jobs AS q WHERE q.status = 'queued' "
+                "AND (SELECT COUNT(*) FROM jobs AS r WHERE r.session = q.session "
+                "AND r.status = 'running') < ? "
+                "ORDER BY MAX(q.priority - CAST((? - q.created) / ? AS INTEGER), 0), "
+                "(SELECT MAX(s.started) FROM jobs AS s WHERE s.session = q.session) "
+                "NULLS FIRST, q.created LIMIT 1) RETURNING id, kind, payload",
+                (worker, now, now, JOB_SESSION_LIMIT, now, JOB_AGING_SECONDS),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def report(self, job_id: str, done: int, total: int, detail: str) -> bool:
+        """Publish a running job's progress; return whether it was cancelled."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "UPDATE jobs SET done = ?, total = ?, detail = ?, updated = ? "
+                "WHERE id = ? RETURNING cancelled",
+                (done, total, detail, time.time(), job_id),
+            ).fetchone()
+        return bool(row and row[0])
+
+    def finish(
+        self,
+        job_id: str,
+        status: str,
+        result: list[NamedOutput] | None = None,
+        error: str | None = None,
+    ):
+        """Record how a running job ended, unless it was already ended for it."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated = ? "
+                "WHERE id = ? AND status = 'running'",
+                (
+                    status,
+                    None if result is None else json.dumps(result),
+                    error,
+                    time.time(),
+                    job_id,
+                ),
+            )
+
+    def overdue(self, seconds: float) -> list[tuple[str, int]]:
+        """Return the (job id, worker) of jobs running for longer than seconds."""
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+            return conn.execute(
+                "SELECT id, worker FROM jobs WHERE status = 'running' AND started < ?",
+                (time.time() - seconds,),
+            ).fetchall()
+
+    def fail_worker_jobs(self, worker: int):
+        """Fail the jobs a worker was running when it exited."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'error', error = ?, updated = ? "
+                "WHERE status = 'running' AND worker = ?",
+                ("The worker process running the job exited.", time.time(), worker),
+            )
+
+    async def submit(
+        self, session: str, kind: str, payload: dict, priority: str
+    ) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        async with aiosqlite.connect(self.path, timeout=30) as db:
+            await db.execute(
+                "INSERT INTO jobs (id, session, kind, payload, status, priority, "
+                "created, updated) VALUES (?, ?, ?, ?, 'queued', ?, ?, ?)",
+                (
+                    job_id,
+                    session,
+                    kind,
+                    json.dumps(payload, default=_plain),
+                    PRIORITY_CLASSES[priority],
+                    now,
+                    now,
+                ),
+            )
+            await db.commit()
+        return job_id
+
+    async def status(self, job_id: str) -> dict[str, Any]:
+        """Return a job's status, progress and outcome, with its queue position."""
+        async with aiosqlite.connect(self.path, timeout=30) as db:
+            db.row_factory = aiosqlite.Row
+            async with db.execute(
+                "SELECT status, done, total, detail, result, error, "
+                "(SELECT COUNT(*) FROM jobs AS ahead WHERE ahead.status = 'queued' "
+                "AND (ahead.priority < jobs.priority OR (ahead.priority = "
+                "jobs.priority AND ahead.created < jobs.created))) AS ahead "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ) as cursor:
+                row = await cursor.fetchone()
+        if row is None:
+            raise KeyError(job_id)
+        return dict(row)
+
+    async def cancel(self, job_id: str):
+        """Ask for a job to stop; a job still in the queue never starts."""
+        async with aiosqlite.connect(self.path, timeout=30) as db:
+            await db.execute(
+                "UPDATE jobs SET cancelled = 1, status = CASE status "
+                "WHEN 'queued' THEN 'cancelled' ELSE status END, updated = ? "
+                "WHERE id = ?",
+                (time.time(), job_id),
+            )
+            await db.commit()
+
+    async def purge(self, max_age_seconds: int):
+        """Delete the records of jobs that finished more than max_age ago."""
+        async with aiosqlite.connect(self.path, timeout=30) as db:
+            await db.execute(
+                "DELETE FROM jobs WHERE status NOT IN ('queued', 'running') "
+                "AND updated < ?",
+                (time.time() - max_age_seconds,),
+            )
+            await db.commit()
+
+    async def metrics(self) -> dict[str, Any]:
+        """Report queue depth and waiting times, per priority class.
+
+        Waits cover the jobs that started within the last
+        JOB_METRICS_WINDOW_SECONDS; queued jobs count their wait so far.
+        """
+        now = time.time()
+        async with aiosqlite.connect(self.path, timeout=30) as db:
+            async with db.execute(
+                "SELECT status, priority, created, started FROM jobs "
+                "WHERE status IN ('queued', 'running') OR started >= ?",
+                (now - JOB_METRICS_WINDOW_SECONDS,),
+            ) as cursor:
+                rows = await cursor.fetchall()
+        classes = {}
+        for name, priority in PRIORITY_CLASSES.items():
+            queued = [
+                now - created
+                for status, p, created, _ in rows
+                if p == priority and status == "queued"
+            ]
+            waits = [
+                started - created
+                for _, p, created, started in rows
+                if p == priority and started is not None
+            ]
+            classes[name] = {
+                "queued": len(queued),
+                "running": sum(
+                    (
+                        1
+                        for status, p, _, _ in rows
+                        if p == priority and status == "running"
+                    )
+                ),
+                "oldest_queued_seconds": max(queued, default=0.0),
+                "started": len(waits),
+                "wait_mean_seconds": sum(waits) / len(waits) if waits else 0.0,
+                "wait_p95_seconds": _percentile(waits, 0.95) if waits else 0.0,
+                "wait_max_seconds": max(waits, default=0.0),
+            }
+        return {
+            "workers": JOB_WORKERS,
+            "queue_depth": sum((c["queued"] for c in classes.values())),
+            "running": sum((c["running"] for c in classes.values())),
+            "window_seconds": JOB_METRICS_WINDOW_SECONDS,
+            "classes": classes,
+        }
+
+
+job_queue = JobQueue(JOB_DB_PATH)
+
+
+class JobContext:
+    """What a running job uses to publish progress and notice cancellation.
+
+    Jobs are stopped at their next progress report once they have run for
+    JOB_TIMEOUT_SECONDS, if it is not 0.
+    """
+
+    def __init__(self, job_id: str | None = None):
+        self.job_id = job_id
+        self.deadline = (
+            time.monotonic() + JOB_TIMEOUT_SECONDS if JOB_TIMEOUT_SECONDS > 0 else None
+        )
+        self.cancelled = threading.Event()
+        self.done = 0
+        self.total = 0
+        self.detail = ""
+
+    def progress(self, done: int, total: int, detail: str):
+        """Publish progress; raises JobCancelled once the job was cancelled.
+
+        Raises JobTimeout once the job has run out of time.
+        """
+        self.done, self.total, self.detail = done, total, detail
+        if self.job_id is not None and job_queue.report(
+            self.job_id, done, total, detail
+        ):
+            self.cancelled.set()
+        if self.cancelled.is_set():
+            raise JobCancelled()
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise JobTimeout()
+
+
+def _run(kind: str, context: JobContext, payload: dict) -> list[NamedOutput]:
+    return JOB_KINDS[kind].func(context, **payload)
+
+
+def _worker_main():
+    """Run queued jobs one at a time until the web process goes away."""
+    worker = os.getpid()
+    parent = multiprocessing.parent_process()
+    while parent is None or parent.is_alive():
+        claimed = job_queue.claim(worker)
+        if claimed is None:
+            time.sleep(JOB_POLL_SECONDS)
+            continue
+        job_id, kind, payload = claimed
+        try:
+            result = _run(kind, JobContext(job_id), payload)
+        except JobCancelled:
+            job_queue.finish(job_id, "cancelled")
+        except OperationError as e:
+            job_queue.finish(job_id, "failed", error=str(e))
+        except Exception as e:
+            logging.exception(f"Error running {kind} job {job_id}: {e}")
+            job_queue.finish(job_id, "error", error=f"{type(e).__name__}: {e}")
+        else:
+            job_queue.finish(job_id, "done", result=result)
+
+
+_workers: list[multiprocessing.Process] = []
+_workers_lock = threading.Lock()
+
+
+def _ensure_workers():
+    """Start the worker processes, replacing any that have exited.
+
+    Workers still running a job JOB_KILL_GRACE_SECONDS after it timed out
+    are stuck outside progress reports, and are killed with the job failed.
+    """
+    with _workers_lock:
+        if JOB_TIMEOUT_SECONDS > 0:
+            overdue = job_queue.overdue(JOB_TIMEOUT_SECONDS + JOB_KILL_GRACE_SECONDS)
+            for job_id, worker in overdue:
+                for process in _workers:
+                    if process.pid == worker and process.is_alive():
+                        logging.warning(f"Killing job worker {worker} for {job_id}")
+                        process.kill()
+                        process.join()
+                        job_queue.finish(job_id, "failed", error=str(JobTimeout()))
+        for process in [p for p in _workers if not p.is_alive()]:
+            logging.warning(f"Job worker {process.pid} exited; starting another")
+            job_queue.fail_worker_jobs(process.pid)
+            _workers.remove(process)
+        context = multiprocessing.get_context("spawn")
+        while len(_workers) < JOB_WORKERS:
+            process = context.Process(target=_worker_main, daemon=True)
+            process.start()
+            _workers.append(process)
+
+
+def discard_outputs(kind: str, outputs: list[NamedOutput]):
+    """Delete what a job of a kind produced, when it will not be used."""
+    for _, reference in outputs:
+        JOB_KINDS[kind].discard(reference)
+
+
+async def run_job(
+    session: str,
+    kind: str,
+    payload: dict,
+    on_progress: Callable[[int, int, str], Awaitable[None]],
+    priority: str | None = None,
+) -> list[NamedOutput]:
+    """Run a job in the worker processes and wait for its outputs.
+
+    on_progress is called with the job's progress while it waits and runs.
+    If on_progress raises, the job is cancelled, whatever it stored is
+    deleted and the exception propagates. A job that fails raises
+    OperationError with its message, or JobFailed for unexpected errors.
+    priority overrides the kind's priority class. While waiting it replaces
+    workers that exited and kills those stuck on a timed-out job. With no
+    worker processes configured the job runs in a thread instead,
+    unscheduled, and times out only at its progress reports.
+    """
+    if JOB_WORKERS <= 0:
+        return await _run_in_thread(kind, payload, on_progress)
+    await asyncio.to_thread(_ensure_workers)
+    job_id = await job_queue.submit(
+        session, kind, payload, priority or JOB_KINDS[kind].priority
+    )
+    job = {"status": "queued"}
+    try:
+        while True:
+            job = await job_queue.status(job_id)
+            if job["status"] == "queued":
+                ahead = job["ahead"]
+                await on_progress(
+                    0,
+                    0,
+                    f"Waiting for a worker ({ahead} job{'s' * (ahead != 1)} ahead)"
+                    if ahead
+                    else "Waiting for a worker",
+                )
+            elif job["status"] == "running":
+                await on_progress(job["done"], job["total"], job["detail"])
+            else:
+                break
+            await asyncio.sleep(JOB_POLL_SECONDS)
+            await asyncio.to_thread(_ensure_workers)
+    except BaseException:
+        await job_queue.cancel(job_id)
+        while job["status"] in ("queued", "running"):
+            await asyncio.sleep(JOB_POLL_SECONDS)
+            await asyncio.to_thread(_ensure_workers)
+            job = await job_queue.status(job_id)
+        if job["status"] == "done":
+            discard_outputs(kind, json.loads(job["result"]))
+        raise
+    if job["status"] == "failed":
+        raise OperationError(job["error"])
+    if job["status"] != "done":
+        raise JobFailed(job["error"] or f"The job was {job['status']}.")
+    return [tuple(output) for output in json.loads(job["result"])]
+
+
+async def _run_in_thread(
+    kind: str,
+    payload: dict,
+    on_progress: Callable[[int, int, str], Awaitable[None]],
+) -> list[NamedOutput]:
+    context = JobContext()
+    task = asyncio.ensure_future(asyncio.to_thread(_run, kind, context, payload))
+    try:
+        while not task.done():
+            await on_progress(context.done, context.total, context.detail)
+            await asyncio.wait([task], timeout=JOB_POLL_SECONDS)
+    except BaseException:
+        context.cancelled.set()
+        try:
+            discard_outputs(kind, await task)
+        except Exception:
+            pass
+        raise
+    try:
+        return task.result()
+    except OperationError:
+        raise
+    except Exception as e:
+        logging.exception(f"Error running {kind} job: {e}")
+        raise JobFailed(f"{type(e).__name__}: {e}") from e
+
+
+def _stored_dataset(files: list[dict], context: JobContext) -> Dataset:
+    """Read stored files as a dataset that reports progress as it loads them."""
+    rows = sum((f["row_count"] for f in files))
+
+    def load(i: int, columns: list[str] | None):
+        done = sum((f["row_count"] for f in files[:i]))
+        context.progress(done, rows, f"Reading file {i + 1} of {len(files)}")
+        return read_stored(files[i]["handle"], columns)
+
+    return Dataset(
+        [
+            DatasetPart(
+                lambda columns, i=i: load(i, columns),
+                f["dtypes"],
+                f["row_count"],
+                frame_store.column_versions(f["handle"]),
+                lambda start, stop, f=f: frame_store.get_rows(f["handle"], start, stop),
+            )
+            for i, f in enumerate(files)
+        ]
+    )
+
+
+@_job("step")
+def run_step_job(
+    context: JobContext, files: list[dict], step: RecipeStep, session: str
+) -> list[NamedOutput]:
+    """Run one recipe step on stored files and store what it produces.
+
+    Returns one output per file for per-file operations, and the files the
+    operation produced for the others. Operations whose estimated memory use
+    is over budget are refused, or run in the SQL engine when only their
+    working set is over it.
+    """
+    op, params = step["op"], step["params"]
+    kind = OPERATIONS[op].kind
+    rows = sum((f["row_count"] for f in files))
+    result = None
+    stored = []
+    try:
+        context.progress(0, rows, "Estimating memory use")
+        out_of_core = admit(op, _stored_dataset(files, context), params)
+        if op in SQL_OPERATIONS and (out_of_core or sql_enabled(rows)):
+            context.progress(0, rows, f"Processing {rows:,} rows")
+            try:
+                result = run_sql(
+                    op, [(f["file_name"], f["handle"]) for f in files], params, session
+                )
+                if kind == "file":
+                    stored.extend((df for df in result if isinstance(df, str)))
+            except SQLUnsupported as e:
+                if out_of_core:
+                    raise out_of_core_failed(op) from e
+                logging.info(f"Running {op} with pandas: {e}")
+        if result is None and kind == "file":
+            result = []
+            for i, f in enumerate(files):
+                context.progress(
+                    sum((g["row_count"] for g in files[:i])),
+                    rows,
+                    f"Processing file {i + 1} of {len(files)}",
+                )
+                result.append(run_stored(f["file_name"], f["handle"], [step], session))
+                if isinstance(result[-1], str):
+                    stored.append(result[-1])
+        elif result is None:
+            result = OPERATIONS[op].func(_stored_dataset(files, context), **params)
+        if kind == "file":
+            result = [(f["file_name"], df) for f, df in zip(files, result)]
+        context.progress(rows, rows, "Storing results")
+        outputs = []
+        for name, df in result:
+            if not isinstance(df, str):
+                df = frame_store.put(df, session=session)
+                stored.append(df)
+            outputs.append((name, df))
+    except BaseException:
+        for handle in stored:
+            frame_store.delete(handle)
+        raise
+    return outputs
+
+
+@_job("plan")
+def run_plan_job(
+    context: JobContext, files: list[dict], plans: list[list[RecipeStep]], session: str
+) -> list[NamedOutput]:
+    """Run a plan of per-file steps on each stored file and store the results.
+
+    plans holds one plan per file. Returns one output per file.
+    """
+    rows = sum((f["row_count"] for f in files))
+    outputs = []
+    try:
+        for i, (f, plan) in enumerate(zip(files, plans)):
+            context.progress(
+                sum((g["row_count"] for g in files[:i])),
+                rows,
+                f"Processing file {i + 1} of {len(files)}",
+            )
+            result = run_stored(f["file_name"], f["handle"], plan, session)
+            if not isinstance(result, str):
+                result = frame_store.put(result, session=session)
+            outputs.append((f["file_name"], result))
+    except BaseException:
+        for _, handle in outputs:
+            frame_store.delete(handle)
+        raise
+    return outputs
+
+
+@_job("export", priority="export", discard=_remove_file)
+def run_export_job(
+    context: JobContext, files: list[dict], fmt: str
+) -> list[NamedOutput]:
+    """Write stored files in a download format into one ZIP archive on disk."""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    path = os.path.join(EXPORT_DIR, f"{uuid.uuid4().hex}.zip")
+    rows = sum((f["row_count"] for f in files))
+    done = 0
+    try:
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, False) as zip_file:
+            for i, f in enumerate(files):
+                context.progress(done, rows, f"Writing file {i + 1} of {len(files)}")
+                content = write_frame(read_stored(f["handle"]), fmt)
+                zip_file.writestr(output_name(f["file_name"], fmt), content)
+                done += f["row_count"]
+    except BaseException:
+        _remove_file(path)
+        raise
+    return [("dataforge_processed_files.zip", path)]
\ No newline at end of file
@@ -0,0 +1,519 @@
+import inspect
+import logging
+import re
+from typing import Any, Callable, NamedTuple, TypedDict
+import pandas as pd
+from app.categorical import is_categorical, is_text, map_text, text_mask, with_category
+from app.column_values import ColumnValues, column_values
+from app.dataset import Dataset
+from app.filters import filter_positions
+
+
+class RecipeStep(TypedDict):
+    op: str
+    params: dict[str, Any]
+
+
+NamedFrame = tuple[str, pd.DataFrame]
+
+
+class Operation(NamedTuple):
+    label: str
+    kind: str
+    func: Callable[..., Any]
+
+
+class OperationError(Exception):
+    """An operation could not be applied; the message is shown to the user."""
+
+
+OPERATIONS: dict[str, Operation] = {}
+
+
+def _operation(name: str, label: str, kind: str = "file"):
+    """Register a transformation under a recipe name.
+
+    "file" operations map one dataframe to a new one and run on every file.
+    "combine" operations turn all files, read as one Dataset, into a new list
+    of files, and "append" operations return files that are added to the
+    existing ones.
+    """
+
+    def register(func: Callable[..., Any]) -> Callable[..., Any]:
+        OPERATIONS[name] = Operation(label, kind, func)
+        return func
+
+    return register
+
+
+def validate_step(step: Any) -> RecipeStep:
+    """Check that a step names a known operation with matching parameters."""
+    if not isinstance(step, dict) or not isinstance(step.get("params"), dict):
+        raise OperationError(f"Malformed recipe step: {step!r}")
+    operation = OPERATIONS.get(step.get("op"))
+    if operation is None:
+        raise OperationError(f"Unknown operation: {step.get('op')!r}")
+    try:
+        inspect.signature(operation.func).bind(None, **step["params"])
+    except TypeError as e:
+        raise OperationError(f"Invalid parameters for {step['op']}: {e}")
+    return {"op": step["op"], "params": step["params"]}
+
+
+def apply_step(frames: list[NamedFrame], step: RecipeStep) -> list[NamedFrame]:
+    """Apply one recipe step to a list of named dataframes."""
+    operation = OPERATIONS[step["op"]]
+    if operation.kind == "file":
+        return [(name, operation.func(df, **step["params"])) for name, df in frames]
+    result = operation.func(
+        Dataset.from_frames([df for _, df in frames]), **step["params"]
+    )
+    if operation.kind == "append":
+        return frames + result
+    return result
+
+
+def run_recipe(frames: list[NamedFrame], steps: list[RecipeStep]) -> list[NamedFrame]:
+    """Apply every step of a recipe in order, keeping intermediates in memory."""
+    for step in steps:
+        frames = apply_step(frames, step)
+    return frames
+
+
+def _numeric_mask(s: pd.Series, op: str, value: str) -> pd.Series:
+    numeric_col = pd.to_numeric(s, errors="coerce")
+    numeric_val = pd.to_numeric(value, errors="coerce")
+    mask = pd.Series(False, index=s.index)
+    valid = numeric_col.notna() & (numeric_val is not None)
+    if op == "greater_than":
+        mask[valid] = numeric_col[valid] > numeric_val
+    elif op == "less_than":
+        mask[valid] = numeric_col[valid] < numeric_val
+    elif op == "ge":
+        mask[valid] = numeric_col[valid] >= numeric_val
+    elif op == "le":
+        mask[valid] = numeric_col[valid] <= numeric_val
+    return mask
+
+
+def filter_mask(s: pd.Series, op: str, value: str) -> pd.Series:
+    """Return the rows of a column that satisfy one filter rule."""
+    if op == "equals":
+        return text_mask(s, lambda v: v == value)
+    if op == "not_equals":
+        return text_mask(s, lambda v: v != value)
+    if op == "contains":
+        return text_mask(s, lambda v: v.str.contains(value, case=False, na=False))
+    if op == "not_contains":
+        return ~text_mask(s, lambda v: v.str.contains(value, case=False, na=False))
+    if op == "is_empty":
+        return s.isnull() | text_mask(s, lambda v: v == "")
+    if op == "is_not_empty":
+        return s.notnull() & text_mask(s, lambda v: v != "")
+    return _numeric_mask(s, op, value)
+
+
+def condition_mask(df: pd.DataFrame, rule: dict[str, str]) -> pd.Series:
+    """Return the rows matched by the condition of a conditional rule."""
+    s = df[rule["condition_column"]]
+    op = rule["condition_op"]
+    if op in ("equals", "not_equals", "contains"):
+        return filter_mask(s, op, rule["condition_value"])
+    if op in ("greater_than", "less_than"):
+        return _numeric_mask(s, op, rule["condition_value"])
+    return pd.Series(False, index=df.index)
+
+
+def validation_failures(
+    df: pd.DataFrame, rule: dict[str, str], values: ColumnValues | None = None
+) -> pd.Series | None:
+    """Return the rows failing a validation rule, or None for unknown rules.
+
+    Pass the frame's ColumnValues to share column conversions between rules.
+    """
+    col, rule_type = rule["column"], rule["rule_type"]
+    param1, param2 = rule["param1"], rule["param2"]
+    values = values or ColumnValues(df)
+    if rule_type == "required":
+        return df[col].isnull() | (values.text(col) == "")
+    if rule_type == "min_length":
+        return values.text(col).str.len() < int(param1)
+    if rule_type == "max_length":
+        return values.text(col).str.len() > int(param1)
+    if rule_type == "numeric_range":
+        return ~values.numeric(col).between(float(param1), float(param2))
+    if rule_type == "regex_pattern":
+        return ~values.text(col).str.match(param1, na=False)
+    return None
+
+
+@_operation("rename_columns", "Rename columns")
+def rename_columns(df: pd.DataFrame, mapping: dict[str, str]) -> pd.DataFrame:
+    return df.rename(columns={k: v for k, v in mapping.items() if k in df.columns})
+
+
+@_operation("filter_rows", "Filter rows")
+def filter_rows(df: pd.DataFrame, rules: list[dict[str, str]]) -> pd.DataFrame:
+    return df.iloc[filter_positions(df, rules)]
+
+
+@_operation("convert_types", "Convert data types")
+def convert_types(df: pd.DataFrame, types: dict[str, str]) -> pd.DataFrame:
+    values = column_values(df)
+    for col, new_type in types.items():
+        if col not in df.columns:
+            continue
+        try:
+            if new_type == "string":
+                df[col] = values.text(col).copy()
+            elif new_type == "integer":
+                df[col] = values.numeric(col).astype("Int64").copy()
+            elif new_type == "float":
+                df[col] = values.numeric(col).astype(float).copy()
+            elif new_type == "boolean":
+                df[col] = df[col].astype(bool)
+            elif new_type == "date":
+                df[col] = values.dates(col).copy()
+        except Exception as e:
+            raise OperationError(f"Failed to convert '{col}' to {new_type}.") from e
+    return df
+
+
+@_operation("remove_duplicates", "Remove duplicates")
+def remove_duplicates(df: pd.DataFrame, columns: list[str], keep: str) -> pd.DataFrame:
+    return df.drop_duplicates(subset=columns, keep=keep if keep != "none" else False)
+
+
+@_operation("select_columns", "Select columns")
+def select_columns(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    return df[[col for col in columns if col in df.columns]]
+
+
+@_operation("fill_nulls", "Fill nulls")
+def fill_nulls(
+    df: pd.DataFrame, columns: list[str], strategy: str, value: str
+) -> pd.DataFrame:
+    for col in columns:
+        if col not in df.columns:
+            continue
+        if strategy in ("mean", "median") and not pd.api.types.is_numeric_dtype(
+            df[col]
+        ):
+            raise OperationError(
+                f"'{strategy.capitalize()}' can only be applied to numeric columns. '{col}' is not numeric."
+            )
+        try:
+            if strategy == "custom":
+                df[col] = with_category(df[col], value).fillna(value)
+            elif strategy == "ffill":
+                df[col] = df[col].ffill()
+            elif strategy == "bfill":
+                df[col] = df[col].bfill()
+            elif strategy == "mean":
+                df[col] = df[col].fillna(df[col].mean())
+            elif strategy == "median":
+                df[col] = df[col].fillna(df[col].median())
+            elif strategy == "mode":
+                mode_val = df[col].mode()
+                if not mode_val.empty:
+                    df[col] = df[col].fillna(mode_val[0])
+        except Exception as e:
+            raise OperationError(f"Failed to fill nulls in '{col}'.") from e
+    return df
+
+
+@_operation("drop_null_rows", "Remove rows with nulls")
+def drop_null_rows(df: pd.DataFrame) -> pd.DataFrame:
+    return df.dropna()
+
+
+def _search_columns(df: pd.DataFrame, column: str) -> list[str]:
+    columns = [column] if column != "_all_" else list(df.columns)
+    return [col for col in columns if col in df.columns and is_text(df[col])]
+
+
+def count_matches(
+    df: pd.DataFrame, column: str, find: str, case_sensitive: bool
+) -> int:
+    """Count occurrences of a pattern in one text column or all of them."""
+    return sum(
+        (
+            int(
+                df[col]
+                .str.count(find, flags=0 if case_sensitive else re.IGNORECASE)
+                .sum()
+            )
+            for col in _search_columns(df, column)
+        )
+    )
+
+
+@_operation("find_replace", "Find and replace")
+def find_replace(
+    df: pd.DataFrame,
+    column: str,
+    find: str,
+    replace: str,
+    case_sensitive: bool,
+    regex: bool,
+) -> pd.DataFrame:
+    for col in _search_columns(df, column):
+        df[col] = map_text(
+            df[col],
+            lambda v: v.str.replace(find, replace, case=case_sensitive, regex=regex),
+        )
+    return df
+
+
+_CASE_FUNCS = {
+    "upper": lambda v: v.str.upper(),
+    "lower": lambda v: v.str.lower(),
+    "title": lambda v: v.str.title(),
+    "capitalize": lambda v: v.str.capitalize(),
+}
+
+
+@_operation("convert_case", "Convert case")
+def convert_case(df: pd.DataFrame, columns: list[str], case: str) -> pd.DataFrame:
+    func = _CASE_FUNCS.get(case)
+    for col in columns:
+        if func and col in df.columns and is_text(df[col]):
+            df[col] = map_text(df[col], func)
+    return df
+
+
+_WHITESPACE_FUNCS = {
+    "leading": lambda v: v.str.lstrip(),
+    "trailing": lambda v: v.str.rstrip(),
+    "all": lambda v: v.str.strip(),
+    "collapse": lambda v: v.str.replace("\\s+", " ", regex=True).str.strip(),
+}
+
+
+@_operation("trim_whitespace", "Trim whitespace")
+def trim_whitespace(df: pd.DataFrame, columns: list[str], mode: str) -> pd.DataFrame:
+    func = _WHITESPACE_FUNCS.get(mode)
+    for col in columns:
+        if func and col in df.columns and is_text(df[col]):
+            df[col] = map_text(df[col], func)
+    return df
+
+
+@_operation("split_column", "Split column")
+def split_column(
+    df: pd.DataFrame, column: str, delimiter: str, max_splits: int, prefix: str
+) -> pd.DataFrame:
+    if column not in df.columns:
+        return df
+    split_data = df[column].str.split(delimiter, n=max_splits, expand=True)
+    split_data.columns = [f"{prefix}{j + 1}" for j in range(len(split_data.columns))]
+    for name in split_data.columns:
+        if name in df.columns:
+            raise OperationError(
+                f"New column name '{name}' already exists. Choose a different prefix."
+            )
+    return pd.concat([df, split_data], axis=1)
+
+
+@_operation("join_columns", "Join columns")
+def join_columns(
+    df: pd.DataFrame, columns: list[str], separator: str, new_column: str
+) -> pd.DataFrame:
+    if new_column in df.columns:
+        raise OperationError(f"New column name '{new_column}' already exists.")
+    df[new_column] = df[columns].astype(str).agg(separator.join, axis=1)
+    return df
+
+
+@_operation("extract_substring", "Extract substring")
+def extract_substring(
+    df: pd.DataFrame, column: str, start: int, end: int | None, new_column: str
+) -> pd.DataFrame:
+    if column in df.columns:
+        df[new_column] = df[column].str[start:end]
+    return df
+
+
+@_operation("sort_rows", "Sort rows")
+def sort_rows(
+    df: pd.DataFrame, columns: list[str], ascending: list[bool]
+) -> pd.DataFrame:
+    return df.sort_values(by=columns, ascending=ascending)
+
+
+@_operation("sample_rows", "Sample rows", kind="append")
+def sample_rows(
+    data: Dataset, method: str, n: int, percentage: float
+) -> list[NamedFrame]:
+    if not data.parts:
+        raise OperationError("No data to sample.")
+    if method == "random":
+        return [(f"sampled_data_random_{n}_rows.csv", data.sample(n=n))]
+    if method == "percentage":
+        return [
+            (
+                f"sampled_data_percentage_{percentage}_percent.csv",
+                data.sample(frac=percentage / 100),
+            )
+        ]
+    if method == "top":
+        return [(f"sampled_data_top_{n}_rows.csv", data.head(n))]
+    if method == "bottom":
+        return [(f"sampled_data_bottom_{n}_rows.csv", data.tail(n))]
+    raise OperationError("Invalid sample type.")
+
+
+@_operation("conditional_transform", "Conditional transform")
+def conditional_transform(
+    df: pd.DataFrame, rules: list[dict[str, str]]
+) -> pd.DataFrame:
+    for rule in rules:
+        try:
+            mask = condition_mask(df, rule)
+            target_col = rule["target_column"]
+            action_val = rule["action_value"]
+            if rule["action"] == "set_value":
+                if target_col in df.columns:
+                    df[target_col] = with_category(df[target_col], action_val)
+                df.loc[mask, target_col] = action_val
+            elif rule["action"] == "copy_from_column":
+                if target_col in df.columns and is_categorical(df[target_col]):
+                    df[target_col] = df[target_col].astype(object)
+                df.loc[mask, target_col] = df.loc[mask, action_val]
+        except Exception as e:
+            raise OperationError(
+                f"Error with rule for column '{rule['condition_column']}'. Check parameters."
+            ) from e
+    return df
+
+
+@_operation("pivot", "Pivot table", kind="combine")
+def pivot(
+    data: Dataset, index: str, columns: str, values: str, aggfunc: str
+) -> list[NamedFrame]:
+    pivot_df = (
+        data.aggregate([index, columns], {values: aggfunc})
+        .pivot_table(
+            index=index, columns=columns, values=values, aggfunc="first", observed=True
+        )
+        .reset_index()
+    )
+    return [("pivoted_data.csv", pivot_df)]
+
+
+@_operation("melt", "Melt", kind="combine")
+def melt(
+    data: Dataset,
+    id_vars: list[str],
+    value_vars: list[str],
+    var_name: str,
+    value_name: str,
+) -> list[NamedFrame]:
+    melted_df = data.select(id_vars + value_vars).melt(
+        id_vars=id_vars, value_vars=value_vars, var_name=var_name, value_name=value_name
+    )
+    return [("melted_data.csv", melted_df)]
+
+
+@_operation("group_by", "Group by", kind="combine")
+def group_by(
+    data: Dataset, columns: list[str], agg_columns: list[str], aggfunc: str
+) -> list[NamedFrame]:
+    grouped_df = data.aggregate(columns, {col: aggfunc for col in agg_columns})
+    return [("grouped_data.csv", grouped_df)]
+
+
+@_operation("extract_date_parts", "Extract date components")
+def extract_date_parts(
+    df: pd.DataFrame, columns: list[str], components: list[str]
+) -> pd.DataFrame:
+    values = column_values(df)
+    for col in columns:
+        if col not in df.columns:
+            continue
+        try:
+            date_series = values.dates(col)
+            for comp in components:
+                new_col_name = f"{col}_{comp}"
+                if new_col_name in df.columns:
+                    continue
+                if comp in ("year", "month", "day", "weekday", "hour", "minute"):
+                    df[new_col_name] = getattr(date_series.dt, comp)
+        except Exception as e:
+            raise OperationError(f"Failed to process date column '{col}'.") from e
+    return df
+
+
+@_operation("date_difference", "Date difference")
+def date_difference(
+    df: pd.DataFrame, column1: str, column2: str, new_column: str
+) -> pd.DataFrame:
+    if column1 in df.columns and column2 in df.columns:
+        values = column_values(df)
+        col1 = values.dates(column1)
+        col2 = values.dates(column2)
+        df[new_column] = (col1 - col2).dt.days
+    return df
+
+
+@_operation("date_arithmetic", "Date arithmetic")
+def date_arithmetic(
+    df: pd.DataFrame, column: str, op: str, unit: str, value: int
+) -> pd.DataFrame:
+    if column in df.columns:
+        date_series = column_values(df).dates(column)
+        delta = pd.to_timedelta(value, unit=unit.rstrip("s"))
+        df[column] = date_series + delta if op == "add" else date_series - delta
+    return df
+
+
+@_operation("label_encode", "Label encoding")
+def label_encode(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    for col in columns:
+        if col in df.columns:
+            df[f"{col}_encoded"] = pd.factorize(df[col])[0]
+    return df
+
+
+@_operation("onehot_encode", "One-hot encoding")
+def onehot_encode(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    # Encoded columns can keep categories no row holds any more.
+    values = df[columns].apply(
+        lambda s: s.cat.remove_unused_categories() if is_categorical(s) else s
+    )
+    dummies = pd.get_dummies(values, prefix=columns, prefix_sep="_")
+    return pd.concat([df.drop(columns=columns), dummies], axis=1)
+
+
+@_operation("remove_special_chars", "Remove special characters")
+def remove_special_chars(
+    df: pd.DataFrame, columns: list[str], pattern: str
+) -> pd.DataFrame:
+    for col in columns:
+        if col in df.columns:
+            df[col] = map_text(
+                df[col], lambda v: v.astype(str).str.replace(pattern, "", regex=True)
+            )
+    return df
+
+
+@_operation("remove_invalid_rows", "Remove invalid rows", kind="combine")
+def remove_invalid_rows(data: Dataset, rules: list[dict[str, str]]) -> list[NamedFrame]:
+    valid_frames = []
+    for df, values in data.values():
+        failing = pd.Series(False, index=df.index)
+        for rule in rules:
+            if not rule["column"] or rule["column"] not in df.columns:
+                continue
+            try:
+                failures = validation_failures(df, rule, values)
+            except Exception as e:
+                logging.exception(f"Error during removal check for rule {rule}: {e}")
+                continue
+            if failures is not None:
+                failing |= failures
+        valid_frames.append(df[~failing])
+    valid_rows_df = pd.concat(valid_frames, ignore_index=True)
+    if valid_rows_df.empty:
+        return []
+    return [("combined_and_validated.csv", valid_rows_df)]
\ No newline at end of file
@@ -0,0 +1,225 @@
+import pandas as pd
+from app.operations import NamedFrame, RecipeStep, apply_step
+
+LAZY_OPERATIONS = {
+    "rename_columns",
+    "filter_rows",
+    "select_columns",
+    "convert_case",
+    "trim_whitespace",
+    "find_replace",
+    "remove_special_chars",
+}
+TEXT_OPERATIONS = {
+    "convert_case",
+    "trim_whitespace",
+    "find_replace",
+    "remove_special_chars",
+}
+_TEXT_DTYPES = ("object", "str", "string", "category")
+
+
+def _step(op: str, **params) -> RecipeStep:
+    return {"op": op, "params": params}
+
+
+def _effective_mapping(step: RecipeStep, schema: dict[str, str]) -> dict[str, str]:
+    return {k: v for k, v in step["params"]["mapping"].items() if k in schema}
+
+
+def next_schema(schema: dict[str, str], step: RecipeStep) -> dict[str, str]:
+    """Return the column -> dtype schema a lazy operation produces."""
+    if step["op"] == "rename_columns":
+        mapping = _effective_mapping(step, schema)
+        return {mapping.get(col, col): dtype for col, dtype in schema.items()}
+    if step["op"] == "select_columns":
+        return {col: schema[col] for col in step["params"]["columns"] if col in schema}
+    return schema
+
+
+def output_schema(schema: dict[str, str], steps: list[RecipeStep]) -> dict[str, str]:
+    """Return the schema of a frame after a sequence of lazy operations."""
+    for step in steps:
+        schema = next_schema(schema, step)
+    return schema
+
+
+def _schemas(schema: dict[str, str], steps: list[RecipeStep]) -> list[dict[str, str]]:
+    schemas = [schema]
+    for step in steps:
+        schemas.append(next_schema(schemas[-1], step))
+    return schemas
+
+
+def _text_columns(step: RecipeStep, schema: dict[str, str]) -> set[str]:
+    if step["op"] != "find_replace":
+        return set(step["params"]["columns"])
+    if step["params"]["column"] != "_all_":
+        return {step["params"]["column"]}
+    return {col for col, dtype in schema.items() if dtype.startswith(_TEXT_DTYPES)}
+
+
+def _filter_columns(step: RecipeStep) -> set[str]:
+    return {rule["column"] for rule in step["params"]["rules"] if rule["column"]}
+
+
+def _push_filter(
+    filter_step: RecipeStep, before: RecipeStep, schema: dict[str, str]
+) -> RecipeStep | None:
+    """Rewrite a filter so it can run before the step preceding it.
+
+    Returns None when the filter depends on what that step does.
+    """
+    if before["op"] in TEXT_OPERATIONS:
+        if _filter_columns(filter_step) & _text_columns(before, schema):
+            return None
+        return filter_step
+    if before["op"] == "rename_columns":
+        mapping = _effective_mapping(before, schema)
+        inverse = {v: k for k, v in mapping.items()}
+        renamed = next_schema(schema, before)
+        rules = [
+            {**rule, "column": inverse.get(rule["column"], rule["column"])}
+            for rule in filter_step["params"]["rules"]
+            if rule["column"] in renamed
+        ]
+        return _step("filter_rows", rules=rules)
+    return None
+
+
+def _fuse(
+    first: RecipeStep, second: RecipeStep, schema: dict[str, str]
+) -> RecipeStep | None:
+    """Combine two adjacent steps into one equivalent step, if possible."""
+    if first["op"] != second["op"]:
+        return None
+    op, p1, p2 = first["op"], first["params"], second["params"]
+    if op == "filter_rows":
+        return _step(op, rules=p1["rules"] + p2["rules"])
+    if op == "select_columns":
+        return _step(op, columns=[c for c in p2["columns"] if c in p1["columns"]])
+    if op == "rename_columns":
+        m1 = _effective_mapping(first, schema)
+        m2 = _effective_mapping(second, next_schema(schema, first))
+        mapping = {k: m2.get(v, v) for k, v in m1.items()}
+        mapping.update({k: v for k, v in m2.items() if k not in m1.values()})
+        return _step(op, mapping=mapping)
+    if op in ("convert_case", "trim_whitespace", "remove_special_chars"):
+        same_params = {k: v for k, v in p1.items() if k != "columns"} == {
+            k: v for k, v in p2.items() if k != "columns"
+        }
+        if same_params and not set(p1["columns"]) & set(p2["columns"]):
+            return _step(op, **{**p1, "columns": p1["columns"] + p2["columns"]})
+    return None
+
+
+def _prune(steps: list[RecipeStep], schema: dict[str, str]) -> list[RecipeStep]:
+    """Drop work on columns that a later selection discards.
+
+    Walks the plan backwards tracking which columns are still needed, narrows
+    text operations to those columns, and selects only the needed columns
+    before the first step.
+    """
+    schemas = _schemas(schema, steps)
+    needed: set[str] | None = None
+    pruned: list[RecipeStep] = []
+    for step, before in zip(reversed(steps), reversed(schemas[:-1])):
+        op, params = step["op"], step["params"]
+        if op == "select_columns":
+            selected = {col for col in params["columns"] if col in before}
+            needed = selected if needed is None else selected & needed
+        elif op == "rename_columns" and needed is not None:
+            inverse = {v: k for k, v in _effective_mapping(step, before).items()}
+            needed = {inverse.get(col, col) for col in needed}
+        elif op == "filter_rows" and needed is not None:
+            needed = needed | _filter_columns(step)
+        elif op in TEXT_OPERATIONS and needed is not None:
+            if op == "find_replace":
+                if params["column"] != "_all_" and params["column"] not in needed:
+                    continue
+            else:
+                columns = [col for col in params["columns"] if col in needed]
+                if not columns:
+                    continue
+                step = _step(op, **{**params, "columns": columns})
+        pruned.append(step)
+    pruned.reverse()
+    if needed is not None and set(schema) - needed:
+        pruned.insert(
+            0, _step("select_columns", columns=[c for c in schema if c in needed])
+        )
+    return pruned
+
+
+def optimize(steps: list[RecipeStep], schema: dict[str, str]) -> list[RecipeStep]:
+    """Rewrite a plan of lazy operations into a cheaper equivalent plan.
+
+    Filters move ahead of renames and of string operations on other columns,
+    so those operations see fewer rows; adjacent compatible steps are fused
+    into one; and columns that a later selection drops are removed before
+    any work is done on them. The schema is that of the frame the plan will
+    run on, which makes every rewrite exact for that frame. Plans that rename
+    columns into duplicate names are returned unchanged.
+    """
+    columns = list(schema)
+    for step in steps:
+        if step["op"] == "rename_columns":
+            mapping = _effective_mapping(step, dict.fromkeys(columns))
+            columns = [mapping.get(col, col) for col in columns]
+            if len(set(columns)) < len(columns):
+                return list(steps)
+        elif step["op"] == "select_columns":
+            columns = [col for col in step["params"]["columns"] if col in columns]
+    plan = list(steps)
+    changed = True
+    while changed:
+        changed = False
+        schemas = _schemas(schema, plan)
+        for i in range(1, len(plan)):
+            if plan[i]["op"] != "filter_rows":
+                continue
+            pushed = _push_filter(plan[i], plan[i - 1], schemas[i - 1])
+            if pushed is not None:
+                plan[i - 1 : i + 1] = [pushed, plan[i - 1]]
+                changed = True
+                break
+    plan = _prune(plan, schema)
+    fused: list[RecipeStep] = []
+    schemas = [schema]
+    for step in plan:
+        combined = _fuse(fused[-1], step, schemas[-2]) if fused else None
+        if combined is not None:
+            fused[-1] = combined
+            schemas[-1] = next_schema(schemas[-2], combined)
+        else:
+            fused.append(step)
+            schemas.append(next_schema(schemas[-1], step))
+    return fused
+
+
+def frame_schema(df: pd.DataFrame) -> dict[str, str]:
+    """Return the column -> dtype schema of a dataframe."""
+    return {str(col): str(dtype) for col, dtype in df.dtypes.items()}
+
+
+def run_optimized(
+    frames: list[NamedFrame], steps: list[RecipeStep]
+) -> list[NamedFrame]:
+    """Apply a recipe, optimizing each run of lazy steps against every frame."""
+    i = 0
+    while i < len(steps):
+        if steps[i]["op"] not in LAZY_OPERATIONS:
+            frames = apply_step(frames, steps[i])
+            i += 1
+            continue
+        j = i
+        while j < len(steps) and steps[j]["op"] in LAZY_OPERATIONS:
+            j += 1
+        optimized = []
+        for name, df in frames:
+            named = [(name, df)]
+            for step in optimize(steps[i:j], frame_schema(df)):
+                named = apply_step(named, step)
+            optimized.extend(named)
+        frames, i = optimized, j
+    return frames
\ No newline at end of file
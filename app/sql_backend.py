@@ -0,0 +1,337 @@
+import logging
+import os
+import tempfile
+import uuid
+from typing import Callable
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from app.frame_store import StreamingError, column_to_pandas, frame_store
+from app.operations import NamedFrame
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+SQL_BACKEND = os.environ.get("DATAFORGE_SQL_BACKEND", "duckdb")
+SQL_MIN_ROWS = int(os.environ.get("DATAFORGE_SQL_MIN_ROWS", "1000000"))
+SQL_MEMORY_LIMIT = os.environ.get("DATAFORGE_SQL_MEMORY_LIMIT", "2GB")
+SQL_TEMP_DIR = os.environ.get(
+    "DATAFORGE_SQL_TEMP_DIR", os.path.join(tempfile.gettempdir(), "dataforge_sql")
+)
+SQL_OPERATIONS: dict[str, Callable] = {}
+SQL_BATCH_ROWS = 100_000
+_ROW = "__dataforge_row"
+_AGGREGATES = {
+    "sum": "COALESCE(SUM({col}), 0)",
+    "mean": "AVG({col})",
+    "count": "COUNT({col})",
+    "min": "MIN({col})",
+    "max": "MAX({col})",
+}
+_NUMERIC_AGGREGATES = {"sum", "mean"}
+
+if SQL_BACKEND == "duckdb" and duckdb is None:
+    logging.warning(
+        "DATAFORGE_SQL_BACKEND is duckdb but duckdb is not installed; "
+        "operations run with pandas only"
+    )
+
+
+class SQLUnsupported(Exception):
+    """Raised when an operation has to run on the pandas path instead."""
+
+
+def _sql_operation(name: str):
+    def register(func: Callable) -> Callable:
+        SQL_OPERATIONS[name] = func
+        return func
+
+    return register
+
+
+def sql_available() -> bool:
+    """Whether the embedded SQL engine is installed and configured."""
+    return duckdb is not None and SQL_BACKEND == "duckdb"
+
+
+def sql_enabled(rows: int) -> bool:
+    """Whether inputs of this many rows go to the embedded SQL engine."""
+    return sql_available() and rows >= SQL_MIN_ROWS
+
+
+def _connect() -> "duckdb.DuckDBPyConnection":
+    os.makedirs(SQL_TEMP_DIR, exist_ok=True)
+    return duckdb.connect(
+        config={"memory_limit": SQL_MEMORY_LIMIT, "temp_directory": SQL_TEMP_DIR}
+    )
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _frame_sql(
+    con: "duckdb.DuckDBPyConnection",
+    handle: str,
+    columns: list[str],
+    row_number: bool = False,
+) -> str | None:
+    """Build a query reading the given columns of a stored frame.
+
+    Parquet blobs are scanned from disk and Arrow blobs through their memory
+    map; the columns are lined up with a positional join. Columns the frame
+    does not have are left out, and None is returned when it has none.
+    """
+    stored = {col["name"]: col for col in frame_store.column_files(handle)}
+    parts = []
+    for name in dict.fromkeys(columns):
+        col = stored.get(name)
+        if col is None:
+            continue
+        with_row = row_number and not parts
+        if col["format"] == "parquet":
+            path = col["path"].replace("'", "''")
+            source = (
+                f"read_parquet('{path}', file_row_number = {str(with_row).lower()})"
+            )
+            row = f", file_row_number AS {_ROW}" if with_row else ""
+        elif col["format"] == "arrow":
+            table = pa.ipc.open_file(pa.memory_map(col["path"], "r")).read_all()
+            if with_row:
+                table = table.append_column(_ROW, pa.array(np.arange(len(table))))
+            source = f"blob_{uuid.uuid4().hex}"
+            con.register(source, table)
+            row = f", {_ROW}" if with_row else ""
+        else:
+            raise SQLUnsupported(f"Column {name} is not stored in a columnar format")
+        parts.append(f'(SELECT "values" AS {_quote(name)}{row} FROM {source})')
+    if not parts:
+        return None
+    return "SELECT * FROM " + " POSITIONAL JOIN ".join(parts)
+
+
+def _dtypes(handles: list[str], columns: list[str]) -> dict[str, str]:
+    """Return the stored dtype of each column, which must agree across frames."""
+    dtypes = {}
+    for handle in handles:
+        for name, dtype in frame_store.schema(handle).items():
+            if name in columns and dtypes.setdefault(name, dtype) != dtype:
+                raise SQLUnsupported(f"Column {name} has different types per file")
+    return dtypes
+
+
+def _combined_sql(
+    con: "duckdb.DuckDBPyConnection", handles: list[str], columns: list[str]
+) -> str:
+    """Build a query stacking the given columns of several stored frames."""
+    queries = [q for q in (_frame_sql(con, h, columns) for h in handles) if q]
+    if not queries:
+        raise SQLUnsupported("No file has the selected columns")
+    return " UNION ALL BY NAME ".join(f"({q})" for q in queries)
+
+
+def _is_numeric(dtype: str) -> bool:
+    target = pd.api.types.pandas_dtype(dtype)
+    return pd.api.types.is_numeric_dtype(target) and not pd.api.types.is_bool_dtype(
+        target
+    )
+
+
+def _aggregate_sql(col: str, aggfunc: str, dtype: str) -> str:
+    if aggfunc not in _AGGREGATES:
+        raise SQLUnsupported(f"Aggregation {aggfunc} is not supported")
+    if aggfunc in _NUMERIC_AGGREGATES and not _is_numeric(dtype):
+        raise SQLUnsupported(f"Cannot {aggfunc} non-numeric column {col}")
+    if pd.api.types.pandas_dtype(dtype) == "category" and aggfunc in ("min", "max"):
+        raise SQLUnsupported(f"Cannot {aggfunc} categorical column {col}")
+    sql = _AGGREGATES[aggfunc].format(col=_quote(col))
+    if aggfunc == "sum" and pd.api.types.is_integer_dtype(
+        pd.api.types.pandas_dtype(dtype)
+    ):
+        sql = f"CAST({sql} AS BIGINT)"
+    return sql
+
+
+def _restore_dtype(s: pd.Series, dtype: str) -> pd.Series:
+    """Give a result column the dtype pandas would have produced, if possible."""
+    try:
+        return s.astype(dtype)
+    except (TypeError, ValueError):
+        return s
+
+
+def _aggregate(
+    handles: list[str], keys: list[str], values: dict[str, str]
+) -> pd.DataFrame:
+    """Group stacked frames by keys and aggregate columns like pandas does.
+
+    Groups with a null key are dropped and the result is ordered by the keys,
+    matching ``groupby(keys, observed=True)``.
+    """
+    dtypes = _dtypes(handles, keys + list(values))
+    for col in keys + list(values):
+        if col not in dtypes:
+            raise SQLUnsupported(f"No file has column {col}")
+    selects = [_quote(key) for key in keys] + [
+        f"{_aggregate_sql(col, func, dtypes[col])} AS {_quote(col)}"
+        for col, func in values.items()
+    ]
+    key_list = ", ".join(_quote(key) for key in keys)
+    con = _connect()
+    try:
+        source = _combined_sql(con, handles, keys + list(values))
+        not_null = " AND ".join(f"{_quote(key)} IS NOT NULL" for key in keys)
+        df = con.execute(
+            f"SELECT {', '.join(selects)} FROM ({source}) WHERE {not_null} "
+            f"GROUP BY {key_list} ORDER BY {key_list}"
+        ).df()
+    finally:
+        con.close()
+    for key in keys:
+        df[key] = _restore_dtype(df[key], dtypes[key])
+    for col, func in values.items():
+        if not _is_numeric(dtypes[col]):
+            continue
+        nullable = isinstance(
+            pd.api.types.pandas_dtype(dtypes[col]), pd.api.extensions.ExtensionDtype
+        )
+        if func in ("sum", "min", "max"):
+            df[col] = _restore_dtype(df[col], dtypes[col])
+        elif nullable:
+            df[col] = _restore_dtype(df[col], "Int64" if func == "count" else "Float64")
+    return df
+
+
+@_sql_operation("group_by")
+def group_by(
+    files: list[tuple[str, str]],
+    columns: list[str],
+    agg_columns: list[str],
+    aggfunc: str,
+    session: str = "",
+) -> list[NamedFrame]:
+    handles = [handle for _, handle in files]
+    grouped_df = _aggregate(handles, columns, {col: aggfunc for col in agg_columns})
+    return [("grouped_data.csv", grouped_df)]
+
+
+@_sql_operation("pivot")
+def pivot(
+    files: list[tuple[str, str]],
+    index: str,
+    columns: str,
+    values: str,
+    aggfunc: str,
+    session: str = "",
+) -> list[NamedFrame]:
+    handles = [handle for _, handle in files]
+    long_df = _aggregate(handles, [index, columns], {values: aggfunc})
+    pivot_df = long_df.pivot_table(
+        index=index, columns=columns, values=values, aggfunc="first", observed=True
+    ).reset_index()
+    return [("pivoted_data.csv", pivot_df)]
+
+
+@_sql_operation("sort_rows")
+def sort_rows(
+    files: list[tuple[str, str]],
+    columns: list[str],
+    ascending: list[bool],
+    session: str = "",
+) -> list[str]:
+    """Sort each file in SQL and store the sorted rows batch by batch.
+
+    The engine spills the sort to disk past its memory limit, and its
+    result is streamed into the frame store, so no file is held in memory
+    whole. Returns the handle of each sorted file.
+    """
+    result = []
+    try:
+        for _, handle in files:
+            result.append(_sorted_frame(handle, columns, ascending, session))
+    except BaseException:
+        for sorted_handle in result:
+            frame_store.delete(sorted_handle)
+        raise
+    return result
+
+
+def _sorted_frame(
+    handle: str, columns: list[str], ascending: list[bool], session: str
+) -> str:
+    dtypes = frame_store.schema(handle)
+    if any((dtypes.get(col) == "category" for col in columns)):
+        raise SQLUnsupported("Categorical columns sort by category order")
+    if any((col not in dtypes for col in columns)):
+        raise SQLUnsupported("Sorting by a missing column")
+    order = ", ".join(
+        f"{_quote(col)} {'ASC' if asc else 'DESC'} NULLS LAST"
+        for col, asc in zip(columns, ascending)
+    )
+    names = list(dtypes)
+    con = _connect()
+    try:
+        source = _frame_sql(con, handle, names, row_number=True)
+        select = ", ".join(_quote(name) for name in names)
+        batches = con.execute(
+            f"SELECT {select} FROM ({source}) ORDER BY {order}, {_ROW}"
+        ).fetch_record_batch(SQL_BATCH_ROWS)
+
+        def chunks():
+            for batch in batches:
+                df = pd.DataFrame(
+                    {
+                        name: column_to_pandas(
+                            pa.chunked_array([batch.column(i)]), dtypes[name]
+                        )
+                        for i, name in enumerate(names)
+                    }
+                )
+                yield df, df
+
+        return frame_store.put_chunks(chunks(), session=session)
+    except StreamingError as e:
+        raise SQLUnsupported(str(e)) from e
+    finally:
+        con.close()
+
+
+def run_sql(
+    op: str, files: list[tuple[str, str]], params: dict, session: str = ""
+) -> list:
+    """Run an operation on stored (file name, handle) pairs in the SQL engine.
+
+    Returns what the pandas implementation would: named frames for combining
+    operations, and for per-file ones one frame per file, or the handle of
+    the file stored for the session. Raises SQLUnsupported when the inputs
+    need the pandas path.
+    """
+    try:
+        return SQL_OPERATIONS[op](files, session=session, **params)
+    except duckdb.Error as e:
+        raise SQLUnsupported(str(e)) from e
+
+
+def count_duplicates(handles: list[str], columns: list[str]) -> int:
+    """Count the rows per file that repeat an earlier row's values in columns."""
+    duplicates = 0
+    con = _connect()
+    try:
+        for handle in handles:
+            source = _frame_sql(con, handle, columns)
+            if source is None or any(
+                (col not in frame_store.schema(handle) for col in columns)
+            ):
+                raise SQLUnsupported("Duplicate check on a missing column")
+            select = ", ".join(_quote(col) for col in columns)
+            unique = con.execute(
+                f"SELECT COUNT(*) FROM (SELECT DISTINCT {select} FROM ({source}))"
+            ).fetchone()[0]
+            duplicates += frame_store.rows(handle) - unique
+    except duckdb.Error as e:
+        raise SQLUnsupported(str(e)) from e
+    finally:
+        con.close()
+    return duplicates
\ No newline at end of file
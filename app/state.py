@@ -1,9 +1,82 @@
 import reflex as rx
 import pandas as pd
 from typing import TypedDict, Any
-import io
+import asyncio
+import os
+import hashlib
+import json
 import logging
 import re
+import time
+import uuid
+from app.frame_store import frame_store, normalize_frame
+from app.frame_cache import frame_cache
+from app.admission import admit, out_of_core_failed
+from app.jobs import INTERACTIVE_MAX_ROWS, discard_outputs, run_job
+from app.categorical import is_text
+from app.column_values import ColumnValues
+from app.dataset import Dataset, DatasetPart, read_stored
+from app.file_formats import is_supported, output_name, write_frame
+from app.operations import (
+    OPERATIONS,
+    OperationError,
+    RecipeStep,
+    count_matches,
+    validate_step,
+    validation_failures,
+)
+from app.planner import LAZY_OPERATIONS, optimize, output_schema
+from app.sql_backend import (
+    SQL_OPERATIONS,
+    SQLUnsupported,
+    count_duplicates,
+    run_sql,
+    sql_enabled,
+)
+from app.streaming import can_stream, stream_upload
+from app.workers import discard_results, run_in_pool, run_steps, run_stored, use_pool
+
+HISTORY_DEPTH = int(os.environ.get("DATAFORGE_HISTORY_DEPTH", "20"))
+STEP_CACHE_ENTRIES = int(os.environ.get("DATAFORGE_STEP_CACHE_ENTRIES", "50"))
+SESSION_QUOTA_BYTES = (
+    int(os.environ.get("DATAFORGE_SESSION_QUOTA_MB", "2048")) * 1024**2
+)
+TASK_BUSY_MESSAGE = "Another operation is still running."
+UPLOAD_DIR = os.path.join(frame_store.root, "uploads")
+UPLOAD_CHUNK_BYTES = int(os.environ.get("DATAFORGE_UPLOAD_CHUNK_MB", "8")) * 1024**2
+UPLOAD_POLL_SECONDS = 0.25
+UPLOAD_PREVIEW_ROWS = 10
+
+
+class TaskCancelled(Exception):
+    """Raised inside a background task once the user has cancelled it."""
+
+
+class _UploadTooLarge(Exception):
+    """Raised while parsing an upload that would exceed the session quota."""
+
+    def __init__(self, nbytes: int):
+        super().__init__(nbytes)
+        self.nbytes = nbytes
+
+
+class _UploadProgress:
+    """What a streamed upload has parsed so far, updated from its thread.
+
+    Stops the upload once the parsed frame outgrows available_bytes.
+    """
+
+    def __init__(self, available_bytes: int | None):
+        self.available_bytes = available_bytes
+        self.rows = 0
+        self.preview: pd.DataFrame | None = None
+
+    def __call__(self, df: pd.DataFrame, rows: int, nbytes: int):
+        if self.available_bytes is not None and nbytes > self.available_bytes:
+            raise _UploadTooLarge(nbytes)
+        self.rows = rows
+        if self.preview is None:
+            self.preview = df.head(UPLOAD_PREVIEW_ROWS)
 
 
 class FilterRule(TypedDict):
@@ -25,7 +98,23 @@ class FileData(TypedDict):
     file_name: str
     row_count: int
     columns: list[str]
-    df_json: str
+    dtypes: dict[str, str]
+    size_bytes: int
+    handle: str
+
+
+class HistoryEntry(TypedDict):
+    label: str
+    files: list[FileData]
+    recipe: list[RecipeStep]
+    checkpoints: list[list[FileData] | None]
+
+
+class FileSummary(TypedDict):
+    file_name: str
+    row_count: int
+    column_count: int
+    size_label: str
 
 
 class ConditionalRule(TypedDict):
@@ -45,13 +134,148 @@ class SortConfig(TypedDict):
     ascending: bool
 
 
+def _file_info(
+    file_name: str,
+    df: pd.DataFrame,
+    parent: str | None = None,
+    parent_df: pd.DataFrame | None = None,
+    session: str = "",
+) -> FileData:
+    """Store a dataframe in the frame store and describe it for the state."""
+    handle = frame_store.put(df, parent=parent, parent_df=parent_df, session=session)
+    return _stored_file_info(file_name, handle)
+
+
+def _stored_file_info(file_name: str, handle: str) -> FileData:
+    """Describe a frame that is already in the frame store."""
+    dtypes = frame_store.schema(handle)
+    return {
+        "file_name": file_name,
+        "row_count": frame_store.rows(handle),
+        "columns": list(dtypes),
+        "dtypes": dtypes,
+        "size_bytes": frame_store.size(handle),
+        "handle": handle,
+    }
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def _receive_upload(file: rx.UploadFile, path: str) -> str:
+    """Copy an upload to path chunk by chunk and return the digest of its bytes.
+
+    The bytes are hashed together with the parser their extension selects.
+    """
+    h = hashlib.blake2b(os.path.splitext(file.name)[1].lower().encode())
+    with open(path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            h.update(chunk)
+            f.write(chunk)
+    return h.hexdigest()
+
+
+def _priority(files: list[FileData]) -> str:
+    """Schedule jobs on small inputs ahead of larger transforms."""
+    rows = sum((f["row_count"] for f in files))
+    return "interactive" if rows <= INTERACTIVE_MAX_ROWS else "transform"
+
+
+def _handles(files: list[FileData]) -> list[str]:
+    return [f["handle"] for f in files]
+
+
+def _step_key(files: list[FileData], step: RecipeStep) -> str:
+    """Hash a step together with the file versions it is applied to."""
+    key = {"files": [[f["file_name"], f["handle"]] for f in files], "step": step}
+    # Steps read back from state are wrapped in change-tracking proxies.
+    encoded = json.dumps(
+        key,
+        sort_keys=True,
+        default=lambda value: (
+            value.__wrapped__ if hasattr(value, "__wrapped__") else str(value)
+        ),
+    )
+    return hashlib.blake2b(encoded.encode()).hexdigest()
+
+
+def _format_bytes(size: int) -> str:
+    """Format a byte count as a short human-readable label."""
+    if size < 1024:
+        return f"{size} B"
+    for unit in ["KB", "MB"]:
+        size /= 1024
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+    return f"{size / 1024:.1f} GB"
+
+
+def _validate_frame(
+    df: pd.DataFrame,
+    rules: list[ValidationRule],
+    versions: dict[str, str] | None = None,
+) -> tuple[int, dict[str, int]]:
+    """Count the rows of a frame failing any rule, and the failures per rule.
+
+    versions are the stored column versions df holds, so that conversions are
+    shared with earlier validations of the same columns.
+    """
+    failing = pd.Series(False, index=df.index)
+    details = {}
+    values = ColumnValues(df, versions)
+    for rule in rules:
+        if not rule["column"] or rule["column"] not in df.columns:
+            continue
+        try:
+            failures = validation_failures(df, rule, values)
+        except Exception as e:
+            logging.exception(f"Error validating rule {rule}: {e}")
+            raise OperationError(f"Invalid parameter for rule on '{rule['column']}'.")
+        if failures is None or not failures.any():
+            continue
+        rule_key = f'''"{rule["column"]}" - {rule["rule_type"]}'''
+        details[rule_key] = int(failures.sum())
+        failing |= failures
+    return int(failing.sum()), details
+
+
+def _format_duration(seconds: float) -> str:
+    """Format a duration as a short label such as 45s or 3m 05s."""
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    return f"{int(seconds) // 60}m {int(seconds) % 60:02d}s"
+
+
 class State(rx.State):
     """The main application state."""
 
     active_tab: str = "upload"
     is_uploading: bool = False
+    upload_detail: str = ""
+    upload_preview_columns: list[str] = []
+    upload_preview: list[dict] = []
     is_dragging: bool = False
-    uploaded_files: list[FileData] = []
+    _uploaded_files: list[FileData] = []
+    _history: list[HistoryEntry] = []
+    _redo_history: list[HistoryEntry] = []
+    _step_label: str = ""
+    _recipe: list[RecipeStep] = []
+    _checkpoints: list[list[FileData] | None] = []
+    _step_cache: dict[str, list[FileData]] = {}
+    editing_step: int = -1
+    edit_step_params: str = ""
+    _pending_plan: list[RecipeStep] = []
+    lazy_mode: bool = False
+    _loaded_recipe: list[RecipeStep] = []
+    _stored_bytes: int = 0
+    _cached_bytes: int = 0
+    task_label: str = ""
+    task_progress: int = 0
+    task_detail: str = ""
+    _task_started: float = 0.0
+    _task_cancelled: bool = False
     column_mappings: dict[str, str] = {}
     data_type_mappings: dict[str, str] = {}
     filter_rules: list[FilterRule] = []
@@ -61,7 +285,8 @@ class State(rx.State):
     next_validation_id: int = 0
     validation_results: dict[str, int | dict[str, int]] = {}
     show_validation_results: bool = False
-    preview_data: list[dict] = []
+    _preview_data: list[dict] = []
+    _preview_rows: int = 0
     preview_columns: list[str] = []
     preview_page: int = 1
     preview_rows_per_page: int = 10
@@ -134,31 +359,616 @@ class State(rx.State):
     @rx.var
     def total_preview_rows(self) -> int:
         """Total number of rows in the preview data."""
-        return len(self.preview_data)
+        return self._preview_rows
 
     @rx.var
     def total_preview_pages(self) -> int:
         """Total number of pages for the preview table."""
-        if not self.preview_data:
+        if not self._preview_rows:
             return 1
         return -(-self.total_preview_rows // self.preview_rows_per_page)
 
     @rx.var
     def paginated_preview_data(self) -> list[dict]:
         """The data for the current page of the preview table."""
-        start = (self.preview_page - 1) * self.preview_rows_per_page
-        end = start + self.preview_rows_per_page
-        return self.preview_data[start:end]
+        return self._preview_data
+
+    @rx.var
+    def uploaded_files(self) -> list[FileSummary]:
+        """Lightweight per-file metadata sent to the client."""
+        return [
+            {
+                "file_name": f["file_name"],
+                "row_count": f["row_count"],
+                "column_count": len(f["columns"]),
+                "size_label": _format_bytes(f["size_bytes"]),
+            }
+            for f in self._uploaded_files
+        ]
+
+    @rx.var
+    def storage_usage_label(self) -> str:
+        """Bytes this session holds in the frame store and the decoded cache."""
+        label = f"{_format_bytes(self._stored_bytes)} stored"
+        if SESSION_QUOTA_BYTES:
+            label += f" of {_format_bytes(SESSION_QUOTA_BYTES)}"
+        return f"{label}, {_format_bytes(self._cached_bytes)} in memory"
 
     @rx.var
     def all_columns(self) -> list[str]:
         """Get a unique, sorted list of all column names from all uploaded files."""
         all_cols = set()
-        for file_data in self.uploaded_files:
-            for col in file_data["columns"]:
+        for file_data in self._uploaded_files:
+            for col in output_schema(file_data["dtypes"], self._pending_plan):
                 all_cols.add(col)
         return sorted(list(all_cols))
 
+    @rx.var
+    def pending_labels(self) -> list[str]:
+        """Labels of the steps planned in lazy mode but not yet executed."""
+        return [OPERATIONS[step["op"]].label for step in self._pending_plan]
+
+    @rx.var
+    def history_labels(self) -> list[str]:
+        """Labels of the steps that can be undone, oldest first."""
+        return [entry["label"] for entry in self._history]
+
+    @rx.var
+    def recipe_labels(self) -> list[str]:
+        """Labels of the operations recorded in the current recipe."""
+        return [OPERATIONS[step["op"]].label for step in self._recipe]
+
+    @rx.var
+    def loaded_recipe_labels(self) -> list[str]:
+        """Labels of the operations in the recipe loaded for replay."""
+        return [OPERATIONS[step["op"]].label for step in self._loaded_recipe]
+
+    @rx.var
+    def undo_label(self) -> str:
+        """Label of the step the next undo reverts, or empty if none."""
+        return self._history[-1]["label"] if self._history else ""
+
+    @rx.var
+    def redo_label(self) -> str:
+        """Label of the step the next redo reapplies, or empty if none."""
+        return self._redo_history[-1]["label"] if self._redo_history else ""
+
+    @property
+    def _session_id(self) -> str:
+        return self.router.session.client_token
+
+    def _get_frame(self, file_data: FileData) -> pd.DataFrame:
+        """Load a file's dataframe, reusing the decoded copy when cached."""
+        if frame_store.is_spilled(file_data["handle"]):
+            return frame_store.get(file_data["handle"])
+        return frame_cache.get(self._session_id, file_data["handle"], frame_store.get)
+
+    def _read_frame(
+        self, file_data: FileData, columns: list[str] | None = None
+    ) -> pd.DataFrame:
+        """Read a file, or some of its columns, without copying a cached frame.
+
+        The result may be shared with the cache and must not be modified.
+        """
+        df = frame_cache.peek(self._session_id, file_data["handle"])
+        if df is None:
+            return read_stored(file_data["handle"], columns)
+        if columns is None or df.columns.tolist() == columns:
+            return df
+        return df[columns]
+
+    def _read_rows(self, file_data: FileData, start: int, stop: int) -> pd.DataFrame:
+        """Read a range of a file's rows, decoding only those unless it is cached."""
+        df = frame_cache.peek(self._session_id, file_data["handle"])
+        if df is None:
+            return frame_store.get_rows(file_data["handle"], start, stop)
+        return df.iloc[start:stop]
+
+    def _dataset(self, files: list[FileData]) -> Dataset:
+        """Read files as one dataset that loads each file only when needed."""
+        return Dataset(
+            [
+                DatasetPart(
+                    lambda columns, f=f: self._read_frame(f, columns),
+                    f["dtypes"],
+                    f["row_count"],
+                    frame_store.column_versions(f["handle"]),
+                    lambda start, stop, f=f: self._read_rows(f, start, stop),
+                )
+                for f in files
+            ]
+        )
+
+    def _new_file(
+        self, file_name: str, df: pd.DataFrame, parent: str | None = None
+    ) -> FileData:
+        """Store a new dataframe and keep its decoded form in the cache.
+
+        Passing the handle of the version it was derived from lets unchanged
+        columns be shared with that version instead of being stored again.
+        """
+        df = normalize_frame(df)
+        parent_df = frame_cache.peek(self._session_id, parent) if parent else None
+        if parent_df is None and parent and frame_store.shared:
+            parent_df = frame_store.get(parent)
+        file_info = _file_info(
+            file_name, df, parent=parent, parent_df=parent_df, session=self._session_id
+        )
+        if not frame_store.is_spilled(file_info["handle"]):
+            frame_cache.put(self._session_id, file_info["handle"], df)
+        self._update_usage()
+        return file_info
+
+    def _update_usage(self):
+        """Refresh the bytes this session holds in the store and the cache."""
+        self._stored_bytes = frame_store.session_size(self._session_id)
+        self._cached_bytes = frame_cache.session_bytes(self._session_id)
+
+    def _quota_error(self, extra_bytes: int) -> str | None:
+        """Describe why adding extra_bytes would exceed the session quota."""
+        if not SESSION_QUOTA_BYTES:
+            return None
+        used = frame_store.session_size(self._session_id)
+        if used + extra_bytes <= SESSION_QUOTA_BYTES:
+            return None
+        return (
+            f"needs {_format_bytes(extra_bytes)} but only "
+            f"{_format_bytes(max(SESSION_QUOTA_BYTES - used, 0))} of the "
+            f"{_format_bytes(SESSION_QUOTA_BYTES)} session quota is left"
+        )
+
+    def _release_frame(self, handle: str):
+        """Remove a frame that is no longer referenced from the store and cache."""
+        frame_cache.discard(handle)
+        frame_store.delete(handle)
+
+    def _live_handles(self) -> set[str]:
+        """Handles referenced by the current files, history or step cache."""
+        handles = {f["handle"] for f in self._uploaded_files}
+        file_lists = [entry["files"] for entry in self._history + self._redo_history]
+        for checkpoints in [self._checkpoints] + [
+            entry["checkpoints"] for entry in self._history + self._redo_history
+        ]:
+            file_lists.extend((files for files in checkpoints if files))
+        file_lists.extend(self._step_cache.values())
+        for files in file_lists:
+            handles.update((f["handle"] for f in files))
+        return handles
+
+    def _release_unreferenced(self, handles: set[str]):
+        """Release the given frames unless something still references them."""
+        for handle in handles - self._live_handles():
+            self._release_frame(handle)
+        self._update_usage()
+
+    def _begin_step(self, label: str):
+        """Name the step the next change to the files belongs to."""
+        self._step_label = label
+
+    def _snapshot(self):
+        """Record the current files as an undo point before a step changes them.
+
+        Only the first change of a step records a snapshot; starting a new step
+        discards the redo history.
+        """
+        if not self._step_label:
+            return
+        self._history.append(
+            {
+                "label": self._step_label,
+                "files": list(self._uploaded_files),
+                "recipe": list(self._recipe),
+                "checkpoints": list(self._checkpoints),
+            }
+        )
+        self._step_label = ""
+        dropped_entries = self._redo_history
+        self._redo_history = []
+        while len(self._history) > HISTORY_DEPTH:
+            dropped_entries.append(self._history.pop(0))
+        dropped = set()
+        for entry in dropped_entries:
+            for files in [entry["files"]] + entry["checkpoints"]:
+                dropped.update((f["handle"] for f in files or []))
+        self._release_unreferenced(dropped)
+
+    def _add_file(self, file_name: str, handle: str):
+        """Add a frame stored for this session as an additional uploaded file."""
+        self._snapshot()
+        self._forget_checkpoints()
+        self._uploaded_files.append(_stored_file_info(file_name, handle))
+        self._update_usage()
+
+    def _show_upload_progress(self, file_name: str, progress: _UploadProgress):
+        """Publish how far an upload has been parsed, with its first rows."""
+        self.upload_detail = f"Parsed {progress.rows:,} rows of {file_name}"
+        if progress.preview is not None and not self.upload_preview_columns:
+            preview = normalize_frame(progress.preview)
+            self.upload_preview_columns = list(preview.columns)
+            self.upload_preview = preview.to_dict(orient="records")
+
+    def _add_stored_file(self, file_name: str, handle: str):
+        """Add an uploaded file that shares the frame of an earlier upload."""
+        self._snapshot()
+        self._forget_checkpoints()
+        self._uploaded_files.append(
+            _stored_file_info(file_name, frame_store.clone(handle, self._session_id))
+        )
+        self._update_usage()
+
+    def _replace_files(self, files: list[FileData]):
+        """Swap the uploaded files for a new set, releasing dropped frames."""
+        self._snapshot()
+        dropped = {f["handle"] for f in self._uploaded_files}
+        self._uploaded_files = files
+        self._release_unreferenced(dropped)
+
+    def _transform_files(
+        self, files: list[FileData], plans: list[list[RecipeStep]]
+    ) -> list[pd.DataFrame | str]:
+        """Run per-file steps on every given file, one plan per file.
+
+        Large batches of files are spread over the worker processes, and large
+        files with only row-local steps are streamed into the frame store;
+        each result is either a transformed frame or the handle of a stored
+        one. Frames are not attached to the files yet.
+        """
+        if use_pool(len(files), sum((f["row_count"] for f in files))):
+            return run_in_pool(
+                [
+                    (f["file_name"], f["handle"], plan, self._session_id)
+                    for f, plan in zip(files, plans)
+                ]
+            )
+        results = []
+        try:
+            for f, plan in zip(files, plans):
+                if can_stream(plan, f["row_count"]):
+                    results.append(
+                        run_stored(f["file_name"], f["handle"], plan, self._session_id)
+                    )
+                else:
+                    results.append(
+                        run_steps(
+                            f["file_name"],
+                            self._get_frame(f),
+                            plan,
+                            frame_store.column_versions(f["handle"]),
+                        )
+                    )
+        except Exception:
+            discard_results(results)
+            raise
+        return results
+
+    def _start_task(self, label: str) -> bool:
+        """Mark a background task as running, unless one already is."""
+        if self.task_label:
+            return False
+        self.task_label = label
+        self.task_progress = 0
+        self.task_detail = ""
+        self._task_started = time.monotonic()
+        self._task_cancelled = False
+        return True
+
+    def _finish_task(self):
+        self.task_label = ""
+        self.task_progress = 0
+        self.task_detail = ""
+
+    async def _task_step(self, done: int, total: int, detail: str):
+        """Publish the progress of a background task and honour cancellation.
+
+        Call it between chunks of work, outside ``async with self``; it raises
+        TaskCancelled once the user has cancelled the task.
+        """
+        async with self:
+            if self._task_cancelled:
+                raise TaskCancelled()
+            self.task_progress = int(100 * done / total) if total else 0
+            if 0 < done < total:
+                elapsed = time.monotonic() - self._task_started
+                remaining = _format_duration(elapsed * (total - done) / done)
+                detail = f"{detail} · about {remaining} left"
+            self.task_detail = detail
+
+    @rx.event
+    def cancel_task(self):
+        """Ask the running background task to stop at its next checkpoint."""
+        if self.task_label:
+            self._task_cancelled = True
+            self.task_detail = "Cancelling…"
+
+    def _apply_step(self, op: str, params: dict[str, Any]):
+        """Apply an operation to the uploaded files and record it in the recipe.
+
+        Every file is transformed before any result is stored, so an operation
+        that fails on one file leaves all files unchanged.
+        """
+        if self.lazy_mode and op in LAZY_OPERATIONS:
+            self._pending_plan.append({"op": op, "params": params})
+            return
+        self._flush_plan()
+        result = self._compute_step(self._uploaded_files, {"op": op, "params": params})
+        self._commit_step(op, params, result)
+
+    def _compute_step(self, files: list[FileData], step: RecipeStep) -> list:
+        """Run one step on the given files without storing what it produces.
+
+        Returns one frame or stored handle per file for per-file operations,
+        and the named frames the operation returned for the others. Raises
+        OperationError when the step's estimated memory use is over budget.
+        """
+        op, params = step["op"], step["params"]
+        out_of_core = admit(op, self._dataset(files), params)
+        result = self._run_sql(files, op, params, force=out_of_core)
+        if result is not None:
+            return result
+        if OPERATIONS[op].kind == "file":
+            return self._transform_files(files, [[step]] * len(files))
+        return OPERATIONS[op].func(self._dataset(files), **params)
+
+    def _run_sql(
+        self,
+        files: list[FileData],
+        op: str,
+        params: dict[str, Any],
+        force: bool = False,
+    ) -> list | None:
+        """Run an operation on stored files in the SQL engine, if it applies.
+
+        Returns None when the operation should run on the pandas path. With
+        force it runs in the SQL engine whatever the size of the files.
+        """
+        if op not in SQL_OPERATIONS or not (
+            force or sql_enabled(sum((f["row_count"] for f in files)))
+        ):
+            return None
+        try:
+            return run_sql(
+                op,
+                [(f["file_name"], f["handle"]) for f in files],
+                params,
+                self._session_id,
+            )
+        except SQLUnsupported as e:
+            if force:
+                raise out_of_core_failed(op) from e
+            logging.info(f"Running {op} with pandas: {e}")
+            return None
+
+    def _step_outputs(
+        self, files: list[FileData], kind: str, result: list
+    ) -> list[FileData]:
+        """Store what a step produced from files and describe the new files."""
+        if kind == "file":
+            return [
+                _stored_file_info(f["file_name"], df)
+                if isinstance(df, str)
+                else self._new_file(f["file_name"], df, parent=f["handle"])
+                for f, df in zip(files, result)
+            ]
+        outputs = [
+            _stored_file_info(name, df)
+            if isinstance(df, str)
+            else self._new_file(name, df)
+            for name, df in result
+        ]
+        return files + outputs if kind == "append" else outputs
+
+    def _commit_step(self, op: str, params: dict[str, Any], result: list):
+        """Store what an operation produced and record it in the recipe.
+
+        For per-file operations result holds one frame or stored handle per
+        uploaded file, for the others the named frames or stored handles the
+        operation returned.
+        """
+        inputs = self._uploaded_files
+        outputs = self._step_outputs(inputs, OPERATIONS[op].kind, result)
+        self._record_steps(inputs, [{"op": op, "params": params}], outputs)
+
+    async def _run_step_job(
+        self, files: list[FileData], step: RecipeStep
+    ) -> list[tuple[str, str]]:
+        """Run a step on files in a job worker, publishing its progress.
+
+        Steps on small inputs are scheduled ahead of larger transforms.
+        Returns the stored outputs the step job produced.
+        """
+        payload = {"files": files, "step": step, "session": self._session_id}
+        return await run_job(
+            self._session_id, "step", payload, self._task_step, _priority(files)
+        )
+
+    async def _queued_step(
+        self, files: list[FileData], op: str, params: dict[str, Any], label: str
+    ):
+        """Run a step on files in a job worker and commit what it produced.
+
+        Call it from a background task holding the task slot; the job's
+        progress is published to the session while it waits and runs. Raises
+        TaskCancelled when the user cancels, and OperationError when the step
+        fails or the files changed in the meantime.
+        """
+        outputs = await self._run_step_job(files, {"op": op, "params": params})
+        try:
+            async with self:
+                if self._task_cancelled:
+                    raise TaskCancelled()
+                if _handles(self._uploaded_files) != _handles(files):
+                    raise OperationError(
+                        "The files changed while the step ran; the result was discarded."
+                    )
+                if OPERATIONS[op].kind == "file":
+                    result = [handle for _, handle in outputs]
+                else:
+                    result = outputs
+                self._begin_step(label)
+                self._commit_step(op, params, result)
+                self._update_usage()
+                self.column_order = self.all_columns
+                self.selected_columns = self.all_columns
+        except BaseException:
+            discard_outputs("step", outputs)
+            raise
+
+    def _record_steps(
+        self,
+        inputs: list[FileData],
+        steps: list[RecipeStep],
+        outputs: list[FileData],
+    ):
+        """Make the outputs of steps applied to inputs the current files.
+
+        The steps are appended to the recipe, and the inputs are kept as the
+        checkpoint an edit of the first step restarts from; a single step's
+        outputs also go into the step cache.
+        """
+        self._snapshot()
+        self._recipe = self._recipe + steps
+        self._checkpoints = self._checkpoints + [inputs] + [None] * (len(steps) - 1)
+        if len(steps) == 1:
+            self._step_cache[_step_key(inputs, steps[0])] = outputs
+        self._replace_files(outputs)
+        self._trim_checkpoints()
+
+    def _trim_checkpoints(self):
+        """Drop checkpoints beyond the history depth and old step cache entries."""
+        dropped = set()
+        for i in range(len(self._checkpoints) - HISTORY_DEPTH):
+            dropped.update((f["handle"] for f in self._checkpoints[i] or []))
+            self._checkpoints[i] = None
+        while len(self._step_cache) > STEP_CACHE_ENTRIES:
+            key = next(iter(self._step_cache))
+            dropped.update((f["handle"] for f in self._step_cache.pop(key)))
+        self._release_unreferenced(dropped)
+
+    def _forget_checkpoints(self):
+        """Stop recomputing recorded steps after the files changed outside them."""
+        dropped = {f["handle"] for files in self._checkpoints if files for f in files}
+        self._checkpoints = [None] * len(self._recipe)
+        self._release_unreferenced(dropped)
+
+    def _flush_plan(self):
+        """Execute the steps planned in lazy mode as one optimized pass per file."""
+        if not self._pending_plan:
+            return
+        steps = self._pending_plan
+        self._pending_plan = []
+        inputs = self._uploaded_files
+        frames = self._transform_files(
+            inputs, [optimize(steps, f["dtypes"]) for f in inputs]
+        )
+        self._commit_plan(inputs, steps, frames)
+
+    def _commit_plan(
+        self, inputs: list[FileData], steps: list[RecipeStep], result: list
+    ):
+        """Store what a lazy plan produced from inputs and record its steps."""
+        label = self._step_label
+        self._begin_step(
+            OPERATIONS[steps[0]["op"]].label
+            if len(steps) == 1
+            else f"{len(steps)} planned steps"
+        )
+        outputs = self._step_outputs(inputs, "file", result)
+        self._record_steps(inputs, steps, outputs)
+        self._step_label = label
+
+    async def _queued_flush(self) -> list[FileData]:
+        """Execute the steps planned in lazy mode as a job in the workers.
+
+        Call it from a background task holding the task slot, before reading
+        the files. Returns the current files, with the plan applied. Raises
+        TaskCancelled when the user cancels, leaving the plan pending, and
+        OperationError when it fails or the files changed in the meantime.
+        """
+        async with self:
+            steps = list(self._pending_plan)
+            files = list(self._uploaded_files)
+        if not steps:
+            return files
+        payload = {
+            "files": files,
+            "plans": [optimize(steps, f["dtypes"]) for f in files],
+            "session": self._session_id,
+        }
+        outputs = await run_job(
+            self._session_id, "plan", payload, self._task_step, _priority(files)
+        )
+        try:
+            async with self:
+                if self._task_cancelled:
+                    raise TaskCancelled()
+                if _handles(self._uploaded_files) != _handles(files) or (
+                    self._pending_plan != steps
+                ):
+                    raise OperationError(
+                        "The files changed while the planned steps ran; "
+                        "the result was discarded."
+                    )
+                self._pending_plan = []
+                self._commit_plan(files, steps, [handle for _, handle in outputs])
+                self._update_usage()
+                return list(self._uploaded_files)
+        except BaseException:
+            discard_outputs("plan", outputs)
+            raise
+
+    def _restore_files(self, entry: HistoryEntry):
+        """Make the files and recipe of a history entry current again."""
+        self._uploaded_files = entry["files"]
+        self._recipe = entry["recipe"]
+        self._checkpoints = entry["checkpoints"]
+        self.editing_step = -1
+        self.column_order = self.all_columns
+        self.selected_columns = self.all_columns
+        self.duplicates_found = -1
+        self.match_count = -1
+        self.clear_validation_results()
+        if self.active_tab == "download":
+            self._prepare_preview_data()
+
+    @rx.event
+    def undo(self):
+        """Revert the most recent step."""
+        if self._pending_plan:
+            step = self._pending_plan.pop()
+            return rx.toast.info(
+                f"Removed planned step: {OPERATIONS[step['op']].label}"
+            )
+        if not self._history:
+            return rx.toast.warning("Nothing to undo.")
+        entry = self._history.pop()
+        self._redo_history.append(
+            {
+                "label": entry["label"],
+                "files": list(self._uploaded_files),
+                "recipe": list(self._recipe),
+                "checkpoints": list(self._checkpoints),
+            }
+        )
+        self._restore_files(entry)
+        return rx.toast.info(f"Undid: {entry['label']}")
+
+    @rx.event
+    def redo(self):
+        """Reapply the most recently undone step."""
+        if not self._redo_history:
+            return rx.toast.warning("Nothing to redo.")
+        entry = self._redo_history.pop()
+        self._history.append(
+            {
+                "label": entry["label"],
+                "files": list(self._uploaded_files),
+                "recipe": list(self._recipe),
+                "checkpoints": list(self._checkpoints),
+            }
+        )
+        self._restore_files(entry)
+        return rx.toast.info(f"Redid: {entry['label']}")
+
     @rx.event
     def set_column_mapping(self, original_col: str, new_col: str):
         """Update the mapping for a single column."""
@@ -170,18 +980,10 @@ class State(rx.State):
     @rx.event
     def apply_column_mapping(self):
         """Apply the defined column mappings to all uploaded dataframes."""
+        self._begin_step("Rename columns")
         if not self.column_mappings:
             return rx.toast.warning("No column mappings have been defined.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            rename_dict = {
-                k: v for k, v in self.column_mappings.items() if k in df.columns
-            }
-            df.rename(columns=rename_dict, inplace=True)
-            self.uploaded_files[i]["columns"] = df.columns.tolist()
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
+        self._apply_step("rename_columns", {"mapping": dict(self.column_mappings)})
         self.column_mappings = {}
         return rx.toast.success("Column mappings applied successfully!")
 
@@ -219,112 +1021,106 @@ class State(rx.State):
     @rx.event
     def apply_filters(self):
         """Apply all defined filter rules to the dataframes."""
+        self._begin_step("Filter rows")
         if not self.filter_rules:
             return rx.toast.warning("No filter rules to apply.")
-        total_rows_before = sum((f["row_count"] for f in self.uploaded_files))
-        total_rows_after = 0
-        for i in range(len(self.uploaded_files)):
-            try:
-                df = pd.read_json(
-                    io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-                )
-                initial_mask = pd.Series([True] * len(df), index=df.index)
-                for rule in self.filter_rules:
-                    if not rule["column"]:
-                        continue
-                    col = rule["column"]
-                    op = rule["operation"]
-                    val = rule["value"]
-                    if col not in df.columns:
-                        continue
-                    if op == "equals":
-                        initial_mask &= df[col].astype(str) == val
-                    elif op == "not_equals":
-                        initial_mask &= df[col].astype(str) != val
-                    elif op == "contains":
-                        initial_mask &= (
-                            df[col].astype(str).str.contains(val, case=False, na=False)
-                        )
-                    elif op == "not_contains":
-                        initial_mask &= ~df[col].astype(str).str.contains(
-                            val, case=False, na=False
-                        )
-                    elif op == "is_empty":
-                        initial_mask &= df[col].isnull() | (df[col].astype(str) == "")
-                    elif op == "is_not_empty":
-                        initial_mask &= df[col].notnull() & (df[col].astype(str) != "")
-                    else:
-                        numeric_col = pd.to_numeric(df[col], errors="coerce")
-                        numeric_val = pd.to_numeric(val, errors="coerce")
-                        op_mask = pd.Series([False] * len(df), index=df.index)
-                        valid_comparison = numeric_col.notna() & (
-                            numeric_val is not None
-                        )
-                        if op == "greater_than":
-                            op_mask[valid_comparison] = (
-                                numeric_col[valid_comparison] > numeric_val
-                            )
-                        elif op == "less_than":
-                            op_mask[valid_comparison] = (
-                                numeric_col[valid_comparison] < numeric_val
-                            )
-                        elif op == "ge":
-                            op_mask[valid_comparison] = (
-                                numeric_col[valid_comparison] >= numeric_val
-                            )
-                        elif op == "le":
-                            op_mask[valid_comparison] = (
-                                numeric_col[valid_comparison] <= numeric_val
-                            )
-                        initial_mask &= op_mask
-                df = df[initial_mask]
-                total_rows_after += len(df)
-                self.uploaded_files[i]["row_count"] = len(df)
-                self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-            except Exception as e:
-                logging.exception(
-                    f"Error applying filters to {self.uploaded_files[i]['file_name']}: {e}"
-                )
-                return rx.toast.error(
-                    f"Error on file {self.uploaded_files[i]['file_name']}: {e}"
-                )
+        total_rows_before = sum((f["row_count"] for f in self._uploaded_files))
+        rules = [
+            {"column": r["column"], "operation": r["operation"], "value": r["value"]}
+            for r in self.filter_rules
+        ]
+        try:
+            self._apply_step("filter_rows", {"rules": rules})
+        except Exception as e:
+            logging.exception(f"Error applying filters: {e}")
+            return rx.toast.error(f"Error applying filters: {e}")
+        if self._pending_plan:
+            return rx.toast.info("Filters added to the plan.")
+        total_rows_after = sum((f["row_count"] for f in self._uploaded_files))
         self.rows_removed = total_rows_before - total_rows_after
         return rx.toast.success(f"Filters applied. {self.rows_removed} rows removed.")
 
     @rx.event
     async def handle_upload(self, files: list[rx.UploadFile]):
-        """Handle file uploads, parse them, and store the data."""
+        """Handle file uploads, streaming each one into the frame store.
+
+        Uploads are copied to disk and parsed chunk by chunk, so neither the
+        uploaded bytes nor more than a chunk of parsing state are held in
+        memory, and the first rows are shown while the rest is parsed.
+        """
+        self._begin_step("Upload files")
         if not files:
             yield rx.toast.error("No files selected for upload.")
             return
         self.is_uploading = True
         yield
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        added = 0
         for file in files:
+            file_name = file.name
+            path = os.path.join(
+                UPLOAD_DIR, uuid.uuid4().hex + os.path.splitext(file_name)[1]
+            )
             try:
-                upload_data = await file.read()
-                file_name = file.name
-                if file_name.endswith(".csv"):
-                    df = pd.read_csv(io.BytesIO(upload_data))
-                elif file_name.endswith((".xlsx", ".xls")):
-                    df = pd.read_excel(io.BytesIO(upload_data))
-                else:
+                self.upload_detail = f"Receiving {file_name}"
+                yield
+                digest = await _receive_upload(file, path)
+                known = frame_store.find_upload(digest)
+                quota_error = self._quota_error(
+                    frame_store.size(known) if known else os.path.getsize(path)
+                )
+                if quota_error:
+                    yield rx.toast.error(f"Cannot upload {file_name}: {quota_error}.")
+                    continue
+                if known:
+                    self._add_stored_file(file_name, known)
+                    frame_store.record_upload(
+                        digest, self._uploaded_files[-1]["handle"]
+                    )
+                    added += 1
+                    continue
+                if not is_supported(file_name):
                     yield rx.toast.warning(f"Unsupported file type: {file_name}")
                     continue
-                file_info: FileData = {
-                    "file_name": file_name,
-                    "row_count": len(df),
-                    "columns": df.columns.tolist(),
-                    "df_json": df.to_json(orient="split"),
-                }
-                self.uploaded_files.append(file_info)
+                progress = _UploadProgress(
+                    SESSION_QUOTA_BYTES - frame_store.session_size(self._session_id)
+                    if SESSION_QUOTA_BYTES
+                    else None
+                )
+                task = asyncio.ensure_future(
+                    asyncio.to_thread(
+                        stream_upload, file_name, path, self._session_id, progress
+                    )
+                )
+                while not task.done():
+                    await asyncio.wait([task], timeout=UPLOAD_POLL_SECONDS)
+                    self._show_upload_progress(file_name, progress)
+                    yield
+                self._add_file(file_name, task.result())
+                frame_store.record_upload(digest, self._uploaded_files[-1]["handle"])
+                added += 1
+            except _UploadTooLarge as e:
+                quota_error = self._quota_error(e.nbytes)
+                yield rx.toast.error(f"Cannot upload {file_name}: {quota_error}.")
             except Exception as e:
-                logging.exception(f"Error processing {file.name}: {e}")
-                yield rx.toast.error(f"Error processing {file.name}: {e}")
+                logging.exception(f"Error processing {file_name}: {e}")
+                yield rx.toast.error(f"Error processing {file_name}: {e}")
+            finally:
+                if os.path.exists(path):
+                    os.remove(path)
+                self.upload_detail = ""
+                self.upload_preview_columns = []
+                self.upload_preview = []
         self.is_uploading = False
-        if self.uploaded_files:
+        if self._uploaded_files:
             self.column_order = self.all_columns
             self.selected_columns = self.all_columns
-        yield rx.toast.success(f"Successfully uploaded {len(files)} file(s).")
+        if added:
+            yield rx.toast.success(f"Successfully uploaded {added} file(s).")
+        if added < len(files):
+            yield rx.toast.warning(
+                f"{len(files) - added} of {len(files)} file(s) could not be uploaded."
+            )
 
     @rx.event
     def set_data_type_mapping(self, column_name: str, new_type: str):
@@ -337,41 +1133,36 @@ class State(rx.State):
     @rx.event
     def apply_data_type_conversions(self):
         """Apply the defined data type conversions to all uploaded dataframes."""
+        self._begin_step("Convert data types")
         if not self.data_type_mappings:
             return rx.toast.warning("No data type conversions have been defined.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            for col, new_type in self.data_type_mappings.items():
-                if col not in df.columns:
-                    continue
-                try:
-                    if new_type == "string":
-                        df[col] = df[col].astype(str)
-                    elif new_type == "integer":
-                        df[col] = pd.to_numeric(df[col], errors="coerce").astype(
-                            "Int64"
-                        )
-                    elif new_type == "float":
-                        df[col] = pd.to_numeric(df[col], errors="coerce").astype(float)
-                    elif new_type == "boolean":
-                        df[col] = df[col].astype(bool)
-                    elif new_type == "date":
-                        df[col] = pd.to_datetime(df[col], errors="coerce")
-                except Exception as e:
-                    logging.exception(
-                        f"Error converting column {col} to {new_type}: {e}"
-                    )
-                    return rx.toast.error(f"Failed to convert '{col}' to {new_type}.")
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
+        try:
+            self._apply_step("convert_types", {"types": dict(self.data_type_mappings)})
+        except OperationError as e:
+            logging.exception(f"Error converting data types: {e}")
+            return rx.toast.error(str(e))
         self.data_type_mappings = {}
         return rx.toast.success("Data type conversions applied successfully!")
 
     @rx.event
     def clear_all_files(self):
         """Clear all uploaded files from the state."""
-        self.uploaded_files = []
+        self._reset_workspace()
+        yield rx.toast.info("All files have been cleared.")
+
+    def _reset_workspace(self):
+        """Drop every file, its history and the settings of every tab."""
+        dropped = self._live_handles()
+        self._uploaded_files = []
+        self._history = []
+        self._redo_history = []
+        self._step_label = ""
+        self._recipe = []
+        self._checkpoints = []
+        self._step_cache = {}
+        self.editing_step = -1
+        self._pending_plan = []
+        self._release_unreferenced(dropped)
         self.column_mappings = {}
         self.data_type_mappings = {}
         self.filter_rules = []
@@ -408,7 +1199,24 @@ class State(rx.State):
         self.extract_start_pos = 0
         self.extract_end_pos = None
         self.extract_new_col_name = "extracted_column"
-        yield rx.toast.info("All files have been cleared.")
+
+    def _reset_expired_workspace(self) -> bool:
+        """Reset the workspace if the store expired frames it references.
+
+        Returns whether it was reset.
+        """
+        if all((frame_store.exists(handle) for handle in self._live_handles())):
+            return False
+        self._reset_workspace()
+        return True
+
+    @rx.event
+    def notify_workspace_expired(self):
+        """Tell the user their expired files were removed."""
+        return rx.toast.warning(
+            "Your files were removed after a long period of inactivity. "
+            "Please upload them again."
+        )
 
     @rx.event
     def set_active_tab(self, tab_name: str):
@@ -417,6 +1225,16 @@ class State(rx.State):
             self.show_validation_results = False
             self.validation_results = {}
         self.active_tab = tab_name
+        if self._pending_plan and tab_name in (
+            "download",
+            "profiling",
+            "null_handling",
+        ):
+            return State.run_pending_plan
+        self._refresh_tab()
+
+    def _refresh_tab(self):
+        """Recompute what the active tab shows from the current files."""
         if self.active_tab == "download":
             self._prepare_preview_data()
         if self.active_tab == "profiling":
@@ -424,83 +1242,94 @@ class State(rx.State):
         if self.active_tab == "null_handling":
             self.calculate_null_stats()
 
-    def _prepare_preview_data(self):
-        """Helper to combine all dataframes for preview."""
-        if not self.uploaded_files:
-            self.preview_data = []
-            self.preview_columns = []
-            return
-        all_dfs = [
-            pd.read_json(io.StringIO(f["df_json"]), orient="split")
-            for f in self.uploaded_files
+    def _run_plan_first(self) -> list:
+        """Start executing the planned steps before an action that reads the files."""
+        return [
+            rx.toast.info(
+                "Running the planned steps first; try again once they finish."
+            ),
+            State.run_pending_plan,
         ]
-        if all_dfs:
-            combined_df = pd.concat(all_dfs, ignore_index=True)
-            self.preview_columns = combined_df.columns.tolist()
-            self.preview_data = combined_df.to_dict(orient="records")
-        else:
-            self.preview_data = []
-            self.preview_columns = []
+
+    def _prepare_preview_data(self):
+        """Describe the combined files for preview and load the first page."""
+        data = self._dataset(self._uploaded_files)
+        self.preview_columns = data.columns
+        self._preview_rows = len(data)
         self.preview_page = 1
+        self._load_preview_page()
+
+    def _load_preview_page(self):
+        """Load only the rows of the current preview page."""
+        start = (self.preview_page - 1) * self.preview_rows_per_page
+        page = self._dataset(self._uploaded_files).rows(
+            start, start + self.preview_rows_per_page
+        )
+        self._preview_data = page.to_dict(orient="records")
 
     @rx.event
     def download_file(self, file_index: int):
         """Download a single processed file in the selected format."""
-        file_to_download = self.uploaded_files[file_index]
-        df = pd.read_json(io.StringIO(file_to_download["df_json"]), orient="split")
-        original_name = file_to_download["file_name"].split(".")[0]
-        if self.download_format == "csv":
-            content = df.to_csv(index=False)
-            filename = f"processed_{original_name}.csv"
-            return rx.download(data=content, filename=filename)
-        elif self.download_format == "excel":
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine="openpyxl") as writer:
-                df.to_excel(writer, index=False, sheet_name="Sheet1")
-            content = output.getvalue()
-            filename = f"processed_{original_name}.xlsx"
-            return rx.download(data=content, filename=filename)
-
-    @rx.event
-    def download_all_zip(self):
-        """Download all processed files as a single ZIP archive."""
-        import zipfile
-
-        if not self.uploaded_files:
-            return rx.toast.warning("No files to download.")
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "a", zipfile.ZIP_DEFLATED, False) as zip_file:
-            for file_data in self.uploaded_files:
-                df = pd.read_json(io.StringIO(file_data["df_json"]), orient="split")
-                original_name = file_data["file_name"].split(".")[0]
-                if self.download_format == "csv":
-                    content = df.to_csv(index=False)
-                    filename = f"processed_{original_name}.csv"
-                elif self.download_format == "excel":
-                    output = io.BytesIO()
-                    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-                        df.to_excel(writer, index=False, sheet_name="Sheet1")
-                    content = output.getvalue()
-                    filename = f"processed_{original_name}.xlsx"
-                else:
-                    continue
-                zip_file.writestr(filename, content)
-        zip_buffer.seek(0)
+        if self._pending_plan:
+            return self._run_plan_first()
+        file_to_download = self._uploaded_files[file_index]
+        df = self._get_frame(file_to_download)
         return rx.download(
-            data=zip_buffer.getvalue(), filename="dataforge_processed_files.zip"
+            data=write_frame(df, self.download_format),
+            filename=output_name(file_to_download["file_name"], self.download_format),
         )
 
+    @rx.event(background=True)
+    async def download_all_zip(self):
+        """Download all processed files as a single ZIP archive."""
+        async with self:
+            if not self._uploaded_files:
+                error = "No files to download."
+            elif not self._start_task("Preparing download"):
+                error = TASK_BUSY_MESSAGE
+            else:
+                error = ""
+            fmt = self.download_format
+        if error:
+            yield rx.toast.warning(error)
+            return
+        try:
+            files = await self._queued_flush()
+            [(filename, path)] = await run_job(
+                self._session_id,
+                "export",
+                {"files": files, "fmt": fmt},
+                self._task_step,
+            )
+            try:
+                data = await asyncio.to_thread(_read_bytes, path)
+            finally:
+                discard_outputs("export", [(filename, path)])
+        except TaskCancelled:
+            yield rx.toast.info("Download cancelled.")
+            return
+        except Exception as e:
+            logging.exception(f"Error preparing download: {e}")
+            yield rx.toast.error(f"Failed to prepare download: {e}")
+            return
+        finally:
+            async with self:
+                self._finish_task()
+        yield rx.download(data=data, filename=filename)
+
     @rx.event
     def set_preview_page(self, page: int):
         """Set the current page for the preview table."""
         if 1 <= page <= self.total_preview_pages:
             self.preview_page = page
+            self._load_preview_page()
 
     @rx.event
     def set_preview_rows_per_page(self, rows: str):
         """Set the number of rows per page and reset to page 1."""
         self.preview_rows_per_page = int(rows)
         self.preview_page = 1
+        self._load_preview_page()
 
     @rx.event
     def set_is_dragging(self, is_dragging: bool):
@@ -543,133 +1372,81 @@ class State(rx.State):
         self.show_validation_results = False
         self.validation_results = {}
 
-    @rx.event
-    def run_validation(self):
+    @rx.event(background=True)
+    async def run_validation(self):
         """Execute all validation rules against the data."""
-        if not self.validation_rules:
-            return rx.toast.warning("No validation rules to run.")
+        async with self:
+            if not self.validation_rules:
+                error = "No validation rules to run."
+            elif not self._start_task("Running validation"):
+                error = TASK_BUSY_MESSAGE
+            else:
+                error = ""
+            rules = [dict(rule) for rule in self.validation_rules]
+        if error:
+            yield rx.toast.warning(error)
+            return
         total_rows = 0
-        all_failing_indices = set()
+        failing_rows = 0
         error_details = {}
-        for file_data in self.uploaded_files:
-            df = pd.read_json(io.StringIO(file_data["df_json"]), orient="split")
-            total_rows += len(df)
-            file_failing_indices = pd.Series([False] * len(df), index=df.index)
-            for rule in self.validation_rules:
-                if not rule["column"] or rule["column"] not in df.columns:
-                    continue
-                col = rule["column"]
-                rule_type = rule["rule_type"]
-                param1 = rule["param1"]
-                param2 = rule["param2"]
-                try:
-                    if rule_type == "required":
-                        failures = df[col].isnull() | (df[col].astype(str) == "")
-                    elif rule_type == "min_length":
-                        failures = df[col].astype(str).str.len() < int(param1)
-                    elif rule_type == "max_length":
-                        failures = df[col].astype(str).str.len() > int(param1)
-                    elif rule_type == "numeric_range":
-                        numeric_col = pd.to_numeric(df[col], errors="coerce")
-                        min_val = float(param1)
-                        max_val = float(param2)
-                        failures = ~numeric_col.between(min_val, max_val)
-                    elif rule_type == "regex_pattern":
-                        failures = ~df[col].astype(str).str.match(param1, na=False)
-                    else:
-                        continue
-                    if failures.any():
-                        rule_key = f'''"{rule["column"]}" - {rule["rule_type"]}'''
-                        if rule_key not in error_details:
-                            error_details[rule_key] = 0
-                        error_details[rule_key] += failures.sum()
-                        file_failing_indices |= failures
-                except Exception as e:
-                    logging.exception(f"Error validating rule {rule}: {e}")
-                    return rx.toast.error(f"Invalid parameter for rule on '{col}'.")
-            global_indices = set(
-                df.index[file_failing_indices]
-                + sum(
-                    (
-                        len(pd.read_json(io.StringIO(f["df_json"])))
-                        for f in self.uploaded_files[
-                            : self.uploaded_files.index(file_data)
-                        ]
-                    )
+        try:
+            files = await self._queued_flush()
+            total = sum((f["row_count"] for f in files))
+            for i, file_data in enumerate(files):
+                await self._task_step(
+                    total_rows, total, f"Checking file {i + 1} of {len(files)}"
                 )
-            )
-            all_failing_indices.update(global_indices)
-        self.validation_results = {
-            "total_rows": total_rows,
-            "passing_rows": total_rows - len(all_failing_indices),
-            "failing_rows": len(all_failing_indices),
-            "error_details": error_details,
-        }
-        self.show_validation_results = True
-        return rx.toast.success("Validation complete!")
+                df = await asyncio.to_thread(self._get_frame, file_data)
+                failing, details = await asyncio.to_thread(
+                    _validate_frame,
+                    df,
+                    rules,
+                    frame_store.column_versions(file_data["handle"]),
+                )
+                total_rows += len(df)
+                failing_rows += failing
+                for rule_key, count in details.items():
+                    error_details[rule_key] = error_details.get(rule_key, 0) + count
+            async with self:
+                self.validation_results = {
+                    "total_rows": total_rows,
+                    "passing_rows": total_rows - failing_rows,
+                    "failing_rows": failing_rows,
+                    "error_details": error_details,
+                }
+                self.show_validation_results = True
+        except TaskCancelled:
+            yield rx.toast.info("Validation cancelled.")
+            return
+        except OperationError as e:
+            yield rx.toast.error(str(e))
+            return
+        finally:
+            async with self:
+                self._finish_task()
+        yield rx.toast.success("Validation complete!")
 
     @rx.event
     def remove_invalid_rows(self):
         """Filters out rows that failed validation from the dataframes."""
+        self._begin_step("Remove invalid rows")
         if (
             not self.validation_results
             or self.validation_results.get("failing_rows", 0) == 0
         ):
             return rx.toast.info("No invalid rows to remove.")
-        all_dfs = [
-            pd.read_json(io.StringIO(f["df_json"]), orient="split")
-            for f in self.uploaded_files
-        ]
-        if not all_dfs:
+        if not self._uploaded_files:
             return
-        combined_df = pd.concat(all_dfs, ignore_index=True)
-        failing_indices_list = []
-        start_index = 0
-        for df in all_dfs:
-            file_failing_indices = pd.Series([False] * len(df), index=df.index)
-            for rule in self.validation_rules:
-                if not rule["column"] or rule["column"] not in df.columns:
-                    continue
-                col, rule_type, param1, param2 = (
-                    rule["column"],
-                    rule["rule_type"],
-                    rule["param1"],
-                    rule["param2"],
-                )
-                try:
-                    if rule_type == "required":
-                        failures = df[col].isnull() | (df[col].astype(str) == "")
-                    elif rule_type == "min_length":
-                        failures = df[col].astype(str).str.len() < int(param1)
-                    elif rule_type == "max_length":
-                        failures = df[col].astype(str).str.len() > int(param1)
-                    elif rule_type == "numeric_range":
-                        numeric_col = pd.to_numeric(df[col], errors="coerce")
-                        failures = ~numeric_col.between(float(param1), float(param2))
-                    elif rule_type == "regex_pattern":
-                        failures = ~df[col].astype(str).str.match(param1, na=False)
-                    else:
-                        continue
-                    file_failing_indices |= failures
-                except Exception as e:
-                    logging.exception(
-                        f"Error during removal check for rule {rule}: {e}"
-                    )
-            failing_indices_for_file = df.index[file_failing_indices]
-            for index_val in failing_indices_for_file:
-                failing_indices_list.append(start_index + index_val)
-            start_index += len(df)
-        valid_rows_df = combined_df.drop(index=list(set(failing_indices_list)))
-        if not valid_rows_df.empty:
-            self.uploaded_files[0]["df_json"] = valid_rows_df.to_json(orient="split")
-            self.uploaded_files[0]["row_count"] = len(valid_rows_df)
-            self.uploaded_files[0]["file_name"] = "combined_and_validated.csv"
-            self.uploaded_files = [self.uploaded_files[0]]
-        else:
-            self.uploaded_files = []
-        rows_removed_count = len(combined_df) - len(valid_rows_df)
+        total_rows_before = sum((f["row_count"] for f in self._uploaded_files))
+        self._apply_step(
+            "remove_invalid_rows",
+            {"rules": [dict(rule) for rule in self.validation_rules]},
+        )
+        total_rows_after = sum((f["row_count"] for f in self._uploaded_files))
         self.clear_validation_results()
-        return rx.toast.success(f"Removed {rows_removed_count} invalid rows.")
+        return rx.toast.success(
+            f"Removed {total_rows_before - total_rows_after} invalid rows."
+        )
 
     @rx.event
     def toggle_dedup_column(self, column: str):
@@ -689,14 +1466,25 @@ class State(rx.State):
     @rx.event
     def find_duplicates(self):
         """Scan data to find the count of duplicate rows."""
+        if self._pending_plan:
+            return self._run_plan_first()
         if not self.dedup_columns:
             return rx.toast.warning(
                 "Please select at least one column for deduplication."
             )
+        if sql_enabled(sum((f["row_count"] for f in self._uploaded_files))):
+            try:
+                self.duplicates_found = count_duplicates(
+                    [f["handle"] for f in self._uploaded_files],
+                    list(self.dedup_columns),
+                )
+                return rx.toast.info(f"Found {self.duplicates_found} duplicate rows.")
+            except SQLUnsupported as e:
+                logging.info(f"Finding duplicates with pandas: {e}")
         total_rows = 0
         total_unique_rows = 0
-        for file_data in self.uploaded_files:
-            df = pd.read_json(io.StringIO(file_data["df_json"]), orient="split")
+        for file_data in self._uploaded_files:
+            df = self._get_frame(file_data)
             total_rows += len(df)
             dedup_df = df.drop_duplicates(subset=self.dedup_columns, keep="first")
             total_unique_rows += len(dedup_df)
@@ -706,19 +1494,15 @@ class State(rx.State):
     @rx.event
     def remove_duplicates(self):
         """Remove duplicate rows from all dataframes."""
+        self._begin_step("Remove duplicates")
         if self.duplicates_found < 0:
             return rx.toast.warning("Please run 'Find Duplicates' first.")
-        total_rows_before = sum((f["row_count"] for f in self.uploaded_files))
-        total_rows_after = 0
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            keep = self.dedup_keep if self.dedup_keep != "none" else False
-            df.drop_duplicates(subset=self.dedup_columns, keep=keep, inplace=True)
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-            self.uploaded_files[i]["row_count"] = len(df)
-            total_rows_after += len(df)
+        total_rows_before = sum((f["row_count"] for f in self._uploaded_files))
+        self._apply_step(
+            "remove_duplicates",
+            {"columns": list(self.dedup_columns), "keep": self.dedup_keep},
+        )
+        total_rows_after = sum((f["row_count"] for f in self._uploaded_files))
         rows_removed_count = total_rows_before - total_rows_after
         self.duplicates_found = -1
         self.dedup_columns = []
@@ -759,34 +1543,23 @@ class State(rx.State):
     @rx.event
     def apply_column_selection(self):
         """Apply the selected columns and their order to all dataframes."""
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            final_cols = [
-                col
-                for col in self.column_order
-                if col in self.selected_columns and col in df.columns
-            ]
-            df = df[final_cols]
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-            self.uploaded_files[i]["columns"] = df.columns.tolist()
+        self._begin_step("Select columns")
+        columns = [col for col in self.column_order if col in self.selected_columns]
+        self._apply_step("select_columns", {"columns": columns})
         return rx.toast.success("Column selection and order applied.")
 
     @rx.event
     def generate_data_profile(self):
         """Generate profiling statistics for the combined data."""
-        if not self.uploaded_files:
+        if self._pending_plan:
+            return State.run_pending_plan
+        if not self._uploaded_files:
             self.profiling_data = {}
             return rx.toast.warning("No data to profile.")
-        all_dfs = [
-            pd.read_json(io.StringIO(f["df_json"]), orient="split")
-            for f in self.uploaded_files
-        ]
-        combined_df = pd.concat(all_dfs, ignore_index=True)
+        data = self._dataset(self._uploaded_files)
         profile = {}
-        for col in combined_df.columns:
-            s = combined_df[col]
+        for col in data.columns:
+            s = data.column(col)
             stats = {
                 "dtype": str(s.dtype),
                 "count": int(s.count()),
@@ -800,7 +1573,7 @@ class State(rx.State):
                 stats["max"] = float(desc.get("max", 0))
                 stats["mean"] = float(desc.get("mean", 0))
                 stats["median"] = float(s.median())
-            if pd.api.types.is_string_dtype(s) or s.dtype == "object":
+            if is_text(s):
                 str_series = s.astype(str)
                 stats["min_len"] = (
                     int(str_series.str.len().min()) if stats["count"] > 0 else 0
@@ -815,18 +1588,15 @@ class State(rx.State):
     @rx.event
     def calculate_null_stats(self):
         """Calculate null counts and percentages for all columns."""
-        if not self.uploaded_files:
+        if self._pending_plan:
+            return State.run_pending_plan
+        if not self._uploaded_files:
             self.null_stats = {}
             return rx.toast.warning("No data to analyze.")
-        all_dfs = [
-            pd.read_json(io.StringIO(f["df_json"]), orient="split")
-            for f in self.uploaded_files
-        ]
-        combined_df = pd.concat(all_dfs, ignore_index=True)
+        data = self._dataset(self._uploaded_files)
+        total_count = len(data)
         stats = {}
-        for col in combined_df.columns:
-            null_count = int(combined_df[col].isnull().sum())
-            total_count = len(combined_df[col])
+        for col, null_count in data.null_counts().items():
             null_percentage = null_count / total_count if total_count > 0 else 0
             stats[col] = {"null_count": null_count, "null_percentage": null_percentage}
         self.null_stats = stats
@@ -843,44 +1613,21 @@ class State(rx.State):
     @rx.event
     def apply_fill_nulls(self):
         """Apply the selected fill strategy to the selected columns."""
+        self._begin_step("Fill nulls")
         if not self.fill_columns:
             return rx.toast.warning("Please select at least one column to fill.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
+        try:
+            self._apply_step(
+                "fill_nulls",
+                {
+                    "columns": list(self.fill_columns),
+                    "strategy": self.fill_strategy,
+                    "value": self.fill_custom_value,
+                },
             )
-            for col in self.fill_columns:
-                if col not in df.columns:
-                    continue
-                try:
-                    if self.fill_strategy == "custom":
-                        df[col].fillna(self.fill_custom_value, inplace=True)
-                    elif self.fill_strategy == "ffill":
-                        df[col].fillna(method="ffill", inplace=True)
-                    elif self.fill_strategy == "bfill":
-                        df[col].fillna(method="bfill", inplace=True)
-                    elif self.fill_strategy == "mean":
-                        if pd.api.types.is_numeric_dtype(df[col]):
-                            df[col].fillna(df[col].mean(), inplace=True)
-                        else:
-                            return rx.toast.error(
-                                f"'Mean' can only be applied to numeric columns. '{col}' is not numeric."
-                            )
-                    elif self.fill_strategy == "median":
-                        if pd.api.types.is_numeric_dtype(df[col]):
-                            df[col].fillna(df[col].median(), inplace=True)
-                        else:
-                            return rx.toast.error(
-                                f"'Median' can only be applied to numeric columns. '{col}' is not numeric."
-                            )
-                    elif self.fill_strategy == "mode":
-                        mode_val = df[col].mode()
-                        if not mode_val.empty:
-                            df[col].fillna(mode_val[0], inplace=True)
-                except Exception as e:
-                    logging.exception(f"Error filling nulls in column {col}: {e}")
-                    return rx.toast.error(f"Failed to fill nulls in '{col}'.")
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
+        except OperationError as e:
+            logging.exception(f"Error filling nulls: {e}")
+            return rx.toast.error(str(e))
         self.fill_columns = []
         self.calculate_null_stats()
         return rx.toast.success("Null values filled successfully.")
@@ -888,68 +1635,49 @@ class State(rx.State):
     @rx.event
     def remove_null_rows_any(self):
         """Remove rows that contain any null values."""
-        total_rows_before = sum((f["row_count"] for f in self.uploaded_files))
-        total_rows_after = 0
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            df.dropna(inplace=True)
-            self.uploaded_files[i]["row_count"] = len(df)
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-            total_rows_after += len(df)
+        self._begin_step("Remove rows with nulls")
+        total_rows_before = sum((f["row_count"] for f in self._uploaded_files))
+        self._apply_step("drop_null_rows", {})
+        total_rows_after = sum((f["row_count"] for f in self._uploaded_files))
         rows_removed_count = total_rows_before - total_rows_after
         self.calculate_null_stats()
         return rx.toast.success(f"Removed {rows_removed_count} rows with null values.")
 
     @rx.event
     def find_matches(self):
+        if self._pending_plan:
+            return self._run_plan_first()
         if not self.find_text:
             return rx.toast.warning("Search text cannot be empty.")
-        count = 0
-        for file_data in self.uploaded_files:
-            df = pd.read_json(io.StringIO(file_data["df_json"]), orient="split")
-            columns_to_search = (
-                [self.find_replace_column]
-                if self.find_replace_column != "_all_"
-                else df.columns
+        count = sum(
+            (
+                count_matches(
+                    self._get_frame(file_data),
+                    self.find_replace_column,
+                    self.find_text,
+                    self.case_sensitive,
+                )
+                for file_data in self._uploaded_files
             )
-            for col in columns_to_search:
-                if col in df.columns and (
-                    pd.api.types.is_string_dtype(df[col]) or df[col].dtype == "object"
-                ):
-                    matches = df[col].str.count(
-                        self.find_text,
-                        flags=0 if self.case_sensitive else re.IGNORECASE,
-                    )
-                    count += matches.sum()
+        )
         self.match_count = count
         return rx.toast.info(f"Found {count} matches.")
 
     @rx.event
     def apply_find_replace(self):
+        self._begin_step("Find and replace")
         if not self.find_text:
             return rx.toast.warning("Search text cannot be empty.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            columns_to_search = (
-                [self.find_replace_column]
-                if self.find_replace_column != "_all_"
-                else df.columns
-            )
-            for col in columns_to_search:
-                if col in df.columns and (
-                    pd.api.types.is_string_dtype(df[col]) or df[col].dtype == "object"
-                ):
-                    df[col] = df[col].str.replace(
-                        self.find_text,
-                        self.replace_text,
-                        case=self.case_sensitive,
-                        regex=self.use_regex,
-                    )
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
+        self._apply_step(
+            "find_replace",
+            {
+                "column": self.find_replace_column,
+                "find": self.find_text,
+                "replace": self.replace_text,
+                "case_sensitive": self.case_sensitive,
+                "regex": self.use_regex,
+            },
+        )
         self.match_count = -1
         return rx.toast.success("Find and replace operation completed.")
 
@@ -962,25 +1690,16 @@ class State(rx.State):
 
     @rx.event
     def apply_case_conversion(self):
+        self._begin_step("Convert case")
         if not self.case_conversion_columns:
             return rx.toast.warning("Please select at least one column.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            for col in self.case_conversion_columns:
-                if col in df.columns and (
-                    pd.api.types.is_string_dtype(df[col]) or df[col].dtype == "object"
-                ):
-                    if self.case_conversion_type == "upper":
-                        df[col] = df[col].str.upper()
-                    elif self.case_conversion_type == "lower":
-                        df[col] = df[col].str.lower()
-                    elif self.case_conversion_type == "title":
-                        df[col] = df[col].str.title()
-                    elif self.case_conversion_type == "capitalize":
-                        df[col] = df[col].str.capitalize()
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
+        self._apply_step(
+            "convert_case",
+            {
+                "columns": list(self.case_conversion_columns),
+                "case": self.case_conversion_type,
+            },
+        )
         return rx.toast.success(f"Applied {self.case_conversion_type} case.")
 
     @rx.event
@@ -992,27 +1711,16 @@ class State(rx.State):
 
     @rx.event
     def apply_whitespace_operation(self):
+        self._begin_step("Trim whitespace")
         if not self.whitespace_columns:
             return rx.toast.warning("Please select at least one column.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            for col in self.whitespace_columns:
-                if col in df.columns and (
-                    pd.api.types.is_string_dtype(df[col]) or df[col].dtype == "object"
-                ):
-                    if self.whitespace_operation == "leading":
-                        df[col] = df[col].str.lstrip()
-                    elif self.whitespace_operation == "trailing":
-                        df[col] = df[col].str.rstrip()
-                    elif self.whitespace_operation == "all":
-                        df[col] = df[col].str.strip()
-                    elif self.whitespace_operation == "collapse":
-                        df[col] = (
-                            df[col].str.replace("\\s+", " ", regex=True).str.strip()
-                        )
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
+        self._apply_step(
+            "trim_whitespace",
+            {
+                "columns": list(self.whitespace_columns),
+                "mode": self.whitespace_operation,
+            },
+        )
         return rx.toast.success("Whitespace operation applied successfully.")
 
     @rx.event
@@ -1026,34 +1734,24 @@ class State(rx.State):
     @rx.event
     def apply_split_column(self):
         """Split a column into multiple columns."""
+        self._begin_step("Split column")
         if not self.split_column:
             return rx.toast.warning("Please select a column to split.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
+        try:
+            self._apply_step(
+                "split_column",
+                {
+                    "column": self.split_column,
+                    "delimiter": self.split_delimiter,
+                    "max_splits": self.split_num_splits,
+                    "prefix": self.split_new_col_prefix,
+                },
             )
-            if self.split_column not in df.columns:
-                continue
-            try:
-                split_data = df[self.split_column].str.split(
-                    self.split_delimiter, n=self.split_num_splits, expand=True
-                )
-                num_new_cols = len(split_data.columns)
-                new_col_names = [
-                    f"{self.split_new_col_prefix}{j + 1}" for j in range(num_new_cols)
-                ]
-                split_data.columns = new_col_names
-                for name in new_col_names:
-                    if name in df.columns:
-                        return rx.toast.error(
-                            f"New column name '{name}' already exists. Choose a different prefix."
-                        )
-                df = pd.concat([df, split_data], axis=1)
-                self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-                self.uploaded_files[i]["columns"] = df.columns.tolist()
-            except Exception as e:
-                logging.exception(f"Error splitting column: {e}")
-                return rx.toast.error("Failed to split column.")
+        except OperationError as e:
+            return rx.toast.error(str(e))
+        except Exception as e:
+            logging.exception(f"Error splitting column: {e}")
+            return rx.toast.error("Failed to split column.")
         self.column_order = self.all_columns
         self.selected_columns = self.all_columns
         return rx.toast.success(f"Column '{self.split_column}' split successfully.")
@@ -1061,27 +1759,23 @@ class State(rx.State):
     @rx.event
     def apply_join_columns(self):
         """Join multiple columns into a single column."""
+        self._begin_step("Join columns")
         if len(self.join_columns) < 2:
             return rx.toast.warning("Please select at least two columns to join.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
+        try:
+            self._apply_step(
+                "join_columns",
+                {
+                    "columns": list(self.join_columns),
+                    "separator": self.join_separator,
+                    "new_column": self.join_new_col_name,
+                },
             )
-            if self.join_new_col_name in df.columns:
-                return rx.toast.error(
-                    f"New column name '{self.join_new_col_name}' already exists."
-                )
-            try:
-                df[self.join_new_col_name] = (
-                    df[self.join_columns]
-                    .astype(str)
-                    .agg(self.join_separator.join, axis=1)
-                )
-                self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-                self.uploaded_files[i]["columns"] = df.columns.tolist()
-            except Exception as e:
-                logging.exception(f"Error joining columns: {e}")
-                return rx.toast.error("Failed to join columns.")
+        except OperationError as e:
+            return rx.toast.error(str(e))
+        except Exception as e:
+            logging.exception(f"Error joining columns: {e}")
+            return rx.toast.error("Failed to join columns.")
         self.join_columns = []
         self.column_order = self.all_columns
         self.selected_columns = self.all_columns
@@ -1090,27 +1784,26 @@ class State(rx.State):
     @rx.event
     def apply_extract_substring(self):
         """Extract a substring from a column."""
+        self._begin_step("Extract substring")
         if not self.extract_column:
             return rx.toast.warning("Please select a column for extraction.")
         if self.extract_new_col_name in self.all_columns:
             return rx.toast.error(
                 f"New column name '{self.extract_new_col_name}' already exists."
             )
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
+        try:
+            self._apply_step(
+                "extract_substring",
+                {
+                    "column": self.extract_column,
+                    "start": self.extract_start_pos,
+                    "end": self.extract_end_pos,
+                    "new_column": self.extract_new_col_name,
+                },
             )
-            if self.extract_column not in df.columns:
-                continue
-            try:
-                df[self.extract_new_col_name] = df[self.extract_column].str[
-                    self.extract_start_pos : self.extract_end_pos
-                ]
-                self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-                self.uploaded_files[i]["columns"] = df.columns.tolist()
-            except Exception as e:
-                logging.exception(f"Error extracting substring: {e}")
-                return rx.toast.error("Failed to extract substring.")
+        except Exception as e:
+            logging.exception(f"Error extracting substring: {e}")
+            return rx.toast.error("Failed to extract substring.")
         self.column_order = self.all_columns
         self.selected_columns = self.all_columns
         return rx.toast.success("Substring extracted successfully.")
@@ -1146,60 +1839,45 @@ class State(rx.State):
     @rx.event
     def apply_sorting(self):
         """Apply the defined sorting configurations to all dataframes."""
+        self._begin_step("Sort rows")
         if not self.sort_configs:
             return rx.toast.warning("No sort rules defined.")
         sort_columns = [
             config["column"] for config in self.sort_configs if config["column"]
         ]
         sort_ascending = [
-            config["ascending"] for config in self.sort_configs if config["column"]
+            bool(config["ascending"])
+            for config in self.sort_configs
+            if config["column"]
         ]
         if not sort_columns:
             return rx.toast.warning("Please select columns for sorting.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            df.sort_values(by=sort_columns, ascending=sort_ascending, inplace=True)
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
+        self._apply_step(
+            "sort_rows", {"columns": sort_columns, "ascending": sort_ascending}
+        )
         return rx.toast.success("Data sorted successfully.")
 
     @rx.event
     def apply_sampling(self):
         """Apply the selected sampling method to the data and add it as a new file."""
-        all_dfs = [
-            pd.read_json(io.StringIO(f["df_json"]), orient="split")
-            for f in self.uploaded_files
-        ]
-        if not all_dfs:
+        self._begin_step("Sample rows")
+        if not self._uploaded_files:
             return rx.toast.warning("No data to sample.")
-        combined_df = pd.concat(all_dfs, ignore_index=True)
-        filename_part = ""
-        if self.sample_type == "random":
-            sampled_df = combined_df.sample(n=self.sample_n)
-            filename_part = f"random_{self.sample_n}_rows"
-        elif self.sample_type == "percentage":
-            sampled_df = combined_df.sample(frac=self.sample_percentage / 100)
-            filename_part = f"percentage_{self.sample_percentage}_percent"
-        elif self.sample_type == "top":
-            sampled_df = combined_df.head(self.sample_n)
-            filename_part = f"top_{self.sample_n}_rows"
-        elif self.sample_type == "bottom":
-            sampled_df = combined_df.tail(self.sample_n)
-            filename_part = f"bottom_{self.sample_n}_rows"
-        else:
-            return rx.toast.error("Invalid sample type.")
-        new_file_data: FileData = {
-            "file_name": f"sampled_data_{filename_part}.csv",
-            "row_count": len(sampled_df),
-            "columns": sampled_df.columns.tolist(),
-            "df_json": sampled_df.to_json(orient="split"),
-        }
-        self.uploaded_files.append(new_file_data)
+        try:
+            self._apply_step(
+                "sample_rows",
+                {
+                    "method": self.sample_type,
+                    "n": self.sample_n,
+                    "percentage": self.sample_percentage,
+                },
+            )
+        except OperationError as e:
+            return rx.toast.error(str(e))
         self.column_order = self.all_columns
         self.selected_columns = self.all_columns
         return rx.toast.success(
-            f"Sampled data added as a new file with {len(sampled_df)} rows."
+            f"Sampled data added as a new file with {self._uploaded_files[-1]['row_count']} rows."
         )
 
     @rx.event
@@ -1238,50 +1916,19 @@ class State(rx.State):
     @rx.event
     def apply_conditional_transforms(self):
         """Apply all conditional transformation rules."""
+        self._begin_step("Conditional transform")
         if not self.conditional_rules:
             return rx.toast.warning("No conditional rules to apply.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
+        try:
+            self._apply_step(
+                "conditional_transform",
+                {"rules": [dict(rule) for rule in self.conditional_rules]},
             )
-            for rule in self.conditional_rules:
-                try:
-                    mask = self._build_mask(df, rule)
-                    action = rule["action"]
-                    target_col = rule["target_column"]
-                    action_val = rule["action_value"]
-                    if action == "set_value":
-                        df.loc[mask, target_col] = action_val
-                    elif action == "copy_from_column":
-                        df.loc[mask, target_col] = df.loc[mask, action_val]
-                except Exception as e:
-                    logging.exception(f"Error applying conditional rule: {e}")
-                    return rx.toast.error(
-                        f"Error with rule for column '{rule['condition_column']}'. Check parameters."
-                    )
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
+        except OperationError as e:
+            logging.exception(f"Error applying conditional rule: {e}")
+            return rx.toast.error(str(e))
         return rx.toast.success("Conditional transformations applied.")
 
-    def _build_mask(self, df: pd.DataFrame, rule: ConditionalRule) -> pd.Series:
-        col = rule["condition_column"]
-        op = rule["condition_op"]
-        val = rule["condition_value"]
-        if op == "equals":
-            return df[col].astype(str) == val
-        if op == "not_equals":
-            return df[col].astype(str) != val
-        if op == "contains":
-            return df[col].astype(str).str.contains(val, case=False, na=False)
-        numeric_col = pd.to_numeric(df[col], errors="coerce")
-        numeric_val = pd.to_numeric(val, errors="coerce")
-        mask = pd.Series([False] * len(df), index=df.index)
-        valid_comp = numeric_col.notna() & (numeric_val is not None)
-        if op == "greater_than":
-            mask[valid_comp] = numeric_col[valid_comp] > numeric_val
-        elif op == "less_than":
-            mask[valid_comp] = numeric_col[valid_comp] < numeric_val
-        return mask
-
     @rx.event
     def toggle_melt_id_var(self, col: str):
         if col in self.melt_id_vars:
@@ -1310,107 +1957,117 @@ class State(rx.State):
         else:
             self.groupby_agg_columns.append(col)
 
-    @rx.event
-    def apply_pivot(self):
+    @rx.event(background=True)
+    async def apply_pivot(self):
         """Apply pivot table operation."""
-        if not all([self.pivot_index, self.pivot_columns, self.pivot_values]):
-            return rx.toast.warning(
-                "Index, Columns, and Values must be selected for pivot."
-            )
-        all_dfs = [
-            pd.read_json(io.StringIO(f["df_json"]), orient="split")
-            for f in self.uploaded_files
-        ]
-        combined_df = pd.concat(all_dfs, ignore_index=True)
+        async with self:
+            if not all([self.pivot_index, self.pivot_columns, self.pivot_values]):
+                error = "Index, Columns, and Values must be selected for pivot."
+            elif not self._start_task("Creating pivot table"):
+                error = TASK_BUSY_MESSAGE
+            else:
+                error = ""
+            params = {
+                "index": self.pivot_index,
+                "columns": self.pivot_columns,
+                "values": self.pivot_values,
+                "aggfunc": self.pivot_aggfunc,
+            }
+        if error:
+            yield rx.toast.warning(error)
+            return
         try:
-            pivot_df = combined_df.pivot_table(
-                index=self.pivot_index,
-                columns=self.pivot_columns,
-                values=self.pivot_values,
-                aggfunc=self.pivot_aggfunc,
-            ).reset_index()
-            self.uploaded_files = [
-                {
-                    "file_name": "pivoted_data.csv",
-                    "row_count": len(pivot_df),
-                    "columns": pivot_df.columns.tolist(),
-                    "df_json": pivot_df.to_json(orient="split"),
-                }
-            ]
-            self.column_order = self.all_columns
-            self.selected_columns = self.all_columns
-            return rx.toast.success("Pivot table created successfully.")
+            files = await self._queued_flush()
+            await self._queued_step(files, "pivot", params, "Pivot table")
+        except TaskCancelled:
+            yield rx.toast.info("Pivot table cancelled.")
+            return
+        except OperationError as e:
+            yield rx.toast.error(str(e))
+            return
         except Exception as e:
             logging.exception(f"Error creating pivot table: {e}")
-            return rx.toast.error("Failed to create pivot table. Check selections.")
+            yield rx.toast.error("Failed to create pivot table. Check selections.")
+            return
+        finally:
+            async with self:
+                self._finish_task()
+        yield rx.toast.success("Pivot table created successfully.")
 
-    @rx.event
-    def apply_melt(self):
+    @rx.event(background=True)
+    async def apply_melt(self):
         """Apply melt/unpivot operation."""
-        if not self.melt_id_vars or not self.melt_value_vars:
-            return rx.toast.warning(
-                "ID variables and Value variables must be selected."
-            )
-        all_dfs = [
-            pd.read_json(io.StringIO(f["df_json"]), orient="split")
-            for f in self.uploaded_files
-        ]
-        combined_df = pd.concat(all_dfs, ignore_index=True)
+        async with self:
+            if not self.melt_id_vars or not self.melt_value_vars:
+                error = "ID variables and Value variables must be selected."
+            elif not self._start_task("Melting data"):
+                error = TASK_BUSY_MESSAGE
+            else:
+                error = ""
+            params = {
+                "id_vars": list(self.melt_id_vars),
+                "value_vars": list(self.melt_value_vars),
+                "var_name": self.melt_var_name,
+                "value_name": self.melt_value_name,
+            }
+        if error:
+            yield rx.toast.warning(error)
+            return
         try:
-            melted_df = combined_df.melt(
-                id_vars=self.melt_id_vars,
-                value_vars=self.melt_value_vars,
-                var_name=self.melt_var_name,
-                value_name=self.melt_value_name,
-            )
-            self.uploaded_files = [
-                {
-                    "file_name": "melted_data.csv",
-                    "row_count": len(melted_df),
-                    "columns": melted_df.columns.tolist(),
-                    "df_json": melted_df.to_json(orient="split"),
-                }
-            ]
-            self.column_order = self.all_columns
-            self.selected_columns = self.all_columns
-            return rx.toast.success("Data melted successfully.")
+            files = await self._queued_flush()
+            await self._queued_step(files, "melt", params, "Melt")
+        except TaskCancelled:
+            yield rx.toast.info("Melt cancelled.")
+            return
+        except OperationError as e:
+            yield rx.toast.error(str(e))
+            return
         except Exception as e:
             logging.exception(f"Error melting data: {e}")
-            return rx.toast.error("Failed to melt data. Check selections.")
+            yield rx.toast.error("Failed to melt data. Check selections.")
+            return
+        finally:
+            async with self:
+                self._finish_task()
+        yield rx.toast.success("Data melted successfully.")
 
-    @rx.event
-    def apply_groupby(self):
+    @rx.event(background=True)
+    async def apply_groupby(self):
         """Apply groupby and aggregation operation."""
-        if not self.groupby_columns or not self.groupby_agg_columns:
-            return rx.toast.warning(
-                "Group-by columns and aggregation columns must be selected."
-            )
-        all_dfs = [
-            pd.read_json(io.StringIO(f["df_json"]), orient="split")
-            for f in self.uploaded_files
-        ]
-        combined_df = pd.concat(all_dfs, ignore_index=True)
+        async with self:
+            if not self.groupby_columns or not self.groupby_agg_columns:
+                error = "Group-by columns and aggregation columns must be selected."
+            elif not self._start_task("Grouping data"):
+                error = TASK_BUSY_MESSAGE
+            else:
+                error = ""
+            params = {
+                "columns": list(self.groupby_columns),
+                "agg_columns": list(self.groupby_agg_columns),
+                "aggfunc": self.groupby_aggfunc,
+            }
+        if error:
+            yield rx.toast.warning(error)
+            return
         try:
-            agg_dict = {col: self.groupby_aggfunc for col in self.groupby_agg_columns}
-            grouped_df = (
-                combined_df.groupby(self.groupby_columns).agg(agg_dict).reset_index()
-            )
-            self.uploaded_files = [
-                {
-                    "file_name": "grouped_data.csv",
-                    "row_count": len(grouped_df),
-                    "columns": grouped_df.columns.tolist(),
-                    "df_json": grouped_df.to_json(orient="split"),
-                }
-            ]
-            self.column_order = self.all_columns
-            self.selected_columns = self.all_columns
-            return rx.toast.success("Data grouped and aggregated successfully.")
+            files = await self._queued_flush()
+            await self._queued_step(files, "group_by", params, "Group by")
+        except TaskCancelled:
+            yield rx.toast.info("Group by cancelled.")
+            return
+        except OperationError as e:
+            yield rx.toast.error(str(e))
+            return
         except Exception as e:
             logging.exception(f"Error grouping data: {e}")
-            return rx.toast.error(
+            yield rx.toast.error(
                 "Failed to group data. Ensure agg function is valid for column types."
             )
+            return
+        finally:
+            async with self:
+                self._finish_task()
+        yield rx.toast.success("Data grouped and aggregated successfully.")
 
     @rx.event
     def toggle_datetime_column(self, col: str):
@@ -1429,40 +2086,20 @@ class State(rx.State):
     @rx.event
     def extract_date_components(self):
         """Extract components from date columns."""
+        self._begin_step("Extract date components")
         if not self.datetime_columns:
             return rx.toast.warning("Please select at least one date column.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
+        try:
+            self._apply_step(
+                "extract_date_parts",
+                {
+                    "columns": list(self.datetime_columns),
+                    "components": list(self.extract_components),
+                },
             )
-            for col in self.datetime_columns:
-                if col not in df.columns:
-                    continue
-                try:
-                    date_series = pd.to_datetime(df[col], errors="coerce")
-                    for comp in self.extract_components:
-                        new_col_name = f"{col}_{comp}"
-                        if new_col_name in df.columns:
-                            continue
-                        if comp == "year":
-                            df[new_col_name] = date_series.dt.year
-                        elif comp == "month":
-                            df[new_col_name] = date_series.dt.month
-                        elif comp == "day":
-                            df[new_col_name] = date_series.dt.day
-                        elif comp == "weekday":
-                            df[new_col_name] = date_series.dt.weekday
-                        elif comp == "hour":
-                            df[new_col_name] = date_series.dt.hour
-                        elif comp == "minute":
-                            df[new_col_name] = date_series.dt.minute
-                except Exception as e:
-                    logging.exception(
-                        f"Error extracting date component from {col}: {e}"
-                    )
-                    return rx.toast.error(f"Failed to process date column '{col}'.")
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-            self.uploaded_files[i]["columns"] = df.columns.tolist()
+        except OperationError as e:
+            logging.exception(f"Error extracting date components: {e}")
+            return rx.toast.error(str(e))
         self.column_order = self.all_columns
         self.selected_columns = self.all_columns
         return rx.toast.success("Date components extracted.")
@@ -1470,28 +2107,23 @@ class State(rx.State):
     @rx.event
     def calculate_date_difference(self):
         """Calculate difference between two date columns."""
+        self._begin_step("Date difference")
         if not self.date_diff_col1 or not self.date_diff_col2:
             return rx.toast.warning(
                 "Please select two columns to calculate the difference."
             )
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
+        try:
+            self._apply_step(
+                "date_difference",
+                {
+                    "column1": self.date_diff_col1,
+                    "column2": self.date_diff_col2,
+                    "new_column": self.date_diff_new_col,
+                },
             )
-            if (
-                self.date_diff_col1 not in df.columns
-                or self.date_diff_col2 not in df.columns
-            ):
-                continue
-            try:
-                col1 = pd.to_datetime(df[self.date_diff_col1], errors="coerce")
-                col2 = pd.to_datetime(df[self.date_diff_col2], errors="coerce")
-                df[self.date_diff_new_col] = (col1 - col2).dt.days
-                self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-                self.uploaded_files[i]["columns"] = df.columns.tolist()
-            except Exception as e:
-                logging.exception(f"Error calculating date difference: {e}")
-                return rx.toast.error("Failed to calculate date difference.")
+        except Exception as e:
+            logging.exception(f"Error calculating date difference: {e}")
+            return rx.toast.error("Failed to calculate date difference.")
         self.column_order = self.all_columns
         self.selected_columns = self.all_columns
         return rx.toast.success("Date difference calculated.")
@@ -1499,29 +2131,22 @@ class State(rx.State):
     @rx.event
     def apply_date_arithmetic(self):
         """Add or subtract a time delta from a date column."""
+        self._begin_step("Date arithmetic")
         if not self.date_arith_column:
             return rx.toast.warning("Please select a date column for arithmetic.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
+        try:
+            self._apply_step(
+                "date_arithmetic",
+                {
+                    "column": self.date_arith_column,
+                    "op": self.date_arith_op,
+                    "unit": self.date_arith_unit,
+                    "value": self.date_arith_value,
+                },
             )
-            if self.date_arith_column not in df.columns:
-                continue
-            try:
-                date_series = pd.to_datetime(
-                    df[self.date_arith_column], errors="coerce"
-                )
-                delta = pd.to_timedelta(
-                    self.date_arith_value, unit=self.date_arith_unit.rstrip("s")
-                )
-                if self.date_arith_op == "add":
-                    df[self.date_arith_column] = date_series + delta
-                else:
-                    df[self.date_arith_column] = date_series - delta
-                self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-            except Exception as e:
-                logging.exception(f"Error applying date arithmetic: {e}")
-                return rx.toast.error("Failed to apply date arithmetic.")
+        except Exception as e:
+            logging.exception(f"Error applying date arithmetic: {e}")
+            return rx.toast.error("Failed to apply date arithmetic.")
         return rx.toast.success("Date arithmetic applied.")
 
     @rx.event
@@ -1534,22 +2159,21 @@ class State(rx.State):
     @rx.event
     def apply_label_encoding(self):
         """Apply label encoding to selected columns."""
+        self._begin_step("Label encoding")
         if not self.label_encode_columns:
             return rx.toast.warning("Please select columns for label encoding.")
+        columns = list(self.label_encode_columns)
+        self._apply_step("label_encode", {"columns": columns})
         mappings = {}
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            for col in self.label_encode_columns:
-                if col not in df.columns:
-                    continue
-                new_col_name = f"{col}_encoded"
-                codes, uniques = pd.factorize(df[col])
-                df[new_col_name] = codes
-                mappings[col] = {str(k): v for v, k in enumerate(uniques)}
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-            self.uploaded_files[i]["columns"] = df.columns.tolist()
+        for file_data in self._uploaded_files:
+            df = self._get_frame(file_data)
+            for col in columns:
+                if col in df.columns:
+                    pairs = df[[col, f"{col}_encoded"]].drop_duplicates()
+                    pairs = pairs[pairs[f"{col}_encoded"] >= 0]
+                    mappings[col] = {
+                        str(k): int(v) for k, v in pairs.itertuples(index=False)
+                    }
         self.label_mappings = mappings
         self.column_order = self.all_columns
         self.selected_columns = self.all_columns
@@ -1562,29 +2186,39 @@ class State(rx.State):
         else:
             self.onehot_columns.append(col)
 
-    @rx.event
-    def apply_onehot_encoding(self):
+    @rx.event(background=True)
+    async def apply_onehot_encoding(self):
         """Apply one-hot encoding to selected columns."""
-        if not self.onehot_columns:
-            return rx.toast.warning("Please select columns for one-hot encoding.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            try:
-                dummies = pd.get_dummies(
-                    df[self.onehot_columns], prefix=self.onehot_columns, prefix_sep="_"
-                )
-                df = pd.concat([df.drop(columns=self.onehot_columns), dummies], axis=1)
-                self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-                self.uploaded_files[i]["columns"] = df.columns.tolist()
-            except Exception as e:
-                logging.exception(f"Error during one-hot encoding: {e}")
-                return rx.toast.error("One-hot encoding failed. Check columns.")
-        self.column_order = self.all_columns
-        self.selected_columns = self.all_columns
-        self.onehot_columns = []
-        return rx.toast.success("One-hot encoding applied.")
+        async with self:
+            if not self.onehot_columns:
+                error = "Please select columns for one-hot encoding."
+            elif not self._start_task("One-hot encoding"):
+                error = TASK_BUSY_MESSAGE
+            else:
+                error = ""
+            params = {"columns": list(self.onehot_columns)}
+        if error:
+            yield rx.toast.warning(error)
+            return
+        try:
+            files = await self._queued_flush()
+            await self._queued_step(files, "onehot_encode", params, "One-hot encoding")
+        except TaskCancelled:
+            yield rx.toast.info("One-hot encoding cancelled.")
+            return
+        except OperationError as e:
+            yield rx.toast.error(str(e))
+            return
+        except Exception as e:
+            logging.exception(f"Error during one-hot encoding: {e}")
+            yield rx.toast.error("One-hot encoding failed. Check columns.")
+            return
+        finally:
+            async with self:
+                self._finish_task()
+        async with self:
+            self.onehot_columns = []
+        yield rx.toast.success("One-hot encoding applied.")
 
     @rx.event
     def toggle_remove_special_column(self, col: str):
@@ -1596,6 +2230,7 @@ class State(rx.State):
     @rx.event
     def apply_remove_special_chars(self):
         """Remove special characters from selected columns."""
+        self._begin_step("Remove special characters")
         if not self.remove_special_columns:
             return rx.toast.warning("Please select columns to clean.")
         try:
@@ -1603,16 +2238,301 @@ class State(rx.State):
         except re.error as e:
             logging.exception(f"Invalid regex pattern: {e}")
             return rx.toast.error("Invalid Regex pattern for special characters.")
-        for i in range(len(self.uploaded_files)):
-            df = pd.read_json(
-                io.StringIO(self.uploaded_files[i]["df_json"]), orient="split"
-            )
-            for col in self.remove_special_columns:
-                if col in df.columns:
-                    df[col] = (
-                        df[col]
-                        .astype(str)
-                        .str.replace(self.special_char_pattern, "", regex=True)
+        self._apply_step(
+            "remove_special_chars",
+            {
+                "columns": list(self.remove_special_columns),
+                "pattern": self.special_char_pattern,
+            },
+        )
+        return rx.toast.success("Special characters removed.")
+
+    @rx.event
+    def set_lazy_mode(self, enabled: bool):
+        """Switch between planning steps and applying them immediately."""
+        self.lazy_mode = enabled
+        if not enabled and self._pending_plan:
+            return State.run_pending_plan
+
+    @rx.event(background=True)
+    async def run_pending_plan(self):
+        """Execute the planned steps now, as a job in the workers."""
+        async with self:
+            count = len(self._pending_plan)
+            if not count:
+                rejected = rx.toast.info("No planned steps.")
+            elif not self._start_task("Running planned steps"):
+                rejected = rx.toast.warning(TASK_BUSY_MESSAGE)
+            else:
+                rejected = None
+        if rejected is not None:
+            yield rejected
+            return
+        try:
+            await self._queued_flush()
+        except TaskCancelled:
+            yield rx.toast.info("Planned steps cancelled; they are still planned.")
+            return
+        except OperationError as e:
+            yield rx.toast.error(str(e))
+            return
+        except Exception as e:
+            logging.exception(f"Error running planned steps: {e}")
+            yield rx.toast.error(f"Failed to run the planned steps: {e}")
+            return
+        finally:
+            async with self:
+                self._finish_task()
+        async with self:
+            self._refresh_tab()
+        yield rx.toast.success(f"Applied {count} planned step(s).")
+
+    @rx.event
+    def download_recipe(self):
+        """Download the recorded recipe, including planned steps, as JSON."""
+        steps = self._recipe + self._pending_plan
+        if not steps:
+            return rx.toast.warning("No steps have been recorded yet.")
+        return rx.download(
+            data=json.dumps({"steps": steps}, indent=2),
+            filename="dataforge_recipe.json",
+        )
+
+    @rx.event
+    async def handle_recipe_upload(self, files: list[rx.UploadFile]):
+        """Load a saved recipe so it can be replayed on the current files."""
+        if not files:
+            return rx.toast.error("No recipe file selected.")
+        try:
+            data = json.loads(await files[0].read())
+            self._loaded_recipe = [validate_step(step) for step in data["steps"]]
+        except OperationError as e:
+            return rx.toast.error(str(e))
+        except Exception as e:
+            logging.exception(f"Error loading recipe: {e}")
+            return rx.toast.error(f"Could not read recipe {files[0].name}.")
+        return rx.toast.success(
+            f"Loaded recipe with {len(self._loaded_recipe)} step(s)."
+        )
+
+    async def _queued_recipe(self, steps: list[RecipeStep]) -> int:
+        """Apply recipe steps to the current files one job at a time.
+
+        Call it from a background task holding the task slot. Every step runs
+        in the workers, where its memory use is checked against the budget,
+        and all of them are recorded together. Returns how many files the
+        recipe was applied to. Raises TaskCancelled when the user cancels,
+        and OperationError when a step fails or the files changed meanwhile.
+        """
+        inputs = files = await self._queued_flush()
+        created = set()
+        try:
+            for step in steps:
+                stored = await self._run_step_job(files, step)
+                kind = OPERATIONS[step["op"]].kind
+                result = [handle for _, handle in stored] if kind == "file" else stored
+                async with self:
+                    files = self._step_outputs(files, kind, result)
+                created.update((f["handle"] for f in files))
+            async with self:
+                if self._task_cancelled:
+                    raise TaskCancelled()
+                if _handles(self._uploaded_files) != _handles(inputs):
+                    raise OperationError(
+                        "The files changed while the recipe ran; "
+                        "the result was discarded."
+                    )
+                self._begin_step("Apply recipe")
+                self._record_steps(inputs, steps, files)
+                self.column_order = self.all_columns
+                self.selected_columns = self.all_columns
+        finally:
+            # Intermediate results, and everything after a failure, are unused.
+            async with self:
+                self._release_unreferenced(created)
+        return len(inputs)
+
+    @rx.event(background=True)
+    async def replay_recipe(self):
+        """Apply every step of the loaded recipe to the current files at once."""
+        async with self:
+            steps = list(self._loaded_recipe)
+            if not steps:
+                error = "Load a recipe first."
+            elif not self._uploaded_files:
+                error = "Upload files to apply the recipe to."
+            elif not self._start_task("Applying recipe"):
+                error = TASK_BUSY_MESSAGE
+            else:
+                error = ""
+        if error:
+            yield rx.toast.warning(error)
+            return
+        try:
+            count = await self._queued_recipe(steps)
+        except TaskCancelled:
+            yield rx.toast.info("Applying the recipe cancelled.")
+            return
+        except OperationError as e:
+            yield rx.toast.error(str(e))
+            return
+        except Exception as e:
+            logging.exception(f"Error replaying recipe: {e}")
+            yield rx.toast.error(f"Failed to apply recipe: {e}")
+            return
+        finally:
+            async with self:
+                self._finish_task()
+        yield rx.toast.success(
+            f"Applied {len(steps)} recipe step(s) to {count} file(s)."
+        )
+
+    async def _recompute_from(
+        self, index: int, step: RecipeStep, label: str
+    ) -> tuple[int, int]:
+        """Replace a recorded step, then rerun it and every step after it.
+
+        Call it from a background task holding the task slot. The run
+        restarts from the nearest checkpoint at or before the step, and each
+        step is looked up in the step cache first, so steps whose input and
+        parameters are unchanged reuse their earlier output; the others run
+        as jobs in the workers. Returns how many steps were computed and how
+        many were reused. Raises TaskCancelled when the user cancels, and
+        OperationError when a step fails or the recipe changed meanwhile.
+        """
+        async with self:
+            start = index
+            while start >= 0 and self._checkpoints[start] is None:
+                start -= 1
+            if start < 0:
+                raise OperationError(
+                    f"The input of step {index + 1} is no longer kept; "
+                    "replay the recipe on a fresh upload instead."
+                )
+            recipe = list(self._recipe)
+            current = _handles(self._uploaded_files)
+            kept = [files and _handles(files) for files in self._checkpoints]
+            steps = recipe[:index] + [step] + recipe[index + 1 :]
+            files = list(self._checkpoints[start])
+            checkpoints = list(self._checkpoints[:start])
+        computed = reused = 0
+        results = []
+        created = set()
+        try:
+            for step in steps[start:]:
+                key = _step_key(files, step)
+                async with self:
+                    outputs = self._step_cache.get(key)
+                if outputs is None:
+                    stored = await self._run_step_job(files, step)
+                    kind = OPERATIONS[step["op"]].kind
+                    result = (
+                        [handle for _, handle in stored] if kind == "file" else stored
                     )
-            self.uploaded_files[i]["df_json"] = df.to_json(orient="split")
-        return rx.toast.success("Special characters removed.")
\ No newline at end of file
+                    async with self:
+                        outputs = self._step_outputs(files, kind, result)
+                    created.update((f["handle"] for f in outputs))
+                    computed += 1
+                else:
+                    reused += 1
+                results.append((key, outputs))
+                checkpoints.append(files)
+                files = outputs
+            async with self:
+                if self._task_cancelled:
+                    raise TaskCancelled()
+                if (
+                    self._recipe != recipe
+                    or _handles(self._uploaded_files) != current
+                    or [files and _handles(files) for files in self._checkpoints]
+                    != kept
+                ):
+                    raise OperationError(
+                        "The files changed while the recipe was recomputed; "
+                        "the result was discarded."
+                    )
+                for key, outputs in results:
+                    self._step_cache.pop(key, None)
+                    self._step_cache[key] = outputs
+                self._begin_step(label)
+                self._snapshot()
+                self._recipe = steps
+                self._checkpoints = checkpoints
+                self._replace_files(files)
+                self._trim_checkpoints()
+        except BaseException:
+            async with self:
+                self._release_unreferenced(created)
+            raise
+        return computed, reused
+
+    @rx.event
+    def start_step_edit(self, index: int):
+        """Open the parameters of a recorded step for editing."""
+        self.editing_step = index
+        self.edit_step_params = json.dumps(self._recipe[index]["params"], indent=2)
+
+    @rx.event
+    def set_edit_step_params(self, value: str):
+        self.edit_step_params = value
+
+    @rx.event
+    def cancel_step_edit(self):
+        self.editing_step = -1
+        self.edit_step_params = ""
+
+    def _start_step_edit_task(self) -> tuple[RecipeStep | None, Any]:
+        """Claim the task slot for the edited step.
+
+        Returns the step, or the toast saying why it cannot be applied.
+        """
+        index = self.editing_step
+        if not 0 <= index < len(self._recipe):
+            return None, rx.toast.warning("Select a recorded step to edit.")
+        try:
+            params = json.loads(self.edit_step_params)
+            step = validate_step({"op": self._recipe[index]["op"], "params": params})
+        except json.JSONDecodeError as e:
+            return None, rx.toast.error(f"Parameters must be valid JSON: {e}")
+        except OperationError as e:
+            return None, rx.toast.error(str(e))
+        if not self._start_task(f"Edit step {index + 1}"):
+            return None, rx.toast.warning(TASK_BUSY_MESSAGE)
+        return step, None
+
+    @rx.event(background=True)
+    async def apply_step_edit(self):
+        """Rerun the recipe from the edited step, reusing cached step results."""
+        async with self:
+            index = self.editing_step
+            label = f"Edit step {index + 1}"
+            step, rejected = self._start_step_edit_task()
+        if rejected is not None:
+            yield rejected
+            return
+        try:
+            await self._queued_flush()
+            computed, reused = await self._recompute_from(index, step, label)
+        except TaskCancelled:
+            yield rx.toast.info("Recomputing the recipe cancelled.")
+            return
+        except OperationError as e:
+            yield rx.toast.error(str(e))
+            return
+        except Exception as e:
+            logging.exception(f"Error recomputing recipe: {e}")
+            yield rx.toast.error(f"Failed to recompute the recipe: {e}")
+            return
+        finally:
+            async with self:
+                self._finish_task()
+        async with self:
+            self.editing_step = -1
+            self.edit_step_params = ""
+            self.column_order = self.all_columns
+            self.selected_columns = self.all_columns
+            if self.active_tab == "download":
+                self._prepare_preview_data()
+        yield rx.toast.success(
+            f"Recomputed {computed} step(s), reused {reused} cached result(s)."
+        )
\ No newline at end of file
@@ -0,0 +1,93 @@
+import logging
+import os
+from typing import Callable
+import pandas as pd
+from app.file_formats import read_frame, read_frame_chunks
+from app.frame_store import StreamingError, frame_nbytes, frame_store
+from app.operations import RecipeStep, run_recipe
+
+STREAM_CHUNK_ROWS = int(os.environ.get("DATAFORGE_STREAM_CHUNK_ROWS", "250000"))
+STREAM_MIN_ROWS = int(os.environ.get("DATAFORGE_STREAM_MIN_ROWS", "1000000"))
+STREAMING_OPERATIONS = {
+    "rename_columns",
+    "select_columns",
+    "filter_rows",
+    "drop_null_rows",
+    "find_replace",
+    "convert_case",
+    "trim_whitespace",
+    "remove_special_chars",
+    "convert_types",
+    "conditional_transform",
+}
+
+
+def can_stream(steps: list[RecipeStep], rows: int) -> bool:
+    """Whether steps should run chunk by chunk over a stored frame of this size.
+
+    Only operations that compute each output row from its input row alone
+    qualify, so running them per chunk gives the same rows as running them on
+    the whole frame.
+    """
+    return (
+        rows >= STREAM_MIN_ROWS
+        and bool(steps)
+        and all((step["op"] in STREAMING_OPERATIONS for step in steps))
+    )
+
+
+def stream_steps(
+    file_name: str,
+    handle: str,
+    steps: list[RecipeStep],
+    session: str = "",
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+) -> str:
+    """Run row-local steps over a stored frame into a new stored frame.
+
+    The frame is read, transformed and written chunk_rows rows at a time, so
+    at most one chunk is held in memory. Returns the new frame's handle;
+    raises StreamingError when the chunks do not combine into one frame.
+    """
+
+    def chunks():
+        for source in frame_store.iter_chunks(handle, chunk_rows):
+            yield run_recipe([(file_name, source.copy())], steps)[0][1], source
+
+    return frame_store.put_chunks(chunks(), parent=handle, session=session)
+
+
+def stream_upload(
+    file_name: str,
+    path: str,
+    session: str = "",
+    on_chunk: Callable[[pd.DataFrame, int, int], None] | None = None,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+) -> str:
+    """Parse an uploaded file into the frame store and return the frame's handle.
+
+    The file is parsed and written chunk_rows rows at a time, so at most one
+    chunk is held in memory. on_chunk is called with each chunk before it is
+    stored, and the rows and in-memory bytes parsed so far; an exception it
+    raises stops the upload, leaving nothing stored. When the chunks disagree
+    on dtypes the file is parsed again as a whole.
+    """
+
+    def chunks():
+        rows = nbytes = 0
+        for df in read_frame_chunks(file_name, path, chunk_rows):
+            rows += len(df)
+            nbytes += frame_nbytes(df)
+            if on_chunk is not None:
+                on_chunk(df, rows, nbytes)
+            # With no parent frame the source slice is never compared.
+            yield df, df
+
+    try:
+        return frame_store.put_chunks(chunks(), session=session)
+    except StreamingError as e:
+        logging.info(f"Parsing {file_name} as a whole: {e}")
+    df = read_frame(file_name, path)
+    if on_chunk is not None:
+        on_chunk(df, len(df), frame_nbytes(df))
+    return frame_store.put(df, session=session)
\ No newline at end of file
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import reflex as rx
+from reflex.event import Event, fix_events
+from reflex.state import BaseState, StateUpdate
+from app.frame_cache import frame_cache
+from app.frame_store import SESSION_IDLE_SECONDS, SESSION_TTL_SECONDS, frame_store
+from app.jobs import JOB_RETENTION_SECONDS, job_queue
+from app.state import State
+
+
+async def expire_idle_sessions():
+    """Periodically evict the frames of idle sessions and release expired ones.
+
+    Sessions idle past SESSION_IDLE_SECONDS lose their decoded cache entries
+    and have their blobs moved to cold storage; sessions idle past
+    SESSION_TTL_SECONDS have their frames deleted. Records of jobs that
+    finished more than JOB_RETENTION_SECONDS ago are removed as well.
+    """
+    while True:
+        await asyncio.sleep(max(min(SESSION_IDLE_SECONDS, SESSION_TTL_SECONDS) // 4, 1))
+        try:
+            expired = await asyncio.to_thread(
+                frame_store.expire_sessions, SESSION_TTL_SECONDS
+            )
+            await asyncio.to_thread(
+                frame_store.evict_idle_sessions, SESSION_IDLE_SECONDS
+            )
+            idle = await asyncio.to_thread(
+                frame_store.idle_sessions, SESSION_IDLE_SECONDS
+            )
+            await job_queue.purge(JOB_RETENTION_SECONDS)
+        except Exception as e:
+            logging.exception(f"Error evicting idle sessions: {e}")
+            continue
+        for session in expired + idle:
+            frame_cache.discard_session(session)
+
+
+class SessionActivity(rx.Middleware):
+    """Keep the frames of sessions that send events from expiring.
+
+    Events mark their session as active, at most once every
+    SESSION_TOUCH_SECONDS, so only sessions idle for SESSION_TTL_SECONDS lose
+    their frames. A session whose frames expired
+    anyway, such as a tab left open past the TTL, has its workspace reset
+    with a message instead of running the event on frames that are gone.
+    """
+
+    async def preprocess(
+        self, app: rx.App, state: BaseState, event: Event
+    ) -> StateUpdate | None:
+        if not await asyncio.to_thread(frame_store.touch, event.token):
+            return None
+        session = await state.get_state(State)
+        if not session._reset_expired_workspace():
+            return None
+        # The event is dropped; the follow-up event sends the reset workspace.
+        return StateUpdate(
+            events=fix_events([State.notify_workspace_expired], event.token)
+        )
\ No newline at end of file
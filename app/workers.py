@@ -0,0 +1,115 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import pandas as pd
+from app.column_values import stored_versions
+from app.frame_store import StreamingError, frame_store
+from app.operations import RecipeStep, apply_step
+from app.streaming import can_stream, stream_steps
+
+WORKER_PROCESSES = int(os.environ.get("DATAFORGE_WORKERS", str(os.cpu_count() or 1)))
+PARALLEL_MIN_ROWS = int(os.environ.get("DATAFORGE_PARALLEL_MIN_ROWS", "100000"))
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=WORKER_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def use_pool(file_count: int, total_rows: int) -> bool:
+    """Whether per-file work is worth sending to the worker processes.
+
+    Starting tasks and shipping results between processes costs more than it
+    saves on small inputs, so the pool is only used for several files holding
+    at least PARALLEL_MIN_ROWS rows between them.
+    """
+    return WORKER_PROCESSES > 1 and file_count > 1 and total_rows >= PARALLEL_MIN_ROWS
+
+
+def run_steps(
+    file_name: str,
+    df: pd.DataFrame,
+    steps: list[RecipeStep],
+    versions: dict[str, str] | None = None,
+) -> pd.DataFrame:
+    """Apply per-file recipe steps to a single dataframe.
+
+    versions are the stored column versions a freshly loaded df holds; the
+    first step uses them to share derived column values.
+    """
+    named = [(file_name, df)]
+    for i, step in enumerate(steps):
+        with stored_versions([(df, versions or {})] if i == 0 else []):
+            named = apply_step(named, step)
+    return named[0][1]
+
+
+def run_stored(
+    file_name: str, handle: str, steps: list[RecipeStep], session: str = ""
+) -> pd.DataFrame | str:
+    """Apply per-file recipe steps to a stored frame.
+
+    Large frames whose steps are all row-local are streamed chunk by chunk
+    into a new stored frame, and its handle is returned; otherwise the frame
+    is loaded whole and the transformed frame is returned.
+    """
+    if can_stream(steps, frame_store.rows(handle)):
+        try:
+            return stream_steps(file_name, handle, steps, session)
+        except StreamingError as e:
+            logging.info(f"Processing {file_name} in memory instead of streaming: {e}")
+    return run_steps(
+        file_name, frame_store.get(handle), steps, frame_store.column_versions(handle)
+    )
+
+
+def discard_results(results: list[pd.DataFrame | str]):
+    """Delete the stored frames among results that will not be used."""
+    for result in results:
+        if isinstance(result, str):
+            frame_store.delete(result)
+
+
+def run_in_pool(
+    jobs: list[tuple[str, str, list[RecipeStep], str]],
+) -> list[pd.DataFrame | str]:
+    """Run (file name, handle, steps, session) jobs in the worker processes.
+
+    Workers read their input straight from the frame store, so only handles
+    and resulting frames cross process boundaries. Results come back in job
+    order. If any job fails, frames the others stored are deleted and the
+    first failure is re-raised.
+    """
+    futures = [_get_pool().submit(run_stored, *job) for job in jobs]
+    results = []
+    error = None
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                _reset_pool()
+            error = error or e
+    if error is not None:
+        discard_results(results)
+        raise error
+    return results
\ No newline at end of file
@@ -0,0 +1,57 @@
+import tracemalloc
+import numpy as np
+import pandas as pd
+import pytest
+from app import admission
+from app.dataset import Dataset
+from app.operations import OperationError
+
+GROUP_BY = {"columns": ["k"], "agg_columns": ["v"], "aggfunc": "sum"}
+
+
+@pytest.fixture(autouse=True)
+def budget(monkeypatch):
+    monkeypatch.setattr(admission, "OPERATION_MEMORY_BUDGET_BYTES", 1024**2)
+
+
+def _frame(rows: int, keys: int) -> pd.DataFrame:
+    return pd.DataFrame({"k": np.arange(rows) % keys, "v": np.ones(rows)})
+
+
+def test_group_by_with_few_keys_is_admitted():
+    data = Dataset.from_frames([_frame(50_000, 10) for _ in range(4)])
+    assert admission.admit("group_by", data, GROUP_BY) is False
+
+
+def test_group_by_with_unique_keys_is_refused():
+    data = Dataset.from_frames([_frame(200_000, 200_000)])
+    with pytest.raises(OperationError, match="would produce"):
+        admission.admit("group_by", data, GROUP_BY)
+
+
+def test_distinct_counts_are_exact_when_small_and_close_when_large():
+    data = Dataset.from_frames([_frame(100_000, 100_000) for _ in range(3)])
+    assert abs(admission._distinct(data, ["k"]) - 100_000) < 5_000
+    small = Dataset.from_frames([_frame(100_000, 1_000) for _ in range(3)])
+    assert admission._distinct(small, ["k"]) == 1_000
+    assert admission._distinct(small, ["k", "v"]) == 1_000
+
+
+def test_pivot_estimate_memory_stays_bounded():
+    rows = 500_000
+    data = Dataset.from_frames(
+        [
+            pd.DataFrame({"i": np.arange(rows) + part * rows, "c": np.arange(rows) % 7})
+            for part in range(4)
+        ]
+    )
+    params = {"index": "i", "columns": "c", "values": "c", "aggfunc": "sum"}
+    tracemalloc.start()
+    try:
+        with pytest.raises(OperationError, match="would produce"):
+            admission.admit("pivot", data, params)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # Concatenating the index column alone would take 8 bytes per row.
+    assert peak < 8 * len(data)
\ No newline at end of file
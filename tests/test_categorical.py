@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+from app.dataset import Dataset
+from app.operations import OPERATIONS
+
+CITIES = ["Oslo", "Bergen", "Bergen", "Tromso", None, "Oslo", "Tromso", "Bergen"]
+
+
+@pytest.fixture
+def raw() -> pd.DataFrame:
+    return pd.DataFrame({"city": CITIES, "sales": range(len(CITIES))}, dtype=object)
+
+
+@pytest.fixture
+def encoded(raw) -> pd.DataFrame:
+    return raw.astype({"city": "category"})
+
+
+def _run(op: str, df: pd.DataFrame, **params) -> pd.DataFrame:
+    return OPERATIONS[op].func(df.copy(), **params)
+
+
+def _decoded(df: pd.DataFrame) -> pd.DataFrame:
+    """The frame as plain values with None for missing ones, to compare paths."""
+    return df.astype(object).where(df.notna(), None).reset_index(drop=True)
+
+
+def test_onehot_after_filter_drops_filtered_values(raw, encoded):
+    rules = [{"column": "city", "operation": "not_equals", "value": "Oslo"}]
+    results = [
+        _run("onehot_encode", _run("filter_rows", df, rules=rules), columns=["city"])
+        for df in (encoded, raw)
+    ]
+    assert "city_Oslo" not in results[0].columns
+    pd.testing.assert_frame_equal(_decoded(results[0]), _decoded(results[1]))
+
+
+def test_sort_after_set_value_orders_new_value_by_value(raw, encoded):
+    rules = [
+        {
+            "condition_column": "sales",
+            "condition_op": "equals",
+            "condition_value": "3",
+            "target_column": "city",
+            "action": "set_value",
+            "action_value": "AAA",
+        }
+    ]
+    results = [
+        _run(
+            "sort_rows",
+            _run("conditional_transform", df, rules=rules),
+            columns=["city"],
+            ascending=[True],
+        )
+        for df in (encoded, raw)
+    ]
+    assert results[0]["city"].iloc[0] == "AAA"
+    pd.testing.assert_frame_equal(_decoded(results[0]), _decoded(results[1]))
+
+
+def test_group_by_after_fill_orders_new_key_by_value(raw, encoded):
+    results = [
+        OPERATIONS["group_by"].func(
+            Dataset.from_frames(
+                [
+                    _run(
+                        "fill_nulls",
+                        df,
+                        columns=["city"],
+                        strategy="custom",
+                        value="Aalesund",
+                    )
+                ]
+            ),
+            columns=["city"],
+            agg_columns=["sales"],
+            aggfunc="sum",
+        )[0][1]
+        for df in (encoded, raw)
+    ]
+    assert results[0]["city"].iloc[0] == "Aalesund"
+    pd.testing.assert_frame_equal(_decoded(results[0]), _decoded(results[1]))
\ No newline at end of file
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.dataset import Dataset
+
+
+def _part(seed: int, rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    amount = rng.integers(0, 100, rows).astype(float)
+    amount[rng.random(rows) < 0.1] = np.nan
+    return pd.DataFrame(
+        {
+            "region": rng.choice(["north", "south", "east", None], rows),
+            "year": rng.integers(2020, 2024, rows),
+            "amount": amount,
+            "units": rng.integers(1, 10, rows),
+        }
+    )
+
+
+def _expected(frames: list[pd.DataFrame], keys: list[str], values: dict[str, str]):
+    return (
+        pd.concat(frames, ignore_index=True)
+        .groupby(keys, observed=True)
+        .agg(values)
+        .reset_index()
+    )
+
+
+FUNCS = ["sum", "count", "min", "max", "first", "last", "mean", "median", "nunique"]
+
+
+@pytest.mark.parametrize("func", FUNCS)
+@pytest.mark.parametrize("keys", [["region"], ["region", "year"]])
+def test_aggregate_matches_concat_and_groupby(func, keys):
+    frames = [_part(0, 200), _part(1, 150), _part(2, 10).iloc[:0], _part(3, 80)]
+    values = {"amount": func, "units": func}
+    data = Dataset.from_frames(frames)
+    assert data.mergeable(keys, values) == (func not in ("median", "nunique"))
+    pd.testing.assert_frame_equal(
+        data.aggregate(keys, values), _expected(frames, keys, values)
+    )
+
+
+def test_aggregate_on_encoded_keys_matches_concat_and_groupby():
+    frames = [_part(seed, 120).astype({"region": "category"}) for seed in range(3)]
+    values = {"amount": "mean", "units": "sum"}
+    result = Dataset.from_frames(frames).aggregate(["region"], values)
+    pd.testing.assert_frame_equal(
+        result, _expected(frames, ["region"], values), check_categorical=False
+    )
+
+
+@pytest.mark.parametrize(
+    "change, values",
+    [
+        (lambda df: df.astype({"units": float}), {"units": "max"}),
+        (lambda df: df.drop(columns=["units"]), {"units": "sum"}),
+        (lambda df: df.astype({"amount": str}), {"amount": "first", "units": "max"}),
+    ],
+)
+def test_aggregate_of_differing_parts_matches_concat_and_groupby(change, values):
+    frames = [_part(0, 100), change(_part(1, 100))]
+    data = Dataset.from_frames(frames)
+    assert not data.mergeable(["region"], values)
+    pd.testing.assert_frame_equal(
+        data.aggregate(["region"], values), _expected(frames, ["region"], values)
+    )
+
+
+def test_aggregate_of_a_single_part():
+    frame = _part(0, 50)
+    values = {"amount": "mean"}
+    pd.testing.assert_frame_equal(
+        Dataset.from_frames([frame]).aggregate(["year"], values),
+        _expected([frame], ["year"], values),
+    )
\ No newline at end of file
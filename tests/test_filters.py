@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app import filters
+from app.filters import filter_positions
+from app.operations import filter_mask
+
+WORDS = ["Oslo", "oslo", "Bergen", "", None, "Tromso", "a|b", "12", "7.5", "x"]
+
+
+def _reference(df: pd.DataFrame, rules: list[dict[str, str]]) -> np.ndarray:
+    """The per-rule masks filter_rows combined before rules were fused."""
+    mask = pd.Series(True, index=df.index)
+    for rule in rules:
+        if rule["column"] and rule["column"] in df.columns:
+            mask &= filter_mask(df[rule["column"]], rule["operation"], rule["value"])
+    return np.flatnonzero(mask.to_numpy())
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    numbers = rng.integers(-5, 20, rows).astype(float)
+    numbers[rng.random(rows) < 0.2] = np.nan
+    return pd.DataFrame(
+        {
+            "word": pd.Series(rng.choice(np.array(WORDS, dtype=object), rows)),
+            "text": pd.array(rng.choice(np.array(WORDS, dtype=object), rows)),
+            "number": numbers,
+            "mixed": pd.Series(rng.choice(np.array(WORDS, dtype=object), rows)).where(
+                rng.random(rows) < 0.5, pd.Series(numbers, dtype=object)
+            ),
+        }
+    )
+
+
+def _rule(column: str, operation: str, value: str = "") -> dict[str, str]:
+    return {"column": column, "operation": operation, "value": value}
+
+
+RULES = {
+    "equals": [_rule("word", "equals", "Oslo")],
+    "not_equals_with_nulls": [_rule("text", "not_equals", "x")],
+    "empty": [_rule("word", "is_empty"), _rule("text", "is_not_empty")],
+    "regex_contains": [
+        _rule("word", "contains", "^o.l"),
+        _rule("text", "contains", "A|B"),
+    ],
+    "regex_not_contains": [_rule("mixed", "not_contains", r"\d")],
+    "numeric_range": [_rule("number", "ge", "0"), _rule("number", "less_than", "10")],
+    "tightest_bounds": [
+        _rule("number", "greater_than", "2"),
+        _rule("number", "ge", "2"),
+        _rule("number", "le", "15"),
+        _rule("number", "less_than", "15"),
+    ],
+    "numeric_on_text": [_rule("mixed", "greater_than", "5"), _rule("word", "le", "12")],
+    "mixed_rules_on_one_column": [
+        _rule("mixed", "ge", "1"),
+        _rule("mixed", "is_not_empty"),
+        _rule("mixed", "not_equals", "12"),
+    ],
+    "unparsable_bound": [_rule("number", "greater_than", "abc")],
+    "unknown_operation": [_rule("word", "starts_with", "O")],
+    "missing_and_blank_columns": [
+        _rule("absent", "equals", "x"),
+        _rule("", "equals", "x"),
+        _rule("word", "is_not_empty"),
+    ],
+    "no_rules": [],
+}
+
+
+@pytest.mark.parametrize("rules", RULES)
+@pytest.mark.parametrize("encoded", [False, True])
+def test_fused_filter_matches_per_rule_masks(monkeypatch, rules, encoded):
+    monkeypatch.setattr(filters, "FILTER_SAMPLE_ROWS", 50)
+    df = _frame(500)
+    if encoded:
+        df = df.astype({"word": "category", "text": "category"})
+    expected = _reference(df, RULES[rules])
+    np.testing.assert_array_equal(filter_positions(df, RULES[rules]), expected)
+
+
+def test_filter_positions_on_an_empty_frame():
+    df = _frame(0)
+    assert (
+        len(filter_positions(df, RULES["regex_contains"] + RULES["numeric_range"])) == 0
+    )
\ No newline at end of file
@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+from app.frame_store import FrameStore
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "n": np.arange(rows),
+            "s": pd.array([f"v{i}" if i % 7 else None for i in range(rows)]),
+            "c": pd.Categorical(np.arange(rows) % 3),
+        }
+    )
+
+
+def _chunks(df: pd.DataFrame, rows: int):
+    for start in range(0, len(df), rows):
+        part = df.iloc[start : start + rows].reset_index(drop=True)
+        yield part, part
+
+
+@pytest.mark.parametrize("spill", [False, True])
+@pytest.mark.parametrize("streamed", [False, True])
+def test_get_rows_matches_slicing_the_whole_frame(tmp_path, spill, streamed):
+    store = FrameStore(str(tmp_path), 0 if spill else 1024**3)
+    df = _frame(1000)
+    handle = store.put_chunks(_chunks(df, 128)) if streamed else store.put(df)
+    whole = store.get(handle)
+    for start, stop in [(0, 10), (120, 300), (250, 260), (990, 1200)]:
+        expected = whole.iloc[start:stop].reset_index(drop=True)
+        pd.testing.assert_frame_equal(store.get_rows(handle, start, stop), expected)
+    for start, stop in [(500, 500), (1100, 1200)]:
+        empty = store.get_rows(handle, start, stop)
+        assert len(empty) == 0 and empty.columns.tolist() == whole.columns.tolist()
+
+
+def test_delete_releases_refs_when_a_blob_file_is_missing(tmp_path):
+    store = FrameStore(str(tmp_path), 1024**3)
+    df = _frame(100)
+    kept = store.put(df)
+    dropped = store.put(df.assign(n=df["n"] + 1))
+    blob = store._manifest(dropped)["columns"][0]
+    os.remove(store._find_blob(blob["blob"], blob["format"]))
+    store.delete(dropped)
+    assert not store.exists(dropped)
+    with sqlite3.connect(store._registry_path) as conn:
+        refs = dict(conn.execute("SELECT blob, refs FROM blob_refs").fetchall())
+    assert blob["blob"] not in refs
+    assert set(refs.values()) == {1}
+    pd.testing.assert_frame_equal(store.get(kept), df)
+
+
+def _typed_frame(rows: int) -> pd.DataFrame:
+    n = np.arange(rows)
+    return pd.DataFrame(
+        {
+            "int": n,
+            "float": np.where(n % 4, n / 2, np.nan),
+            "nullable_int": pd.array([i if i % 3 else None for i in n], dtype="Int64"),
+            "flag": n % 2 == 0,
+            "nullable_flag": pd.array(
+                [None if i % 5 == 0 else i % 2 == 0 for i in n], dtype="boolean"
+            ),
+            "text": pd.Series([f"t{i}" if i % 6 else None for i in n], dtype=object),
+            "string": pd.array([f"s{i}" if i % 4 else None for i in n], dtype="string"),
+            "mixed": pd.Series([i if i % 2 else f"m{i}" for i in n], dtype=object),
+            "when": pd.date_range("2024-01-01", periods=rows, freq="h"),
+            "when_utc": pd.date_range("2024-01-01", periods=rows, freq="D", tz="UTC"),
+            "elapsed": pd.to_timedelta(n, unit="s"),
+            "labels": pd.Categorical([["a", "b", None][i % 3] for i in n]),
+            "codes": pd.Categorical(n % 4),
+        }
+    )
+
+
+@pytest.mark.parametrize("spill", [False, True])
+@pytest.mark.parametrize("streamed", [False, True])
+def test_dtypes_survive_a_round_trip(tmp_path, spill, streamed):
+    store = FrameStore(str(tmp_path), 0 if spill else 1024**3)
+    df = _typed_frame(300)
+    if streamed:
+        # Mixed-type columns are pickled, which only whole frames can be.
+        df = df.drop(columns=["mixed"])
+    handle = store.put_chunks(_chunks(df, 128)) if streamed else store.put(df)
+    assert store.schema(handle) == {col: str(dtype) for col, dtype in df.dtypes.items()}
+    pd.testing.assert_frame_equal(store.get(handle), df)
+    pd.testing.assert_frame_equal(
+        store.get_rows(handle, 100, 200), df.iloc[100:200].reset_index(drop=True)
+    )
\ No newline at end of file
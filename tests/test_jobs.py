@@ -0,0 +1,148 @@
+import asyncio
+import sqlite3
+import time
+import pytest
+from app import jobs
+from app.jobs import JobCancelled, JobContext, JobQueue, JobTimeout
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch) -> JobQueue:
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(jobs, "job_queue", queue)
+    monkeypatch.setattr(jobs, "JOB_SESSION_LIMIT", 1)
+    monkeypatch.setattr(jobs, "JOB_AGING_SECONDS", 30)
+    return queue
+
+
+def _submit(queue: JobQueue, session: str, priority: str = "transform") -> str:
+    return asyncio.run(queue.submit(session, "step", {"files": []}, priority))
+
+
+def _status(queue: JobQueue, job_id: str) -> str:
+    return asyncio.run(queue.status(job_id))["status"]
+
+
+def _claimed(queue: JobQueue) -> str | None:
+    claimed = queue.claim(1)
+    return claimed[0] if claimed else None
+
+
+def test_claim_takes_the_oldest_job_of_the_highest_class(queue):
+    export = _submit(queue, "a", "export")
+    first = _submit(queue, "b")
+    second = _submit(queue, "c")
+    interactive = _submit(queue, "d", "interactive")
+    assert [_claimed(queue) for _ in range(5)] == [
+        interactive,
+        first,
+        second,
+        export,
+        None,
+    ]
+    assert _status(queue, first) == "running"
+
+
+def test_claim_returns_kind_and_payload(queue):
+    job_id = _submit(queue, "a")
+    assert queue.claim(1) == (job_id, "step", {"files": []})
+
+
+def test_cancelled_queued_job_never_starts(queue):
+    job_id = _submit(queue, "a")
+    asyncio.run(queue.cancel(job_id))
+    assert _status(queue, job_id) == "cancelled"
+    assert queue.claim(1) is None
+
+
+def test_cancelled_running_job_stops_at_its_next_report(queue):
+    job_id = _submit(queue, "a")
+    queue.claim(1)
+    context = JobContext(job_id)
+    context.progress(1, 3, "first")
+    asyncio.run(queue.cancel(job_id))
+    with pytest.raises(JobCancelled):
+        context.progress(2, 3, "second")
+    queue.finish(job_id, "cancelled")
+    status = asyncio.run(queue.status(job_id))
+    assert (status["status"], status["done"], status["detail"]) == (
+        "cancelled",
+        2,
+        "second",
+    )
+
+
+def test_finish_keeps_the_outcome_of_a_job_that_already_ended(queue):
+    job_id = _submit(queue, "a")
+    queue.claim(7)
+    queue.fail_worker_jobs(7)
+    queue.finish(job_id, "done", result=[("a.csv", "handle")])
+    status = asyncio.run(queue.status(job_id))
+    assert status["status"] == "error" and status["result"] is None
+
+
+def test_job_times_out_at_its_next_report(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_TIMEOUT_SECONDS", 0.01)
+    job_id = _submit(queue, "a")
+    queue.claim(1)
+    context = JobContext(job_id)
+    time.sleep(0.02)
+    with pytest.raises(JobTimeout):
+        context.progress(1, 2, "")
+    assert queue.overdue(0) == [(job_id, 1)]
+
+
+def test_job_without_a_timeout_never_times_out(queue, monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_TIMEOUT_SECONDS", 0)
+    context = JobContext()
+    assert context.deadline is None
+    context.progress(1, 2, "")
+
+
+def test_status_counts_the_queued_jobs_ahead(queue):
+    job_ids = [_submit(queue, session) for session in "abc"]
+    with sqlite3.connect(queue.path) as conn:
+        conn.execute(
+            "UPDATE jobs SET created = created - 1 WHERE id = ?", (job_ids[2],)
+        )
+    ahead = [asyncio.run(queue.status(job_id))["ahead"] for job_id in job_ids]
+    assert ahead == [1, 2, 0]
+
+
+def _age(queue: JobQueue, job_id: str, seconds: float):
+    with sqlite3.connect(queue.path) as conn:
+        conn.execute(
+            "UPDATE jobs SET created = created - ? WHERE id = ?", (seconds, job_id)
+        )
+
+
+def test_a_session_runs_at_most_its_limit_of_jobs(queue):
+    first, second = _submit(queue, "a"), _submit(queue, "a")
+    other = _submit(queue, "b")
+    assert [_claimed(queue) for _ in range(3)] == [first, other, None]
+    queue.finish(first, "done", result=[])
+    assert _claimed(queue) == second
+
+
+def test_session_that_waited_longest_since_its_last_start_goes_first(queue):
+    done = _submit(queue, "a")
+    assert _claimed(queue) == done
+    queue.finish(done, "done", result=[])
+    busy = _submit(queue, "a")
+    _age(queue, busy, 5)
+    idle = _submit(queue, "b")
+    assert [_claimed(queue) for _ in range(2)] == [idle, busy]
+
+
+def test_waiting_jobs_move_up_a_class_every_aging_interval(queue):
+    export = _submit(queue, "a", "export")
+    _age(queue, export, 65)
+    fresh_export = _submit(queue, "b", "export")
+    transform = _submit(queue, "c")
+    interactive = _submit(queue, "d", "interactive")
+    assert [_claimed(queue) for _ in range(4)] == [
+        export,
+        interactive,
+        transform,
+        fresh_export,
+    ]
\ No newline at end of file
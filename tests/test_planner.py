@@ -0,0 +1,119 @@
+import pandas as pd
+import pytest
+from app.operations import run_recipe
+from app.planner import frame_schema, optimize, run_optimized
+
+
+def _step(op: str, **params) -> dict:
+    return {"op": op, "params": params}
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": [" Ann ", "bob", None, "Cy  d", "eve", " Ann "],
+            "city": ["Oslo", "oslo", "Bergen", None, "Tromso", "Oslo"],
+            "sales": [10, 25, None, 3, 40, 7],
+            "note": ["a!", "b?", "c", "d#", None, "e"],
+        }
+    )
+
+
+def _rule(column: str, operation: str, value: str = "") -> dict:
+    return {"column": column, "operation": operation, "value": value}
+
+
+PLANS = {
+    "filter_after_rename": [
+        _step("rename_columns", mapping={"sales": "amount", "missing": "x"}),
+        _step("filter_rows", rules=[_rule("amount", "ge", "7")]),
+    ],
+    "filter_after_text_on_other_column": [
+        _step("trim_whitespace", columns=["name"], mode="all"),
+        _step("convert_case", columns=["name"], case="upper"),
+        _step("filter_rows", rules=[_rule("city", "contains", "os")]),
+    ],
+    "filter_on_changed_column": [
+        _step("convert_case", columns=["city"], case="lower"),
+        _step("filter_rows", rules=[_rule("city", "equals", "oslo")]),
+    ],
+    "fused_filters_and_renames": [
+        _step("filter_rows", rules=[_rule("sales", "greater_than", "5")]),
+        _step("rename_columns", mapping={"name": "who"}),
+        _step("rename_columns", mapping={"who": "person", "city": "town"}),
+        _step("filter_rows", rules=[_rule("town", "is_not_empty")]),
+    ],
+    "pruned_by_selection": [
+        _step("remove_special_chars", columns=["note", "name"], pattern="[^a-z]"),
+        _step(
+            "find_replace",
+            column="note",
+            find="a",
+            replace="z",
+            case_sensitive=True,
+            regex=False,
+        ),
+        _step(
+            "find_replace",
+            column="_all_",
+            find="o",
+            replace="0",
+            case_sensitive=False,
+            regex=False,
+        ),
+        _step("select_columns", columns=["name", "city", "sales"]),
+        _step("filter_rows", rules=[_rule("sales", "less_than", "30")]),
+        _step("select_columns", columns=["name", "sales"]),
+    ],
+    "rename_into_duplicate": [
+        _step("rename_columns", mapping={"city": "name"}),
+        _step("filter_rows", rules=[_rule("sales", "ge", "7")]),
+    ],
+}
+
+
+@pytest.mark.parametrize("plan", PLANS)
+def test_optimized_plan_matches_unoptimized_execution(frame, plan):
+    steps = PLANS[plan]
+    expected = run_recipe([("a.csv", frame.copy())], steps)
+    result = run_optimized([("a.csv", frame.copy())], steps)
+    assert [name for name, _ in result] == [name for name, _ in expected]
+    for (_, got), (_, want) in zip(result, expected):
+        pd.testing.assert_frame_equal(got, want)
+
+
+def test_filters_move_ahead_of_renames_and_unrelated_text_steps(frame):
+    steps = PLANS["filter_after_rename"] + PLANS["filter_after_text_on_other_column"]
+    plan = optimize(steps, frame_schema(frame))
+    assert plan[0]["op"] == "filter_rows"
+    assert [rule["column"] for rule in plan[0]["params"]["rules"]] == ["sales", "city"]
+    assert [step["op"] for step in plan[1:]] == [
+        "rename_columns",
+        "trim_whitespace",
+        "convert_case",
+    ]
+
+
+def test_filters_stay_after_steps_that_change_their_column(frame):
+    steps = PLANS["filter_on_changed_column"]
+    assert optimize(steps, frame_schema(frame)) == steps
+
+
+def test_adjacent_steps_are_fused(frame):
+    plan = optimize(PLANS["fused_filters_and_renames"], frame_schema(frame))
+    assert [step["op"] for step in plan] == ["filter_rows", "rename_columns"]
+    assert plan[1]["params"]["mapping"] == {"name": "person", "city": "town"}
+    assert [rule["column"] for rule in plan[0]["params"]["rules"]] == ["sales", "city"]
+
+
+def test_work_on_dropped_columns_is_pruned(frame):
+    plan = optimize(PLANS["pruned_by_selection"], frame_schema(frame))
+    assert plan[0] == _step("select_columns", columns=["name", "sales"])
+    assert _step("remove_special_chars", columns=["name"], pattern="[^a-z]") in plan
+    assert all(step["params"].get("column") != "note" for step in plan)
+
+
+def test_renames_into_duplicate_names_are_not_rewritten(frame):
+    steps = PLANS["rename_into_duplicate"]
+    assert optimize(steps, frame_schema(frame)) == steps
\ No newline at end of file
@@ -0,0 +1,80 @@
+import json
+import pandas as pd
+import pytest
+from app.operations import OPERATIONS, OperationError, run_recipe, validate_step
+
+
+def _step(op: str, **params) -> dict:
+    return {"op": op, "params": params}
+
+
+@pytest.mark.parametrize(
+    "step",
+    [
+        None,
+        ["filter_rows", {}],
+        {"op": "filter_rows"},
+        {"op": "filter_rows", "params": ["rules"]},
+        _step("drop_table"),
+        {"params": {}},
+        _step("filter_rows"),
+        _step("filter_rows", rules=[], extra=1),
+        _step("select_columns", names=["a"]),
+    ],
+)
+def test_validate_step_rejects_malformed_steps(step):
+    with pytest.raises(OperationError):
+        validate_step(step)
+
+
+def test_validate_step_keeps_only_op_and_params():
+    step = {**_step("drop_null_rows"), "label": "Remove rows with nulls"}
+    assert validate_step(step) == _step("drop_null_rows")
+
+
+RECIPE = [
+    _step("rename_columns", mapping={"qty": "quantity"}),
+    _step(
+        "filter_rows", rules=[{"column": "quantity", "operation": "ge", "value": "2"}]
+    ),
+    _step("convert_case", columns=["region"], case="upper"),
+    _step("sort_rows", columns=["quantity"], ascending=[False]),
+    _step("sample_rows", method="top", n=2, percentage=0),
+    _step("group_by", columns=["region"], agg_columns=["quantity"], aggfunc="sum"),
+]
+
+
+def _frames() -> list[tuple[str, pd.DataFrame]]:
+    return [
+        ("a.csv", pd.DataFrame({"region": ["north", "south"], "qty": [1, 5]})),
+        ("b.csv", pd.DataFrame({"region": ["north", "east"], "qty": [3, 2]})),
+    ]
+
+
+def test_replaying_a_saved_recipe_matches_applying_its_steps():
+    saved = json.loads(json.dumps({"steps": RECIPE}))
+    steps = [validate_step(step) for step in saved["steps"]]
+    replayed = run_recipe(_frames(), steps)
+    files = _frames()
+    for step in RECIPE:
+        operation = OPERATIONS[step["op"]]
+        if operation.kind == "file":
+            files = [(name, operation.func(df, **step["params"])) for name, df in files]
+            continue
+        combined = pd.concat([df for _, df in files], ignore_index=True)
+        if step["op"] == "sample_rows":
+            files = files + [("sampled_data_top_2_rows.csv", combined.head(2))]
+        else:
+            grouped = combined.groupby("region", as_index=False)["quantity"].sum()
+            files = [("grouped_data.csv", grouped)]
+    assert [name for name, _ in replayed] == ["grouped_data.csv"]
+    pd.testing.assert_frame_equal(
+        replayed[0][1].sort_values("region").reset_index(drop=True),
+        files[0][1].sort_values("region").reset_index(drop=True),
+        check_dtype=False,
+    )
+    assert replayed[0][1].set_index("region")["quantity"].to_dict() == {
+        "EAST": 2,
+        "NORTH": 6,
+        "SOUTH": 10,
+    }
\ No newline at end of file
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app import streaming
+from app.frame_store import FrameStore, StreamingError
+from app.operations import run_recipe
+from app.streaming import stream_steps
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch) -> FrameStore:
+    store = FrameStore(str(tmp_path), 1024**3)
+    monkeypatch.setattr(streaming, "frame_store", store)
+    return store
+
+
+def _frame(rows: int) -> pd.DataFrame:
+    n = np.arange(rows)
+    return pd.DataFrame(
+        {
+            "n": n,
+            "name": pd.Series([f" Item {i} " if i % 5 else None for i in n]),
+            "code": pd.Categorical(np.where(n < rows - 50, "keep", "late")),
+            "score": np.where(n % 9, n / 3, np.nan),
+        }
+    )
+
+
+def _step(op: str, **params) -> dict:
+    return {"op": op, "params": params}
+
+
+STEPS = {
+    "untouched_columns": [
+        _step("trim_whitespace", columns=["name"], mode="all"),
+        _step("rename_columns", mapping={"score": "points"}),
+    ],
+    "column_changes_in_a_late_chunk": [
+        _step(
+            "find_replace",
+            column="code",
+            find="late",
+            replace="new",
+            case_sensitive=True,
+            regex=False,
+        ),
+    ],
+    "rows_dropped_in_a_late_chunk": [
+        _step(
+            "filter_rows",
+            rules=[{"column": "n", "operation": "less_than", "value": "930"}],
+        ),
+        _step("convert_case", columns=["name"], case="upper"),
+    ],
+    "rows_dropped_everywhere": [
+        _step("drop_null_rows"),
+        _step("select_columns", columns=["score", "n"]),
+    ],
+    "everything_filtered": [
+        _step(
+            "filter_rows",
+            rules=[{"column": "n", "operation": "less_than", "value": "-1"}],
+        ),
+    ],
+}
+
+
+@pytest.mark.parametrize("steps", STEPS)
+def test_streamed_steps_match_in_memory_result(store, steps):
+    df = _frame(1000)
+    parent = store.put(df)
+    handle = stream_steps("a.csv", parent, STEPS[steps], chunk_rows=128)
+    expected = run_recipe([("a.csv", store.get(parent))], STEPS[steps])[0][1]
+    pd.testing.assert_frame_equal(
+        store.get(handle), expected.reset_index(drop=True), check_categorical=False
+    )
+
+
+def test_unchanged_columns_reuse_the_parent_blobs(store):
+    parent = store.put(_frame(1000))
+    handle = stream_steps("a.csv", parent, STEPS["untouched_columns"], chunk_rows=128)
+    before, after = store.column_versions(parent), store.column_versions(handle)
+    assert after["n"] == before["n"] and after["code"] == before["code"]
+    assert after["name"] != before["name"]
+
+
+def test_late_changes_backfill_earlier_rows_from_the_parent(store):
+    parent = store.put(_frame(1000))
+    steps = STEPS["rows_dropped_in_a_late_chunk"]
+    handle = stream_steps("a.csv", parent, steps, chunk_rows=128)
+    assert store.column_versions(handle)["n"] != store.column_versions(parent)["n"]
+    np.testing.assert_array_equal(store.get(handle)["n"], np.arange(930))
+
+
+def test_put_chunks_rejects_a_dtype_change_and_stores_nothing(store, tmp_path):
+    df = _frame(300)
+    stored = set(tmp_path.rglob("*"))
+
+    def chunks():
+        yield df.iloc[:150], df.iloc[:150]
+        late = df.iloc[150:].reset_index(drop=True)
+        yield late.astype({"n": str}), late
+
+    with pytest.raises(StreamingError):
+        store.put_chunks(chunks())
+    assert set(tmp_path.rglob("*")) == stored
\ No newline at end of file